@@ -1,105 +1,839 @@
-# pylint: disable=invalid-name
-"""
-Programa: computeStatistics.py
-Descripción: Calcula estadísticas descriptivas (Media, Mediana, Moda,
-             Desviación Estándar y Varianza) a partir de un archivo.
-"""
-
-import sys
-import time
-
-def calculate_mean(data):
-    """Calcula la media aritmética."""
-    return sum(data) / len(data)
-
-
-def calculate_median(data):
-    """Calcula la mediana de una lista de números."""
-    sorted_data = sorted(data)
-    n = len(sorted_data)
-    mid = n // 2
-    if n % 2 == 0:
-        return (sorted_data[mid - 1] + sorted_data[mid]) / 2
-    return sorted_data[mid]
-
-
-def calculate_mode(data):
-    """Calcula la moda (el valor que más se repite)."""
-    frequency = {}
-    for item in data:
-        frequency[item] = frequency.get(item, 0) + 1
-    max_freq = max(frequency.values())
-    modes = [k for k, v in frequency.items() if v == max_freq]
-    # Si todos se repiten igual, no hay una moda única
-    if len(modes) == len(data):
-        return "N/A"
-    return modes[0] if len(modes) == 1 else modes
-
-
-def calculate_variance(data, mean):
-    """Calcula la varianza poblacional."""
-    sum_sq_diff = sum((x - mean) ** 2 for x in data)
-    return sum_sq_diff / len(data)
-
-
-def main():
-    """Función principal para ejecutar el programa."""
-    start_time = time.time()
-
-    if len(sys.argv) != 2:
-        print("Uso: python computeStatistics.py fileWithData.txt")
-        return
-
-    filename = sys.argv[1]
-    numbers = []
-
-    # Req 3: Manejo de datos inválidos
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                clean_line = line.strip()
-                if clean_line:
-                    try:
-                        numbers.append(float(clean_line))
-                    except ValueError:
-                        print(f"Error: '{clean_line}' no es un número válido.")
-    except FileNotFoundError:
-        print(f"Error: El archivo '{filename}' no existe.")
-        return
-
-    if not numbers:
-        print("Error: No se encontraron datos numéricos para procesar.")
-        return
-
-    # Req 2: Cálculos con algoritmos básicos
-    mean = calculate_mean(numbers)
-    median = calculate_median(numbers)
-    mode = calculate_mode(numbers)
-    variance = calculate_variance(numbers, mean)
-    std_dev = variance ** 0.5  # Raíz cuadrada manual
-
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-
-    # Formatear resultados
-    results = (
-        f"--- Estadísticas --- \n"
-        f"Archivo: {filename}\n"
-        f"Cantidad de elementos: {len(numbers)}\n"
-        f"Media: {mean}\n"
-        f"Mediana: {median}\n"
-        f"Moda: {mode}\n"
-        f"Varianza Poblacional: {variance}\n"
-        f"Desv Estandar Poblacional: {std_dev}\n"
-        f"Tiempo de ejecución: {elapsed_time:.6f} segundos\n"
-        f"-------------------- \n"
-    )
-
-    # Req 2 y 7: Imprimir en pantalla y guardar en archivo
-    print(results, filename)
-    with open(f"StatisticsResults_{filename}.txt", "a", encoding="utf-8") as out_file:
-        out_file.write(results + "\n")
-
-
-if __name__ == "__main__":
-    main()
+# pylint: disable=invalid-name
+"""
+Programa: computeStatistics.py
+Descripción: Calcula estadísticas descriptivas (Media, Mediana, Moda,
+             Desviación Estándar y Varianza) a partir de un archivo.
+
+Los momentos (con sumas math.fsum), la mediana y la moda se obtienen de
+la tabla de frecuencias de frequencyTable.py; con --approx los momentos
+se acumulan en streaming (Welford) junto a un resumen de cuantiles de
+memoria acotada.
+El archivo se lee con fastInput.py en fragmentos que pueden repartirse
+entre varios procesos (--workers), y con varios archivos se escribe una
+tabla consolidada.
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import itertools
+import json
+import math
+import operator
+import os
+import sys
+import time
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+try:
+    import fastInput
+except ImportError:  # fastInput.py vive en la carpeta de la actividad.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    import fastInput
+
+from frequencyTable import DEFAULT_TABLE_BUDGET, FrequencyTable
+
+DEFAULT_SKETCH_CAPACITY = 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MODE_BUDGET = 1 << 16
+BATCH_REPORT = "StatisticsResults_lote"
+BATCH_FIELDS = ("archivo", "elementos", "media", "mediana", "moda",
+                "varianza", "desviacion", "segundos", "estado")
+
+Summary = namedtuple("Summary", "stats median mode percentiles top")
+REPORTED_PERCENTILES = (50, 90, 99)
+PARSE_BATCH = 1 << 12
+
+
+class RunningStats:
+    """Acumulador en streaming de conteo, suma, media, M2, mínimo y máximo.
+
+    Con --approx los momentos se actualizan valor por valor (Welford) y los
+    fragmentos se combinan con la fórmula de Chan et al. Es estable, pero
+    no redondea igual que la fórmula de dos pasadas del programa original:
+    en TC1 la varianza sale 21099.9176 en lugar de 21099.917599999997. En
+    modo exacto los momentos salen de from_table, con sumas exactas.
+    """
+
+    __slots__ = ("count", "total", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def push(self, value):
+        """Agrega un valor actualizando los momentos (Welford)."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """Combina otro acumulador (fórmula de Chan et al.)."""
+        if not other.count:
+            return
+        if not self.count:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.total += other.total
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @classmethod
+    def from_table(cls, columns, count):
+        """Momentos exactos de una tabla de frecuencias.
+
+        `columns()` genera la tabla por bloques de secuencias paralelas
+        (valores, frecuencias) y se recorre una vez por suma. Las sumas se
+        hacen con exact_sum, así que el resultado no depende del orden de
+        la tabla ni de cómo se repartió el archivo: los backends de Python
+        y de NumPy imprimen los mismos dígitos.
+        """
+        stats = cls()
+        stats.count = count
+        stats.minimum = min(min(values) for values, _ in columns())
+        stats.maximum = max(max(values) for values, _ in columns())
+        stats.total = exact_sum(columns)
+        stats.mean = stats.total / count
+        stats.m2 = exact_sum(columns, stats.mean)
+        return stats
+
+    def average(self):
+        """Media aritmética (suma acumulada entre el conteo)."""
+        return self.total / self.count
+
+    def variance(self):
+        """Varianza poblacional a partir de M2."""
+        return self.m2 / self.count
+
+
+def exact_sum(columns, center=None):
+    """Suma de valor * frecuencia con redondeo correcto (math.fsum).
+
+    Con `center` suma (valor - center) ** 2 * frecuencia. fsum falla con
+    infinitos de signo opuesto o si un parcial se desborda; en ese caso se
+    usa la suma común, que da inf o nan como el programa original.
+    """
+    def terms():
+        for values, hits in columns():
+            if center is not None:
+                values = map(pow, map(operator.sub, values,
+                                      itertools.repeat(center)),
+                             itertools.repeat(2))
+            yield map(operator.mul, values, hits)
+
+    try:
+        return math.fsum(itertools.chain.from_iterable(terms()))
+    except (ValueError, OverflowError):
+        return sum(itertools.chain.from_iterable(terms()))
+
+
+class QuantileSketch:
+    """Resumen de cuantiles combinable, tipo KLL con compactores deterministas.
+
+    El nivel h guarda a lo sumo `capacity` valores de peso 2**h. Al llenarse
+    se ordena y se promueve uno de cada dos valores al nivel h + 1,
+    alternando el desplazamiento entre compactaciones. Cada compactación del
+    nivel h mueve el rango de cualquier consulta a lo sumo 2**h, por lo que
+    el error de rango está acotado por H * n / (capacity - 1), con H el
+    número de niveles (~log2(n / capacity) + 1). En la práctica el error
+    observado es mucho menor porque los desplazamientos alternos se
+    compensan. El resultado no depende de ninguna semilla aleatoria.
+    """
+
+    def __init__(self, capacity=DEFAULT_SKETCH_CAPACITY):
+        if capacity < 2:
+            raise ValueError("La capacidad del resumen debe ser al menos 2.")
+        self.capacity = capacity
+        self.count = 0
+        self.levels = [[]]
+        self._flips = [0]
+
+    def push(self, value):
+        """Agrega un valor con peso 1."""
+        self.levels[0].append(value)
+        self.count += 1
+        if len(self.levels[0]) >= self.capacity:
+            self._compress()
+
+    def merge(self, other):
+        """Combina otro resumen (por ejemplo, de otro fragmento)."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self._flips.append(0)
+        for height, items in enumerate(other.levels):
+            self.levels[height].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        """Compacta los niveles llenos promoviendo la mitad de sus valores."""
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if len(level) >= self.capacity:
+                level.sort()
+                # Solo se compacta un número par de elementos; el sobrante
+                # (el mayor) permanece en el nivel con su peso original.
+                keep = [level.pop()] if len(level) % 2 else []
+                offset = self._flips[height]
+                self._flips[height] ^= 1
+                if height + 1 == len(self.levels):
+                    self.levels.append([])
+                    self._flips.append(0)
+                self.levels[height + 1].extend(level[offset::2])
+                self.levels[height] = keep
+            height += 1
+
+    def quantile(self, fraction):
+        """Valor estimado de rango ceil(fraction * n) (rango más cercano)."""
+        weighted = sorted(
+            (value, 1 << height)
+            for height, level in enumerate(self.levels)
+            for value in level
+        )
+        target = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+
+class MisraGries:
+    """Valores frecuentes aproximados (Misra-Gries) con memoria fija.
+
+    Mantiene a lo sumo `capacity` contadores. Cuando llega un valor nuevo
+    sin contador libre, todos se decrementan en uno; la frecuencia real de
+    cada valor está entre su contador y contador + error, donde `error`
+    (el total decrementado) nunca supera n / (capacity + 1). Los resúmenes
+    de fragmentos distintos se combinan con la regla de Agarwal et al.
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or DEFAULT_MODE_BUDGET
+        self.counts = {}
+        self.first = {}
+        self.error = 0
+        self.seen = 0
+
+    def push(self, value):
+        """Registra una aparición del valor."""
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+            self.first[value] = self.seen
+        else:
+            self.error += 1
+            for key, hits in list(counts.items()):
+                if hits == 1:
+                    del counts[key]
+                    del self.first[key]
+                else:
+                    counts[key] = hits - 1
+        self.seen += 1
+
+    def merge(self, other):
+        """Combina el resumen de un fragmento posterior del archivo."""
+        for value, hits in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + hits
+            first = other.first[value] + self.seen
+            self.first[value] = min(self.first.get(value, first), first)
+        self.error += other.error
+        self.seen += other.seen
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(),
+                         reverse=True)[self.capacity]
+            self.error += cut
+            for key, hits in list(self.counts.items()):
+                if hits <= cut:
+                    del self.counts[key]
+                    del self.first[key]
+                else:
+                    self.counts[key] = hits - cut
+
+    def ranked(self):
+        """Pares (valor, frecuencia estimada) por frecuencia y aparición."""
+        return sorted(self.counts.items(),
+                      key=lambda item: (-item[1], self.first[item[0]]))
+
+    def mode(self):
+        """Moda estimada con la misma semántica que FrequencyTable.mode."""
+        ranked = self.ranked()
+        if self.error == 0 and len(ranked) == self.seen:
+            return "N/A"
+        modes = [value for value, hits in ranked if hits == ranked[0][1]]
+        return modes[0] if len(modes) == 1 else modes
+
+
+class Accumulator:
+    """Estadísticas parciales de un fragmento del archivo.
+
+    Guarda la tabla de frecuencias (o, con --approx, los momentos, el
+    resumen de cuantiles y los valores frecuentes), el número de líneas
+    leídas y los valores inválidos con su número de línea relativo al
+    fragmento. En modo exacto los momentos se calculan al final a partir
+    de la tabla (RunningStats.from_table).
+    """
+
+    def __init__(self, sketch_capacity=None, mode_budget=None):
+        self.stats = RunningStats()
+        if sketch_capacity is None:
+            self.frequency = FrequencyTable(mode_budget)
+            self.sketch = self.heavy = None
+        else:
+            self.frequency = None
+            self.sketch = QuantileSketch(sketch_capacity)
+            self.heavy = MisraGries(mode_budget)
+        self.lines = 0
+        self.errors = []
+
+    def push(self, value):
+        """Agrega un valor válido."""
+        if self.frequency is not None:
+            self.frequency.extend((value,))
+        else:
+            self.stats.push(value)
+            self.sketch.push(value)
+            self.heavy.push(value)
+
+    def extend(self, values):
+        """Agrega los valores válidos de un iterable."""
+        if self.frequency is not None:
+            self.frequency.extend(values)
+            return
+        for value in values:
+            self.push(value)
+
+    def merge(self, other):
+        """Combina el fragmento siguiente; el orden de combinación importa."""
+        self.stats.merge(other.stats)
+        if self.frequency is not None:
+            self.frequency.merge(other.frequency)
+        else:
+            self.sketch.merge(other.sketch)
+            self.heavy.merge(other.heavy)
+        self.lines += other.lines
+
+
+def report_invalid(line_no, text):
+    """Muestra un valor inválido con su número de línea."""
+    print(f"Error: línea {line_no}: '{text}' no es un número válido.")
+
+
+def parse_numbers(lines, on_error):
+    """Genera los números válidos de las líneas; on_error(línea, texto).
+
+    Las líneas llegan como bytes y solo se decodifican para reportar un
+    valor inválido. Se convierten por lotes con map(float), que ya ignora
+    los espacios y el salto de línea; solo un lote con una línea vacía o
+    inválida se recorre línea por línea.
+    """
+    return itertools.chain.from_iterable(number_batches(lines, on_error))
+
+
+def number_batches(lines, on_error):
+    """Genera listas con los números válidos de lotes de PARSE_BATCH líneas."""
+    lines = iter(lines)
+    first = 1
+    for batch in iter(lambda: list(itertools.islice(lines, PARSE_BATCH)),
+                      []):
+        try:
+            yield list(map(float, batch))
+        except ValueError:
+            yield list(parse_lines(batch, first, on_error))
+        first += len(batch)
+
+
+def parse_lines(lines, first, on_error):
+    """Convierte línea por línea; `first` es el número de la primera."""
+    for line_no, line in enumerate(lines, first):
+        clean_line = line.strip()
+        if clean_line:
+            try:
+                yield float(clean_line)
+            except ValueError:
+                on_error(line_no, clean_line.decode('utf-8', 'replace'))
+
+
+def read_numbers(filename):
+    """Genera los números válidos del archivo, reportando los inválidos."""
+    yield from parse_numbers(fastInput.iter_lines(filename), report_invalid)
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    """Divide el archivo en rangos de bytes alineados a saltos de línea.
+
+    Los límites dependen solo del contenido y de chunk_size, no del número
+    de procesos, para que el resultado combinado sea siempre el mismo. Un
+    archivo comprimido es un solo rango.
+    """
+    return fastInput.chunk_ranges(filename, chunk_size)
+
+
+def accumulate_chunk(filename, start, end, sketch_capacity=None,
+                     mode_budget=None):
+    """Procesa el rango [start, end) del archivo y devuelve su Accumulator."""
+    partial = Accumulator(sketch_capacity, mode_budget)
+    # El contador avanza una vez por línea entregada, válida o no.
+    consumed = itertools.count()
+    lines = map(operator.itemgetter(0),
+                zip(fastInput.iter_lines(filename, start, end), consumed))
+    partial.extend(parse_numbers(
+        lines, lambda *error: partial.errors.append(error)))
+    partial.lines = next(consumed)
+    return partial
+
+
+def accumulate_file(filename, sketch_capacity=None, workers=1,
+                    mode_budget=None):
+    """Recorre el archivo una sola vez, fragmento por fragmento.
+
+    Con workers > 1 los fragmentos se procesan en un pool de procesos; los
+    parciales se combinan siempre en el orden del archivo y los errores se
+    reportan con su número de línea global.
+    En serie y en modo exacto el archivo se recorre como un solo fragmento.
+    """
+    total = Accumulator(sketch_capacity, mode_budget)
+    ranges = chunk_ranges(filename)
+    if sketch_capacity is None and workers <= 1 and ranges:
+        # La tabla exacta no depende de los cortes: así no hay tablas que
+        # combinar.
+        ranges = [(ranges[0][0], ranges[-1][1])]
+    jobs = [(filename, start, end, sketch_capacity, mode_budget)
+            for start, end in ranges]
+
+    def combine(partial):
+        for line_no, text in partial.errors:
+            report_invalid(total.lines + line_no, text)
+        total.merge(partial)
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(accumulate_chunk, *zip(*jobs)):
+                combine(partial)
+    else:
+        for job in jobs:
+            combine(accumulate_chunk(*job))
+    return total
+
+
+def format_top(pairs, error=None):
+    """Describe los valores más frecuentes como 'valor (frecuencia)'."""
+    listed = ", ".join(f"{value} ({hits})" for value, hits in pairs)
+    if error is None:
+        return listed
+    return f"{listed} (aprox., error ≤ {error})"
+
+
+def python_statistics(filename, sketch_capacity=None, workers=1,
+                      mode_budget=None, top_k=0):
+    """Backend de Python: devuelve un Summary, o None si no hay datos."""
+    total = accumulate_file(filename, sketch_capacity, workers, mode_budget)
+    if total.sketch is None:
+        table = total.frequency
+        try:
+            if not table.size():
+                return None
+            stats = RunningStats.from_table(table.columns,
+                                            table.size())
+            top = format_top(table.top(top_k)) if top_k else None
+            return Summary(stats, table.median(), table.mode(), None, top)
+        finally:
+            table.close()
+    stats = total.stats
+    if not stats.count:
+        return None
+    heavy = total.heavy
+    percentiles = {p: total.sketch.quantile(p / 100)
+                   for p in REPORTED_PERCENTILES}
+    top = format_top(heavy.ranked()[:top_k], heavy.error) if top_k else None
+    return Summary(stats, f"{percentiles[50]} (aprox.)",
+                   f"{heavy.mode()} (aprox., error ≤ {heavy.error})",
+                   percentiles, top)
+
+
+def load_column(source):
+    """Lee con numpy.loadtxt un número por línea; None si hay más columnas.
+
+    Con ndmin=2 una línea como "1 2" produce dos columnas en lugar de dos
+    valores, y así se distingue de un archivo válido. Deja pasar ValueError.
+    """
+    values = np.loadtxt(source, dtype=np.float64, comments=None,
+                        encoding="utf-8", ndmin=2)
+    return values[:, 0] if values.shape[1] == 1 else None
+
+
+def load_array(filename, workers=1):
+    """Carga el archivo en un arreglo float64 con numpy.loadtxt.
+
+    Si alguna línea no es un número válido se recurre al lector línea a
+    línea, que reporta cada valor inválido igual que el backend de Python.
+    Con workers > 1 los fragmentos de chunk_ranges se cargan en un pool de
+    procesos y se concatenan en el orden del archivo: el arreglo (y por lo
+    tanto el resultado) es el mismo con cualquier número de procesos.
+    """
+    ranges = chunk_ranges(filename)
+    if workers > 1 and len(ranges) > 1:
+        return load_chunks(filename, ranges, workers)
+    try:
+        with contextlib.ExitStack() as stack, warnings.catch_warnings():
+            # Un archivo vacío solo produce una advertencia de NumPy
+            warnings.simplefilter("ignore", UserWarning)
+            source = filename
+            if fastInput.is_compressed(filename):
+                source = io.TextIOWrapper(
+                    stack.enter_context(fastInput.open_stream(filename)),
+                    encoding="utf-8")
+            values = load_column(source)
+        if values is not None:
+            return values
+    except ValueError:
+        pass
+    return np.fromiter(read_numbers(filename), dtype=np.float64)
+
+
+def load_chunk(filename, start, end):
+    """Carga el rango [start, end) del archivo como arreglo float64.
+
+    Devuelve (valores, líneas, errores); los errores llevan el número de
+    línea relativo al fragmento, como en accumulate_chunk.
+    """
+    block = b"".join(fastInput.iter_blocks(filename, start, end))
+    errors = []
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            values = load_column(io.BytesIO(block))
+        if values is None:
+            raise ValueError("se esperaba un número por línea")
+    except ValueError:
+        values = np.fromiter(
+            parse_numbers(block.splitlines(),
+                          lambda *error: errors.append(error)),
+            dtype=np.float64)
+    return values, len(block.splitlines()), errors
+
+
+def load_chunks(filename, ranges, workers):
+    """Carga los fragmentos en paralelo y los une en el orden del archivo."""
+    arrays = []
+    lines = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for values, chunk_lines, errors in executor.map(
+                load_chunk, itertools.repeat(filename),
+                *zip(*ranges)):
+            for line_no, text in errors:
+                report_invalid(lines + line_no, text)
+            lines += chunk_lines
+            arrays.append(values)
+    return np.concatenate(arrays)
+
+
+def numpy_median(values):
+    """Mediana con np.partition, sin ordenar todo el arreglo."""
+    mid = values.size // 2
+    if values.size % 2 == 0:
+        lower, upper = np.partition(values, (mid - 1, mid))[mid - 1:mid + 1]
+        return (float(lower) + float(upper)) / 2
+    return float(np.partition(values, mid)[mid])
+
+
+def numpy_mode(uniques, first_seen, counts, top_k=0):
+    """Moda y valores más frecuentes a partir de np.unique.
+
+    Devuelve (moda, top) con la semántica de FrequencyTable: "N/A" si
+    ningún valor se repite y los empates en orden de primera aparición.
+    """
+    max_freq = counts.max()
+    if max_freq == 1:
+        mode = "N/A"
+    else:
+        winners = np.flatnonzero(counts == max_freq)
+        order = np.argsort(first_seen[winners], kind="stable")
+        modes = uniques[winners][order].tolist()
+        mode = modes[0] if len(modes) == 1 else modes
+    top = None
+    if top_k:
+        best = np.lexsort((first_seen, -counts))[:top_k]
+        top = format_top(zip(uniques[best].tolist(), counts[best].tolist()))
+    return mode, top
+
+
+def numpy_statistics(values, top_k=0):
+    """Calcula momentos, mediana y moda de forma vectorizada.
+
+    Conserva la semántica del backend de Python: la moda es "N/A" si ningún
+    valor se repite y, en caso de empate, las modas aparecen en el orden de
+    su primera aparición en el archivo. Los momentos salen de la misma
+    tabla de frecuencias que en el backend de Python (from_table), así que
+    ambos imprimen los mismos dígitos. Devuelve un Summary como
+    python_statistics.
+    """
+    uniques, first_seen, counts = np.unique(values, return_index=True,
+                                            return_counts=True)
+    table = [(uniques.tolist(), counts.tolist())]
+    stats = RunningStats.from_table(lambda: table, int(values.size))
+    mode, top = numpy_mode(uniques, first_seen, counts, top_k)
+    return Summary(stats, numpy_median(values), mode, None, top)
+
+
+def format_results(filename, summary, elapsed_time):
+    """Construye el reporte de estadísticas."""
+    stats = summary.stats
+    results = (
+        f"--- Estadísticas --- \n"
+        f"Archivo: {filename}\n"
+        f"Cantidad de elementos: {stats.count}\n"
+        f"Media: {stats.average()}\n"
+        f"Mediana: {summary.median}\n"
+        f"Moda: {summary.mode}\n"
+    )
+    if summary.top:
+        results += f"Valores más frecuentes: {summary.top}\n"
+    results += (
+        f"Varianza Poblacional: {stats.variance()}\n"
+        f"Desv Estandar Poblacional: {stats.variance() ** 0.5}\n"
+    )
+    if summary.percentiles:
+        listed = ", ".join(f"p{p}={v}"
+                           for p, v in summary.percentiles.items())
+        results += f"Percentiles (aprox.): {listed}\n"
+    return results + (
+        f"Tiempo de ejecución: {elapsed_time:.6f} segundos\n"
+        f"-------------------- \n"
+    )
+
+
+def compute_summary(filename, args, workers=1):
+    """Calcula el Summary de un archivo con el backend elegido en `args`.
+
+    El backend no depende de `workers`, así que el reporte es el mismo con
+    cualquier número de procesos. Devuelve None si el archivo no tiene
+    datos numéricos y deja pasar FileNotFoundError.
+    """
+    use_numpy = (not args.approx and np is not None
+                 and args.backend != "python")
+    if use_numpy:
+        values = load_array(filename, workers)
+        return numpy_statistics(values, args.top_k) if values.size else None
+    sketch_capacity = args.sketch_size if args.approx else None
+    return python_statistics(filename, sketch_capacity, workers,
+                             args.mode_budget, args.top_k)
+
+
+def expand_inputs(patterns):
+    """Expande directorios y patrones glob a una lista de archivos."""
+    filenames = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            filenames.extend(
+                path for path in sorted(glob.glob(os.path.join(pattern, "*")))
+                if os.path.isfile(path))
+        elif not os.path.exists(pattern) and glob.has_magic(pattern):
+            filenames.extend(sorted(glob.glob(pattern)))
+        else:
+            filenames.append(pattern)
+    return filenames
+
+
+def batch_row(filename, args):
+    """Procesa un archivo del lote; devuelve (fila, mensajes de consola)."""
+    start_time = time.time()
+    row = dict.fromkeys(BATCH_FIELDS)
+    row["archivo"] = filename
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        try:
+            summary = compute_summary(filename, args)
+            row["estado"] = "ok" if summary else "sin datos numéricos"
+        except FileNotFoundError:
+            summary = None
+            row["estado"] = "no existe"
+        except ImportError as error:
+            summary = None
+            row["estado"] = str(error)
+    if summary:
+        stats = summary.stats
+        row.update(elementos=stats.count, media=stats.average(),
+                   mediana=summary.median, moda=summary.mode,
+                   varianza=stats.variance(),
+                   desviacion=stats.variance() ** 0.5)
+    row["segundos"] = round(time.time() - start_time, 6)
+    return row, messages.getvalue()
+
+
+def run_batch(filenames, args):
+    """Procesa varios archivos y escribe un solo reporte consolidado."""
+    rows = []
+    jobs = [(filename, args) for filename in filenames]
+    with contextlib.ExitStack() as stack:
+        if args.workers > 1 and len(jobs) > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=args.workers))
+            results = executor.map(batch_row, *zip(*jobs))
+        else:
+            results = itertools.starmap(batch_row, jobs)
+        for row, messages in results:
+            for message in messages.splitlines():
+                print(f"{row['archivo']}: {message}")
+            rows.append(row)
+
+    out_name = args.summary or f"{BATCH_REPORT}.{args.format}"
+    with open(out_name, "w", encoding="utf-8", newline="") as out_file:
+        if args.format == "json":
+            json.dump(rows, out_file, ensure_ascii=False, indent=2)
+            out_file.write("\n")
+        else:
+            writer = csv.DictWriter(out_file, BATCH_FIELDS, delimiter="\t",
+                                    lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+    return out_name
+
+
+def parse_args(argv):
+    """Interpreta los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog="computeStatistics.py",
+        description="Calcula estadísticas descriptivas de un archivo.")
+    parser.add_argument(
+        "filenames", nargs="+", metavar="archivo",
+        help="archivo con un número por línea; varios archivos, un "
+             "directorio o un patrón glob activan el modo lote")
+    parser.add_argument(
+        "--approx", action="store_true",
+        help="estima p50/p90/p99 con un resumen de cuantiles y la moda con "
+             "Misra-Gries, en memoria acotada y sin tabla de frecuencias")
+    parser.add_argument(
+        "--backend", choices=("auto", "python", "numpy"), default="auto",
+        help="motor de cálculo en modo exacto; 'auto' usa NumPy si está "
+             "instalado (--approx solo existe en el backend de Python)")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="procesos para repartir los fragmentos del archivo, o los "
+             "archivos en modo lote (por defecto 1)")
+    parser.add_argument(
+        "--sketch-size", type=int, default=DEFAULT_SKETCH_CAPACITY,
+        help="capacidad por nivel del resumen de cuantiles "
+             f"(por defecto {DEFAULT_SKETCH_CAPACITY})")
+    parser.add_argument(
+        "--top-k", type=int, default=0, metavar="K",
+        help="reporta también los K valores más frecuentes")
+    parser.add_argument(
+        "--mode-budget", type=int, metavar="N",
+        help="entradas en memoria para contar frecuencias: las de la tabla "
+             "exacta antes de volcarla a disco (por defecto "
+             f"{DEFAULT_TABLE_BUDGET}) o los contadores de Misra-Gries con "
+             f"--approx (por defecto {DEFAULT_MODE_BUDGET})")
+    parser.add_argument(
+        "--summary", metavar="ARCHIVO",
+        help="reporte consolidado del modo lote (lo activa aunque haya un "
+             f"solo archivo; por defecto {BATCH_REPORT}.tsv)")
+    parser.add_argument(
+        "--format", choices=("tsv", "json"), default="tsv",
+        help="formato del reporte consolidado (por defecto tsv)")
+    return parser.parse_args(argv)
+
+
+def backend_error(args):
+    """Mensaje si el backend pedido no se puede usar; None si se puede."""
+    if args.backend != "numpy":
+        return None
+    if np is None:
+        return "El backend 'numpy' requiere tener NumPy instalado."
+    if args.approx:
+        return "--approx solo está disponible con el backend 'python'."
+    return None
+
+
+def report_batch(filenames, args, start_time):
+    """Modo lote: procesa los archivos e indica dónde quedó el reporte."""
+    if not filenames:
+        print("Error: No se encontraron archivos para procesar.")
+        return
+    out_name = run_batch(filenames, args)
+    print(f"{len(filenames)} archivos procesados en "
+          f"{time.time() - start_time:.6f} segundos. "
+          f"Reporte: {out_name}")
+
+
+def report_file(filename, args, start_time):
+    """Modo de un archivo: imprime el reporte y lo agrega a su archivo."""
+    # Req 2 y 3: Cálculos y manejo de datos inválidos
+    try:
+        summary = compute_summary(filename, args, args.workers)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{filename}' no existe.")
+        return
+    except ImportError as error:
+        print(f"Error: {error}")
+        return
+
+    if summary is None:
+        print("Error: No se encontraron datos numéricos para procesar.")
+        return
+
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+
+    # Formatear resultados
+    results = format_results(filename, summary, elapsed_time)
+
+    # Req 2 y 7: Imprimir en pantalla y guardar en archivo
+    print(results, filename)
+    with open(f"StatisticsResults_{filename}.txt", "a", encoding="utf-8") as out_file:
+        out_file.write(results + "\n")
+
+
+def main():
+    """Función principal para ejecutar el programa."""
+    start_time = time.time()
+
+    if len(sys.argv) < 2:
+        print("Uso: python computeStatistics.py fileWithData.txt [--approx]")
+        return
+
+    args = parse_args(sys.argv[1:])
+    error = backend_error(args)
+    if error:
+        print(f"Error: {error}")
+        return
+
+    filenames = expand_inputs(args.filenames)
+    if args.summary or len(filenames) > 1 or filenames != args.filenames:
+        report_batch(filenames, args, start_time)
+    else:
+        report_file(filenames[0], args, start_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+# pylint: disable=invalid-name
+"""
+Módulo: frequencyTable.py
+Descripción: Tabla de frecuencias exacta de computeStatistics.py con
+             memoria acotada.
+
+Mientras caben en el presupuesto, los valores se cuentan en un Counter.
+Al excederlo, la tabla se vuelca a archivos temporales como corridas
+ordenadas por valor que se combinan por bloques al consultar la mediana,
+la moda o los valores más frecuentes.
+"""
+
+import bisect
+import contextlib
+import heapq
+import itertools
+import math
+import operator
+import os
+import shutil
+import tempfile
+from array import array
+from collections import Counter
+
+DEFAULT_TABLE_BUDGET = 1 << 22
+TABLE_BATCH = 1 << 16
+
+
+class FrequencyTable:
+    """Tabla de frecuencias exacta con memoria acotada por `budget`.
+
+    Los valores se cuentan en un Counter, que conserva el orden de primera
+    aparición. Si la tabla en memoria llega a `budget` entradas se vuelca a
+    un archivo temporal como una corrida ordenada de tres arreglos (valor,
+    frecuencia, orden de aparición) y se empieza otra. Al consultar la
+    tabla las corridas se combinan por bloques (heapq.merge) en una sola
+    corrida ordenada, de modo que en memoria nunca hay más del orden de
+    `budget` entradas. Si todo cabe en memoria no se escribe nada a disco.
+    """
+
+    def __init__(self, budget=None):
+        self.budget = max(2, budget or DEFAULT_TABLE_BUDGET)
+        self.counts = Counter()
+        # Corridas en disco: (ruta, entradas, desplazamiento del orden).
+        self.runs = []
+        self.spilled = 0
+        self._size = 0
+
+    def extend(self, values):
+        """Cuenta las apariciones de los valores del iterable."""
+        step = max(1, min(TABLE_BATCH, self.budget // 2))
+        values = iter(values)
+        for batch in iter(lambda: list(itertools.islice(values, step)), []):
+            self.counts.update(batch)
+            self._size += len(batch)
+            if len(self.counts) > self.budget - step:
+                self._spill()
+
+    def merge(self, other):
+        """Agrega la tabla de un fragmento posterior del archivo."""
+        self._size += other.size()
+        if other.runs:
+            self._spill()
+            self.runs.extend((path, entries, offset + self.spilled)
+                             for path, entries, offset in other.runs)
+            self.spilled += other.spilled
+            self.counts = other.counts
+        else:
+            add_counts(self.counts, other.counts)
+        other.runs = []
+        if len(self.counts) > self.budget:
+            self._spill()
+
+    def size(self):
+        """Número de apariciones registradas."""
+        return self._size
+
+    def close(self):
+        """Borra las corridas en disco."""
+        remove_runs(self.runs)
+        self.runs = []
+
+    def _spill(self):
+        """Vuelca la tabla en memoria a disco como una corrida ordenada."""
+        counts = self.counts
+        if not counts:
+            return
+        # El Counter está en orden de primera aparición: la permutación que
+        # ordena los valores da, para cada uno, su orden de aparición.
+        order = list(counts)
+        perm = sorted(range(len(order)), key=order.__getitem__)
+        hits = list(counts.values())
+        values = array('d', map(order.__getitem__, perm))
+        block = (values, array('q', map(hits.__getitem__, perm)),
+                 array('q', perm))
+        self.counts = Counter()
+        self.runs.append(write_run([block], self.spilled))
+        self.spilled += len(values)
+
+    def _settle(self):
+        """Deja una sola corrida en disco si la tabla no cupo en memoria."""
+        if not self.runs:
+            return
+        self._spill()
+        # Cada paso combina a lo sumo `fanout` corridas leyendo bloques que,
+        # juntos, ocupan la mitad del presupuesto.
+        fanout = max(2, math.isqrt(self.budget // 2))
+        while len(self.runs) > 1:
+            group, self.runs = self.runs[:fanout], self.runs[fanout:]
+            self.runs.append(write_run(merged_blocks(group, self.budget), 0))
+            remove_runs(group)
+
+    def entries(self):
+        """Genera (valor, frecuencia, orden de aparición) ordenados por valor.
+
+        Solo se usa cuando la tabla se volcó a disco (ver _settle).
+        """
+        return read_run(self.runs[0], max(1, self.budget // 2))
+
+    def columns(self, ordered=False):
+        """Genera la tabla por bloques como pares (valores, frecuencias).
+
+        Cada par son dos secuencias paralelas, para recorrerlas con map sin
+        crear una tupla por entrada. Con ordered=True los valores salen
+        ordenados; si no, en cualquier orden.
+        """
+        self._settle()
+        if not self.runs:
+            if not ordered:
+                yield self.counts.keys(), self.counts.values()
+                return
+            ordered_values = sorted(self.counts)
+            for start in range(0, len(ordered_values), TABLE_BATCH):
+                values = ordered_values[start:start + TABLE_BATCH]
+                yield values, list(map(self.counts.__getitem__, values))
+            return
+        for values, hits, _ in read_blocks(self.runs[0],
+                                           max(1, self.budget // 2)):
+            yield values, hits
+
+    def median(self):
+        """Mediana recorriendo los valores ordenados con su frecuencia.
+
+        En cada bloque las frecuencias acumuladas se calculan con
+        itertools.accumulate y la posición buscada se localiza con bisect.
+        """
+        count = self.size()
+        mid = count // 2
+        targets = (mid - 1, mid) if count % 2 == 0 else (mid,)
+        found = []
+        seen = 0
+        for values, hits in self.columns(ordered=True):
+            # seen[i] apariciones antes de values[i]
+            seen = list(itertools.accumulate(hits, initial=seen))
+            while len(found) < len(targets) and targets[len(found)] < seen[-1]:
+                found.append(values[bisect.bisect_right(
+                    seen, targets[len(found)]) - 1])
+            if len(found) == len(targets):
+                break
+            seen = seen[-1]
+        if len(found) == 2:
+            return (found[0] + found[1]) / 2
+        return found[0]
+
+    def mode(self):
+        """Moda con la semántica del programa original.
+
+        "N/A" si ningún valor se repite; con empate, la lista de modas en
+        orden de primera aparición.
+        """
+        self._settle()
+        if not self.runs:
+            max_freq = max(self.counts.values())
+            if max_freq == 1:
+                return "N/A"
+            modes = [value for value, hits in self.counts.items()
+                     if hits == max_freq]
+        else:
+            max_freq = 1
+            winners = []
+            for value, hits, first in self.entries():
+                if hits > max_freq:
+                    max_freq = hits
+                    winners = []
+                if hits == max_freq > 1:
+                    winners.append((first, value))
+            if max_freq == 1:
+                return "N/A"
+            winners.sort()
+            modes = [value for _, value in winners]
+        return modes[0] if len(modes) == 1 else modes
+
+    def top(self, k):
+        """Los k valores más frecuentes como pares (valor, frecuencia).
+
+        Los empates se ordenan por primera aparición.
+        """
+        self._settle()
+        if not self.runs:
+            # nlargest es estable: respeta el orden de aparición del Counter
+            return heapq.nlargest(k, self.counts.items(),
+                                  key=operator.itemgetter(1))
+        best = heapq.nsmallest(k, self.entries(),
+                               key=lambda entry: (-entry[1], entry[2]))
+        return [(value, hits) for value, hits, _ in best]
+
+
+def add_counts(counts, other):
+    """Suma `other` a `counts` conservando el orden de primera aparición.
+
+    Solo las claves comunes se suman en Python; las nuevas se agregan al
+    final con dict.update, sin el recorrido por clave de Counter.update.
+    """
+    common = {value: counts[value] + other[value]
+              for value in counts.keys() & other.keys()}
+    dict.update(counts, other)
+    dict.update(counts, common)
+
+
+def merged_blocks(runs, budget):
+    """Combina corridas ordenadas y genera bloques de la corrida resultante.
+
+    Las frecuencias de un mismo valor se suman y se conserva su primera
+    aparición. Los bloques leídos y el bloque en construcción ocupan, en
+    total, del orden de `budget` entradas.
+    """
+    block = max(1, budget // (2 * len(runs)))
+    size = max(1, budget // 2)
+    values, hits, first = array('d'), array('q'), array('q')
+    for value, count, index in heapq.merge(
+            *(read_run(run, block) for run in runs)):
+        if values and values[-1] == value:
+            hits[-1] += count
+            first[-1] = min(first[-1], index)
+            continue
+        if len(values) >= size:
+            yield values, hits, first
+            values, hits, first = array('d'), array('q'), array('q')
+        values.append(value)
+        hits.append(count)
+        first.append(index)
+    if values:
+        yield values, hits, first
+
+
+def write_run(blocks, offset):
+    """Escribe una corrida en un archivo temporal y devuelve su descriptor.
+
+    `blocks` genera tripletas de arreglos (valores, frecuencias, orden).
+    Las frecuencias y el orden se escriben en archivos auxiliares y se
+    concatenan al final, así que cada columna queda contigua.
+    """
+    descriptor, path = tempfile.mkstemp(prefix="computeStatistics-",
+                                        suffix=".run")
+    entries = 0
+    with contextlib.ExitStack() as stack:
+        out_file = stack.enter_context(os.fdopen(descriptor, "w+b"))
+        columns = [stack.enter_context(tempfile.TemporaryFile())
+                   for _ in range(2)]
+        for values, hits, first in blocks:
+            values.tofile(out_file)
+            hits.tofile(columns[0])
+            first.tofile(columns[1])
+            entries += len(values)
+        for column in columns:
+            column.seek(0)
+            shutil.copyfileobj(column, out_file)
+    return path, entries, offset
+
+
+def remove_runs(runs):
+    """Borra los archivos de las corridas dadas."""
+    for path, _, _ in runs:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+def read_run(run, block_size):
+    """Genera las entradas (valor, frecuencia, orden) de una corrida."""
+    for columns in read_blocks(run, block_size):
+        yield from zip(*columns)
+
+
+def read_blocks(run, block_size):
+    """Genera los bloques de una corrida como tres arreglos paralelos."""
+    path, entries, offset = run
+    with open(path, "rb") as file:
+        for start in range(0, entries, block_size):
+            size = min(block_size, entries - start)
+            columns = []
+            for column, code in enumerate("dqq"):
+                file.seek((column * entries + start) * 8)
+                block = array(code)
+                block.fromfile(file, size)
+                columns.append(block)
+            if offset:
+                columns[2] = array('q', (index + offset
+                                         for index in columns[2]))
+            yield columns
@@ -1,91 +1,543 @@
-# pylint: disable=invalid-name
-"""
-Programa: convertNumbers.py
-Descripción: Convierte números a binario y hexadecimal.
-"""
-
-import sys
-import time
-import os
-
-
-def to_binary(n):
-    """Algoritmo manual para binario."""
-    if n == 0:
-        return "0"
-    binary = ""
-    is_neg = n < 0
-    num = abs(int(n))
-    while num > 0:
-        binary = str(num % 2) + binary
-        num //= 2
-    return f"-{binary}" if is_neg else binary
-
-
-def to_hexadecimal(n):
-    """Algoritmo manual para hexadecimal."""
-    if n == 0:
-        return "0"
-    chars = "0123456789ABCDEF"
-    hexa = ""
-    is_neg = n < 0
-    num = abs(int(n))
-    while num > 0:
-        hexa = chars[num % 16] + hexa
-        num //= 16
-    return f"-{hexa}" if is_neg else hexa
-
-
-def process_file(filename):
-    """Lee el archivo y convierte los datos, manejando errores."""
-    data_converted = []
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                clean = line.strip()
-                if clean:
-                    try:
-                        num = int(float(clean))
-                        data_converted.append((num, to_binary(num), to_hexadecimal(num)))
-                    except ValueError:
-                        print(f"Error: '{clean}' no es un número válido.")
-    except FileNotFoundError:
-        print(f"Error: El archivo '{filename}' no existe.")
-        return None
-    return data_converted
-
-
-def save_results(results, filename, elapsed):
-    """Genera el reporte y lo guarda en disco."""
-    base = os.path.splitext(os.path.basename(filename))[0]
-    out_name = f"ConvertionResults_{base}.txt"
-    header = (
-        f"--- Resultados ---\n"
-        f"Archivo: {filename}\n"
-        f"Tiempo: {elapsed:.6f} s\n"
-        f"{'Num':>10} | {'Bin':>20} | {'Hex':>10}\n"
-        + "-" * 50 + "\n"
-    )
-    body = "\n".join([f"{n:>10} | {b:>20} | {h:>10}" for n, b, h in results])
-    final_text = header + body + "\n"
-    print(final_text)
-    with open(out_name, "a", encoding="utf-8") as f_out:
-        f_out.write(final_text)
-
-
-def main():
-    """Orquestador principal."""
-    start = time.time()
-    if len(sys.argv) != 2:
-        print("Uso: python convertNumbers.py file.txt")
-        return
-
-    fname = sys.argv[1]
-    results = process_file(fname)
-    if results is not None:
-        elapsed = time.time() - start
-        save_results(results, fname, elapsed)
-
-if __name__ == "__main__":
-    main()
-    
\ No newline at end of file
+# pylint: disable=invalid-name
+"""
+Programa: convertNumbers.py
+Descripción: Convierte números a binario y hexadecimal.
+
+Cada número se traduce con tablas de bytes precalculadas a las bases del
+registro BASES y el reporte se escribe en streaming en uno de los
+formatos de FORMATS. El archivo se lee con fastInput.py y puede dividirse
+en fragmentos que se convierten en varios procesos (--workers). Los
+valores inválidos se reportan en la salida de errores.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import struct
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fastInput
+except ImportError:  # fastInput.py vive en la carpeta de la actividad.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    import fastInput
+
+
+HEX_DIGITS = "0123456789ABCDEF"
+RADIX_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BATCH_SIZE = 4096
+WRITE_BUFFER = 1 << 20
+CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_BASES = ("bin", "hex")
+DEFAULT_TWOS_BITS = 32
+RECORDS_MAGIC = b"CNV1"
+
+# Tablas de 256 entradas: cada byte de la magnitud se traduce de una vez a
+# sus 8 dígitos binarios o 2 dígitos hexadecimales.
+BYTE_TO_BIN = tuple(
+    "".join("01"[(byte >> shift) & 1] for shift in range(7, -1, -1))
+    for byte in range(256)
+)
+BYTE_TO_HEX = tuple(
+    HEX_DIGITS[byte >> 4] + HEX_DIGITS[byte & 0xF] for byte in range(256)
+)
+
+Base = namedtuple("Base", "label width render")
+Format = namedtuple("Format",
+                    "extension mode encoding separator header row trailer")
+RunOptions = namedtuple("RunOptions", "names bits fmt workers echo")
+
+
+def magnitude_bytes(n):
+    """Bytes big-endian del valor absoluto de n (al menos un byte)."""
+    num = abs(int(n))
+    return num.to_bytes(max(1, (num.bit_length() + 7) // 8), "big")
+
+
+def render_bytes(raw, table, negative=False):
+    """Traduce los bytes con la tabla y quita los ceros a la izquierda."""
+    digits = "".join(map(table.__getitem__, raw)).lstrip("0") or "0"
+    return f"-{digits}" if negative and digits != "0" else digits
+
+
+def to_binary(n):
+    """Binario por tabla de bytes, en tiempo lineal en el número de dígitos."""
+    return render_bytes(magnitude_bytes(n), BYTE_TO_BIN, n < 0)
+
+
+def to_hexadecimal(n):
+    """Hexadecimal por tabla de bytes, en tiempo lineal en los dígitos."""
+    return render_bytes(magnitude_bytes(n), BYTE_TO_HEX, n < 0)
+
+
+def table_renderer(table):
+    """Renderizador para una tabla de bytes (binario o hexadecimal)."""
+    def render(raw, negative):
+        return render_bytes(raw, table, negative)
+    return render
+
+
+def power_of_two_renderer(digit_bits, digits_per_piece):
+    """Renderizador para una base 2**digit_bits que no divide al byte.
+
+    Los bytes se agrupan en bloques de mcm(8, bits por pieza) bits y cada
+    bloque se parte en piezas de `digits_per_piece` dígitos que se
+    traducen con una tabla, así que el costo sigue siendo lineal.
+    """
+    piece_bits = digit_bits * digits_per_piece
+    group_bytes = math.lcm(8, piece_bits) // 8
+    mask = (1 << piece_bits) - 1
+    shifts = range(group_bytes * 8 - piece_bits, -1, -piece_bits)
+    table = tuple(
+        "".join(RADIX_DIGITS[(piece >> (digit_bits * i))
+                             & ((1 << digit_bits) - 1)]
+                for i in range(digits_per_piece - 1, -1, -1))
+        for piece in range(1 << piece_bits)
+    )
+
+    def render(raw, negative):
+        raw = bytes(-len(raw) % group_bytes) + raw
+        pieces = []
+        for i in range(0, len(raw), group_bytes):
+            value = int.from_bytes(raw[i:i + group_bytes], "big")
+            pieces.extend(table[(value >> shift) & mask] for shift in shifts)
+        text = "".join(pieces).lstrip("0") or "0"
+        return f"-{text}" if negative and text != "0" else text
+    return render
+
+
+def radix_renderer(radix, piece_digits):
+    """Renderizador para una base cualquiera por división recursiva.
+
+    El número se parte por potencias radix**(piece_digits * 2**k) y cada
+    mitad se convierte por separado, en lugar de dividir dígito por dígito.
+    """
+    powers = [radix ** piece_digits]
+
+    def small(num):
+        text = ""
+        while num:
+            num, rem = divmod(num, radix)
+            text = RADIX_DIGITS[rem] + text
+        return text
+
+    def split(num, level, width):
+        if level < 0:
+            return small(num).rjust(width, "0")
+        high, low = divmod(num, powers[level])
+        half = piece_digits << level
+        return (split(high, level - 1, width - half if width else 0)
+                + split(low, level - 1, half))
+
+    def render(raw, negative):
+        num = int.from_bytes(raw, "big")
+        while powers[-1] <= num:
+            powers.append(powers[-1] * powers[-1])
+        level = next(i for i, power in enumerate(powers) if power > num)
+        text = split(num, level - 1, 0).lstrip("0") or "0"
+        return f"-{text}" if negative and text != "0" else text
+    return render
+
+
+def twos_complement_renderer(bits):
+    """Renderizador de complemento a dos con `bits` dígitos binarios.
+
+    Los valores fuera del rango con signo [-2**(bits-1), 2**(bits-1)) se
+    reportan como "N/A".
+    """
+    limit = 1 << (bits - 1)
+
+    def render(raw, negative):
+        num = int.from_bytes(raw, "big")
+        if negative:
+            num = -num
+        if not -limit <= num < limit:
+            return "N/A"
+        return render_bytes(magnitude_bytes(num % (limit << 1)),
+                            BYTE_TO_BIN).rjust(bits, "0")
+    return render
+
+
+BASES = {
+    "bin": Base("Bin", 20, table_renderer(BYTE_TO_BIN)),
+    "oct": Base("Oct", 12, power_of_two_renderer(3, 4)),
+    "hex": Base("Hex", 10, table_renderer(BYTE_TO_HEX)),
+    "b32": Base("B32", 10, power_of_two_renderer(5, 2)),
+    "b36": Base("B36", 10, radix_renderer(36, 4)),
+}
+
+
+def register_base(name, base):
+    """Agrega o reemplaza una base en el registro."""
+    BASES[name] = base
+
+
+def register_twos_complement(bits=DEFAULT_TWOS_BITS):
+    """Registra la columna "c2" de complemento a dos con `bits` dígitos."""
+    if bits < 1:
+        raise ValueError("El ancho del complemento a dos debe ser positivo.")
+    register_base("c2", Base("C2", max(bits, 10),
+                             twos_complement_renderer(bits)))
+
+
+register_twos_complement()
+
+
+def resolve_bases(names):
+    """Devuelve las bases del registro para los nombres pedidos."""
+    unknown = [name for name in names if name not in BASES]
+    if unknown:
+        raise ValueError(f"Bases desconocidas: {', '.join(unknown)}. "
+                         f"Disponibles: {', '.join(BASES)}.")
+    return [BASES[name] for name in names]
+
+
+def convert_number(num, bases=None):
+    """Devuelve (num, columna, ...) extrayendo los bytes una sola vez.
+
+    Por defecto las columnas son binario y hexadecimal; `bases` es una
+    lista de entradas del registro y solo esas se calculan.
+    """
+    if bases is None:
+        bases = resolve_bases(DEFAULT_BASES)
+    raw = magnitude_bytes(num)
+    negative = num < 0
+    return (num,) + tuple(base.render(raw, negative) for base in bases)
+
+
+def convert_many(numbers, names=DEFAULT_BASES):
+    """Convierte una lista o arreglo de enteros en una sola llamada.
+
+    Devuelve una lista de tuplas (num, columna, ...) con las bases de
+    `names` en el mismo orden de la entrada.
+    """
+    bases = resolve_bases(names)
+    return [convert_number(int(num), bases) for num in numbers]
+
+
+def report_invalid(line_no, text):
+    """Muestra un valor inválido con su número de línea.
+
+    El mensaje va a la salida de errores: la tabla se escribe en la salida
+    estándar mientras se lee el archivo y no debe quedar intercalado.
+    """
+    print(f"Error: línea {line_no}: '{text}' no es un número válido.",
+          file=sys.stderr)
+
+
+def parse_numbers(lines, on_error=report_invalid):
+    """Genera los enteros válidos de las líneas; on_error(línea, texto).
+
+    Las líneas llegan como bytes y solo se decodifican para reportar un
+    valor inválido. Los enteros se leen con int(), exactos a cualquier
+    tamaño; solo los decimales y exponentes pasan por float() y se
+    truncan. Un valor infinito o fuera del rango de float es inválido.
+    """
+    for line_no, line in enumerate(lines, 1):
+        clean = line.strip()
+        if not clean:
+            continue
+        try:
+            try:
+                num = int(clean)
+            except ValueError:
+                num = int(float(clean))
+        except (ValueError, OverflowError):
+            on_error(line_no, clean.decode("utf-8", "replace"))
+            continue
+        yield num
+
+
+def convert_lines(lines, bases=None, on_error=report_invalid):
+    """Genera las filas (num, columna, ...) de las líneas (bytes) dadas.
+
+    No materializa los resultados: cada línea se convierte cuando el
+    consumidor pide la siguiente fila.
+    """
+    if bases is None:
+        bases = resolve_bases(DEFAULT_BASES)
+    for num in parse_numbers(lines, on_error):
+        yield convert_number(num, bases)
+
+
+def text_widths(columns):
+    """Anchos de la tabla de texto: número y una por base."""
+    return [10] + [base.width for _, base in columns]
+
+
+def text_header(filename, columns):
+    """Encabezado de la tabla de texto."""
+    labels = ["Num"] + [base.label for _, base in columns]
+    widths = text_widths(columns)
+    title = " | ".join(f"{label:>{width}}"
+                       for label, width in zip(labels, widths))
+    rule = "-" * (sum(widths) + 3 * (len(widths) - 1) + 4)
+    return (f"--- Resultados ---\n"
+            f"Archivo: {filename}\n"
+            f"{title}\n{rule}\n")
+
+
+def text_row(row, columns):
+    """Línea de la tabla de texto para una fila convertida."""
+    return " | ".join(f"{value:>{width}}"
+                      for value, width in zip(row, text_widths(columns)))
+
+
+def text_trailer(total, elapsed):
+    """Línea de cierre con el número de filas y el tiempo total."""
+    return f"Filas: {total}\nTiempo: {elapsed:.6f} s\n"
+
+
+def csv_header(_filename, columns):
+    """Fila de nombres de columna del CSV."""
+    return ",".join(["num"] + [name for name, _ in columns]) + "\n"
+
+
+def csv_row(row, _columns):
+    """Fila del CSV; los dígitos nunca requieren comillas."""
+    return ",".join(map(str, row))
+
+
+def jsonl_row(row, columns):
+    """Objeto JSON de una fila; `num` es un entero."""
+    names = ["num"] + [name for name, _ in columns]
+    return json.dumps(dict(zip(names, row)))
+
+
+def records_header(_filename, columns):
+    """Encabezado del formato binario: firma y nombres de columna."""
+    names = [b"num"] + [name.encode("ascii") for name, _ in columns]
+    return (RECORDS_MAGIC + struct.pack("<B", len(names))
+            + b"".join(struct.pack("<B", len(name)) + name for name in names))
+
+
+def records_row(row, _columns):
+    """Registro binario: marca 1 y cada campo como longitud uint32 + ASCII."""
+    fields = [str(value).encode("ascii") for value in row]
+    return b"\x01" + b"".join(struct.pack("<I", len(field)) + field
+                              for field in fields)
+
+
+def records_trailer(total, elapsed):
+    """Cierre del formato binario: marca 0, filas (uint64) y segundos."""
+    return b"\x00" + struct.pack("<Qd", total, elapsed)
+
+
+def no_header(_filename, _columns):
+    """Formato sin encabezado."""
+    return ""
+
+
+def no_trailer(_total, _elapsed):
+    """Formato sin línea de cierre."""
+    return ""
+
+
+# La tabla de texto se agrega al final del archivo como siempre; los
+# formatos para otras herramientas lo reemplazan para que contenga una sola
+# tabla. El binario no tiene codificación y nunca se repite en pantalla.
+FORMATS = {
+    "text": Format(".txt", "a", "utf-8", "\n",
+                   text_header, text_row, text_trailer),
+    "csv": Format(".csv", "w", "utf-8", "\n",
+                  csv_header, csv_row, no_trailer),
+    "jsonl": Format(".jsonl", "w", "utf-8", "\n",
+                    no_header, jsonl_row, no_trailer),
+    "records": Format(".bin", "wb", None, b"",
+                      records_header, records_row, records_trailer),
+}
+DEFAULT_OPTIONS = RunOptions(DEFAULT_BASES, DEFAULT_TWOS_BITS,
+                             FORMATS["text"], 1, True)
+
+
+def output_name(filename, fmt=FORMATS["text"]):
+    """Nombre del archivo de resultados para un archivo de entrada."""
+    base = os.path.splitext(
+        os.path.basename(fastInput.strip_compression(filename)))[0]
+    return f"ConvertionResults_{base}{fmt.extension}"
+
+
+def format_batches(rows, columns, fmt, batch_size=BATCH_SIZE):
+    """Formatea las filas en bloques de `batch_size`: (bloque, filas)."""
+    separator = fmt.separator
+    while True:
+        lines = [fmt.row(row, columns)
+                 for row in itertools.islice(rows, batch_size)]
+        if not lines:
+            return
+        yield separator.join(lines) + separator, len(lines)
+
+
+def report_columns(options):
+    """Pares (nombre, base) de las columnas pedidas en `options`."""
+    return [(name, BASES[name]) for name in options.names]
+
+
+def write_report(blocks, filename, start, options=DEFAULT_OPTIONS):
+    """Escribe encabezado, bloques y cierre; devuelve el número de filas.
+
+    El modo de apertura y la codificación salen de la entrada de FORMATS.
+    """
+    fmt = options.fmt
+    outputs = [sys.stdout] if options.echo and fmt.encoding else []
+    total = 0
+    with open(output_name(filename, fmt), fmt.mode, buffering=WRITE_BUFFER,
+              encoding=fmt.encoding) as f_out:
+        outputs.append(f_out)
+        header = fmt.header(filename, report_columns(options))
+        for out in outputs:
+            out.write(header)
+        for block, count in blocks:
+            total += count
+            for out in outputs:
+                out.write(block)
+        trailer = fmt.trailer(total, time.time() - start)
+        for out in outputs:
+            out.write(trailer)
+    return total
+
+
+def save_results(rows, filename, start, options=DEFAULT_OPTIONS,
+                 batch_size=BATCH_SIZE):
+    """Escribe el reporte en streaming y devuelve el número de filas.
+
+    Las filas se formatean y escriben en lotes de `batch_size` líneas al
+    archivo (con búfer) y, si `options.echo` es verdadero, a la salida
+    estándar, por lo que la memoria no depende del tamaño de la entrada.
+    El tiempo transcurrido desde `start` se conoce hasta el final, así que
+    se escribe en una línea de cierre después de la tabla.
+    """
+    return write_report(
+        format_batches(rows, report_columns(options), options.fmt,
+                       batch_size),
+        filename, start, options)
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    """Divide el archivo en rangos de bytes alineados a saltos de línea.
+
+    Un archivo comprimido es un solo rango.
+    """
+    return fastInput.chunk_ranges(filename, chunk_size)
+
+
+def convert_chunk(filename, start, end, options):
+    """Convierte y formatea el rango [start, end) del archivo.
+
+    Devuelve (bloque, filas, líneas, errores); los errores llevan el número
+    de línea relativo al fragmento. El registro se reconstruye con
+    `options.bits` porque el proceso puede no haber heredado el del
+    proceso principal.
+    """
+    register_twos_complement(options.bits)
+    columns = report_columns(options)
+    fmt = options.fmt
+    errors = []
+    # El contador avanza una vez por línea entregada, válida o no.
+    consumed = itertools.count()
+    lines = (line for line, _ in
+             zip(fastInput.iter_lines(filename, start, end), consumed))
+    rows = convert_lines(lines, [base for _, base in columns],
+                         lambda *error: errors.append(error))
+    blocks = list(format_batches(rows, columns, fmt))
+    empty = fmt.separator[:0]
+    return (empty.join(block for block, _ in blocks),
+            sum(count for _, count in blocks), next(consumed), errors)
+
+
+def convert_parallel(filename, ranges, options):
+    """Genera los bloques de los rangos convertidos en un pool de procesos.
+
+    Se mantienen a lo sumo 2 * options.workers fragmentos en curso y los
+    bloques se entregan en el orden del archivo; los errores se reportan
+    con su número de línea global antes del bloque de su fragmento.
+    """
+    offset = 0
+    pending = deque()
+
+    def collect():
+        nonlocal offset
+        block, count, lines, errors = pending.popleft().result()
+        for line_no, text in errors:
+            report_invalid(offset + line_no, text)
+        offset += lines
+        return block, count
+
+    with ProcessPoolExecutor(max_workers=options.workers) as executor:
+        for start, end in ranges:
+            pending.append(executor.submit(
+                convert_chunk, filename, start, end, options))
+            if len(pending) >= 2 * options.workers:
+                yield collect()
+        while pending:
+            yield collect()
+
+
+def parse_args(argv):
+    """Interpreta los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Convierte números a binario y hexadecimal.")
+    parser.add_argument("filename", help="Archivo con un número por línea.")
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="No repetir la tabla en pantalla; solo se escribe el archivo.")
+    parser.add_argument(
+        "--bases", default=",".join(DEFAULT_BASES),
+        help="Columnas separadas por comas: " + ", ".join(BASES)
+        + f" (por defecto {','.join(DEFAULT_BASES)}).")
+    parser.add_argument(
+        "--bits", type=int, default=DEFAULT_TWOS_BITS,
+        help="Ancho en bits de la columna c2 (complemento a dos).")
+    parser.add_argument(
+        "--format", choices=sorted(FORMATS), default="text",
+        help="Formato de salida; 'records' es binario y no se muestra.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Procesos para convertir fragmentos del archivo en paralelo.")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Orquestador principal."""
+    start = time.time()
+    if len(sys.argv) < 2:
+        print("Uso: python convertNumbers.py file.txt [--quiet] "
+              "[--bases bin,hex] [--format text] [--workers N]")
+        return
+
+    args = parse_args(sys.argv[1:])
+    try:
+        register_twos_complement(args.bits)
+        names = [name.strip() for name in args.bases.split(",")
+                 if name.strip()]
+        bases = resolve_bases(names)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
+    options = RunOptions(tuple(names), args.bits, FORMATS[args.format],
+                         args.workers, not args.quiet)
+    try:
+        # chunk_ranges valida el archivo antes de crear el reporte.
+        ranges = chunk_ranges(args.filename)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{args.filename}' no existe.")
+        return
+    except ImportError as error:
+        print(f"Error: {error}")
+        return
+    if args.workers > 1:
+        write_report(convert_parallel(args.filename, ranges, options),
+                     args.filename, start, options)
+        return
+    save_results(convert_lines(fastInput.iter_lines(args.filename), bases),
+                 args.filename, start, options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,715 @@
-# pylint: disable=invalid-name
-"""
-Programa: wordCount.py
-Descripción: Cuenta la frecuencia de palabras en un archivo de texto
-             utilizando algoritmos básicos.
-"""
-
-import sys
-import time
-import os
-
-
-def get_word_frequency(filename):
-    """Lee el archivo y cuenta la frecuencia de cada palabra."""
-    word_counts = {}
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                # Separamos por espacios y limpiamos espacios en blanco
-                words = line.split()
-                for word in words:
-                    # Limpiar puntuación y pasar a minúsculas
-                    clean_word = word.strip().lower()
-                    if clean_word:
-                        # Algoritmo básico de conteo con diccionario
-                        if clean_word in word_counts:
-                            word_counts[clean_word] += 1
-                        else:
-                            word_counts[clean_word] = 1
-    except FileNotFoundError:
-        print(f"Error: El archivo '{filename}' no existe.")
-        return None
-    except Exception as error:  # pylint: disable=broad-except
-        print(f"Error al procesar el archivo: {error}")
-        return None
-    return word_counts
-
-
-def save_and_print_results(counts, filename, elapsed_time):
-    """Formatea, imprime y guarda los resultados en el archivo."""
-    # Extraer nombre para el archivo de salida
-    base_name = os.path.splitext(os.path.basename(filename))[0]
-    output_name = f"WordCountResults_{base_name}.txt"
-    # Construcción del reporte
-    lines = [
-        "--- Conteo de Palabras ---",
-        f"Archivo: {filename}",
-        f"Tiempo de ejecución: {elapsed_time:.6f} segundos",
-        f"{'Palabra':<20} | {'Frecuencia':<10}",
-        "-" * 35
-    ]
-
-    # Añadir cada palabra y su frecuencia (ordenadas por frecuencia de mayor a menor)
-    sorted_words = sorted(counts.items(), key=lambda item: item[1], reverse=True)
-    for word, freq in sorted_words:
-        lines.append(f"{word:<20} | {freq:<10}")
-    final_report = "\n".join(lines) + "\n"
-
-    # Mostrar en consola y guardar
-    print(final_report)
-    with open(output_name, "a", encoding="utf-8") as out_file:
-        out_file.write(final_report)
-
-
-def main():
-    """Función principal (Orquestador)."""
-    start_time = time.time()
-
-    if len(sys.argv) != 2:
-        print("Uso: python wordCount.py fileWithData.txt")
-        return
-    input_file = sys.argv[1]
-    results = get_word_frequency(input_file)
-    if results is not None:
-        total_time = time.time() - start_time
-        save_and_print_results(results, input_file, total_time)
-
-
-if __name__ == "__main__":
-    main()
+# pylint: disable=invalid-name
+"""
+Programa: wordCount.py
+Descripción: Cuenta la frecuencia de palabras en un archivo de texto
+             utilizando algoritmos básicos.
+
+El texto se lee con fastInput.py en bloques cortados en espacios, se
+normaliza según la política elegida y se cuenta con Counter. Hay modos
+para varios procesos o archivos (map-reduce con volcado a disco), para
+las K palabras más frecuentes (--top), para un conteo aproximado de
+memoria fija (--approx) y para un conteo incremental (--state).
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import re
+import string
+import sys
+import tempfile
+import time
+import os
+import unicodedata
+from array import array
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fastInput
+except ImportError:  # fastInput.py vive en la carpeta de la actividad.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    import fastInput
+
+BLOCK_SIZE = 1 << 20
+CHUNK_SIZE = 8 * 1024 * 1024
+SORT_BATCH = 1 << 20
+REPORT_BATCH = 4096
+DEFAULT_CAPACITY = 1024
+DEFAULT_SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+DEFAULT_APPROX_TOP = 100
+STATE_VERSION = 1
+FINGERPRINT_SIZE = 4096
+PUNCTUATION = string.punctuation + "¡¿«»“”‘’–—…"
+WORD_PATTERN = re.compile(r"[^\W_]+")
+COMBINING_MARKS = re.compile(r"[\u0300-\u036f]+")
+
+Policy = namedtuple("Policy", "punctuation case accents")
+DEFAULT_POLICY = Policy("keep", "lower", "keep")
+# Opciones del conteo por fragmentos: `approx` es (capacidad, ancho) o None.
+CountOptions = namedtuple("CountOptions",
+                          "policy workers spill_dir spill_limit approx")
+DEFAULT_COUNT_OPTIONS = CountOptions(DEFAULT_POLICY, 1, None, 0, None)
+
+
+def read_blocks(filename, start=0, end=None, block_size=BLOCK_SIZE):
+    """Genera bloques de texto de ~block_size bytes cortados en espacios.
+
+    fastInput corta el rango en bytes de espacio ASCII sin decodificarlo y
+    cada bloque se decodifica de una sola vez, así que ninguna palabra ni
+    carácter queda partido entre dos bloques.
+    """
+    for block in fastInput.iter_blocks(filename, start, end, block_size,
+                                       fastInput.WHITESPACE):
+        yield block.decode('utf-8')
+
+
+def tokenize(block, policy=DEFAULT_POLICY):
+    """Normaliza un bloque completo y devuelve la lista de sus palabras.
+
+    Política (Policy):
+    - punctuation: "keep" deja los signos pegados a la palabra (como el
+      conteo original), "strip" los quita de los extremos de cada palabra
+      y "split" los trata como separadores.
+    - case: "lower" (str.lower), "fold" (str.casefold) o "keep".
+    - accents: "keep" o "strip" (descompone en NFD y quita las marcas).
+    """
+    if policy.case == "lower":
+        block = block.lower()
+    elif policy.case == "fold":
+        block = block.casefold()
+    if policy.accents == "strip":
+        decomposed = unicodedata.normalize("NFD", block)
+        block = unicodedata.normalize(
+            "NFC", COMBINING_MARKS.sub("", decomposed))
+    if policy.punctuation == "split":
+        return WORD_PATTERN.findall(block)
+    if policy.punctuation == "strip":
+        return [word for word in
+                (token.strip(PUNCTUATION) for token in block.split()) if word]
+    return block.split()
+
+
+def get_word_frequency(filename, policy=DEFAULT_POLICY):
+    """Lee el archivo por bloques y cuenta la frecuencia de cada palabra.
+
+    Devuelve un Counter cuyas palabras conservan el orden de primera
+    aparición.
+    """
+    word_counts = Counter()
+    try:
+        for block in read_blocks(filename):
+            word_counts.update(tokenize(block, policy))
+    except FileNotFoundError:
+        print(f"Error: El archivo '{filename}' no existe.")
+        return None
+    except Exception as error:  # pylint: disable=broad-except
+        print(f"Error al procesar el archivo: {error}")
+        return None
+    return word_counts
+
+
+class CountMinSketch:
+    """Frecuencias aproximadas en memoria fija (Count-Min).
+
+    Cada una de las `depth` filas tiene `width` contadores. La estimación
+    de una palabra nunca es menor que su frecuencia real y, con
+    probabilidad 1 - e**-depth, la excede a lo sumo en e / width * n. El
+    hash es determinista, así que los bosquejos de distintos procesos se
+    combinan sumando sus tablas.
+    """
+
+    def __init__(self, width=DEFAULT_SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("q", [0]) * width for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, word):
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + row * step) % self.width for row in range(self.depth)]
+
+    def add(self, word, hits=1):
+        """Suma `hits` apariciones de la palabra."""
+        for row, index in zip(self.rows, self._indexes(word)):
+            row[index] += hits
+        self.total += hits
+
+    def estimate(self, word):
+        """Cota superior de la frecuencia de la palabra."""
+        return min(row[index]
+                   for row, index in zip(self.rows, self._indexes(word)))
+
+    def error_bound(self):
+        """Sobreestimación máxima (con probabilidad 1 - e**-depth)."""
+        return math.ceil(math.e / self.width * self.total)
+
+    def merge(self, other):
+        """Suma otro bosquejo con las mismas dimensiones."""
+        for row, other_row in zip(self.rows, other.rows):
+            for index, hits in enumerate(other_row):
+                if hits:
+                    row[index] += hits
+        self.total += other.total
+
+
+class SpaceSaving:
+    """Palabras más frecuentes con `capacity` contadores (Space-Saving).
+
+    Cuando llega una palabra nueva sin contador libre, reemplaza a la de
+    menor conteo c y hereda c como error. La frecuencia real de cada
+    palabra guardada está entre conteo - error y conteo, y toda palabra con
+    frecuencia mayor que n / capacity está en la tabla. El mínimo se busca
+    en un heap con entradas perezosas.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def _push(self, word):
+        heapq.heappush(self._heap, (self.counts[word], word))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(hits, key) for key, hits in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def floor(self):
+        """Conteo mínimo de la tabla si está llena, o 0."""
+        if len(self.counts) < self.capacity:
+            return 0
+        while True:
+            hits, word = self._heap[0]
+            if self.counts.get(word) == hits:
+                return hits
+            heapq.heappop(self._heap)
+
+    def add(self, word, hits=1):
+        """Suma `hits` apariciones de la palabra."""
+        counts = self.counts
+        if word in counts:
+            counts[word] += hits
+        elif len(counts) < self.capacity:
+            counts[word] = hits
+            self.errors[word] = 0
+        else:
+            floor = self.floor()
+            _, evicted = heapq.heappop(self._heap)
+            del counts[evicted]
+            del self.errors[evicted]
+            counts[word] = floor + hits
+            self.errors[word] = floor
+        self._push(word)
+
+    def merge(self, other):
+        """Combina otro resumen (Agarwal et al.) y conserva los mayores."""
+        floor, other_floor = self.floor(), other.floor()
+        merged = {}
+        for word in itertools.chain(self.counts, other.counts):
+            if word not in merged:
+                merged[word] = (
+                    self.counts.get(word, floor)
+                    + other.counts.get(word, other_floor),
+                    self.errors.get(word, floor)
+                    + other.errors.get(word, other_floor))
+        kept = heapq.nlargest(self.capacity, merged.items(),
+                              key=lambda item: item[1][0])
+        self.counts = {word: hits for word, (hits, _) in kept}
+        self.errors = {word: error for word, (_, error) in kept}
+        self._heap = [(hits, word) for word, hits in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class HeavyHitters:
+    """Top-K aproximado con memoria fija: Space-Saving más Count-Min.
+
+    Space-Saving elige las candidatas y Count-Min acota su frecuencia por
+    arriba; cada palabra se reporta con la menor de las dos estimaciones y
+    con la cota inferior conteo - error de Space-Saving.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, width=DEFAULT_SKETCH_WIDTH):
+        self.sketch = CountMinSketch(width)
+        self.candidates = SpaceSaving(capacity)
+
+    def update(self, counts):
+        """Agrega las frecuencias de un bloque (palabra -> apariciones)."""
+        for word, hits in counts.items():
+            self.sketch.add(word, hits)
+            self.candidates.add(word, hits)
+
+    def merge(self, other):
+        """Combina el resumen de otro fragmento."""
+        self.sketch.merge(other.sketch)
+        self.candidates.merge(other.candidates)
+
+    def top(self, k):
+        """Lista de (palabra, estimación, mínimo) de mayor a menor."""
+        ranked = []
+        for word, hits in self.candidates.counts.items():
+            estimate = min(hits, self.sketch.estimate(word))
+            lower = max(hits - self.candidates.errors[word], 0)
+            ranked.append((word, estimate, lower))
+        return heapq.nsmallest(k, ranked,
+                               key=lambda item: (-item[1], -item[2], item[0]))
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    """Divide el archivo en rangos de bytes que terminan en un espacio.
+
+    Los cortes se hacen justo después de un byte de espacio ASCII, que en
+    UTF-8 nunca forma parte de un carácter multibyte, así que ninguna
+    palabra ni carácter queda partido entre dos rangos. Un archivo
+    comprimido es un solo rango.
+    """
+    return fastInput.chunk_ranges(filename, chunk_size, fastInput.WHITESPACE)
+
+
+def spill_run(counter, directory, shard, segment):
+    """Escribe el contador como corrida ordenada por palabra; devuelve la ruta.
+
+    Cada línea es palabra, frecuencia y la clave de primera aparición
+    (fragmento, segmento, posición en el segmento), que ordena las palabras
+    igual que su primera aparición en el archivo.
+    """
+    path = os.path.join(directory, f"run-{shard:06d}-{segment:06d}.tsv")
+    ranked = sorted((word, count, rank)
+                    for rank, (word, count) in enumerate(counter.items()))
+    with open(path, "w", encoding="utf-8") as run:
+        run.writelines(f"{word}\t{count}\t{shard}\t{segment}\t{rank}\n"
+                       for word, count, rank in ranked)
+    return path
+
+
+def read_run(path):
+    """Genera (palabra, frecuencia, clave de aparición) de una corrida."""
+    with open(path, encoding="utf-8") as run:
+        for line in run:
+            word, count, shard, segment, rank = line.rstrip("\n").split("\t")
+            yield word, int(count), (int(shard), int(segment), int(rank))
+
+
+def count_range(filename, start, end, shard, options=DEFAULT_COUNT_OPTIONS):
+    """Cuenta las palabras del rango [start, end) del archivo.
+
+    Devuelve (contador, corridas). Si `options.spill_limit` es positivo y
+    el contador supera ese número de palabras distintas, se vuelca a una
+    corrida en `options.spill_dir` y se empieza uno nuevo; el contador
+    devuelto es el último segmento, que todavía no se ha volcado. Con
+    `options.approx` se devuelve un HeavyHitters en lugar del contador,
+    que solo vive un bloque a la vez.
+    """
+    counts = Counter()
+    runs = []
+    summary = HeavyHitters(*options.approx) if options.approx else None
+    for block in read_blocks(filename, start, end):
+        if summary is not None:
+            summary.update(Counter(tokenize(block, options.policy)))
+            continue
+        counts.update(tokenize(block, options.policy))
+        if options.spill_limit and len(counts) > options.spill_limit:
+            runs.append(spill_run(counts, options.spill_dir, shard,
+                                  len(runs)))
+            counts = Counter()
+    return (counts if summary is None else summary), runs
+
+
+def merge_runs(paths):
+    """Combina corridas ordenadas por palabra sumando sus frecuencias."""
+    merged = heapq.merge(*(read_run(path) for path in paths),
+                         key=lambda record: record[0])
+    for word, records in itertools.groupby(merged, key=lambda rec: rec[0]):
+        records = list(records)
+        yield (word, sum(count for _, count, _ in records),
+               min(first for _, _, first in records))
+
+
+def external_order(paths, directory, batch_size=SORT_BATCH):
+    """Genera (palabra, frecuencia) de mayor a menor frecuencia en disco.
+
+    Los empates se resuelven por primera aparición, como sorted() sobre el
+    Counter, pero solo se tienen `batch_size` palabras en memoria a la vez.
+    """
+    def order(record):
+        return -record[1], record[2]
+
+    sorted_runs = []
+    records = merge_runs(paths)
+    while True:
+        batch = sorted(itertools.islice(records, batch_size), key=order)
+        if not batch:
+            break
+        path = os.path.join(directory, f"sorted-{len(sorted_runs):06d}.tsv")
+        with open(path, "w", encoding="utf-8") as run:
+            run.writelines(f"{word}\t{count}\t{shard}\t{segment}\t{rank}\n"
+                           for word, count, (shard, segment, rank) in batch)
+        sorted_runs.append(path)
+    merged = heapq.merge(*(read_run(path) for path in sorted_runs), key=order)
+    for word, count, _ in merged:
+        yield word, count
+
+
+def count_files(filenames, options=DEFAULT_COUNT_OPTIONS):
+    """Cuenta varios archivos (o uno grande) por fragmentos, estilo map-reduce.
+
+    Los fragmentos de todos los archivos se cuentan en orden, en un pool de
+    `options.workers` procesos si son más de uno, y los contadores
+    parciales se combinan en el orden de los archivos. Devuelve (contador,
+    corridas): sin volcados las corridas están vacías y el contador es el
+    resultado; si algún fragmento se volcó a disco, todo el conteo pasa a
+    corridas y el contador queda vacío. Con `options.approx` el contador
+    es un HeavyHitters que combina los resúmenes de todos los fragmentos.
+    """
+    jobs = [(filename, start, end)
+            for filename in filenames
+            for start, end in chunk_ranges(filename)]
+    jobs = [job + (shard, options) for shard, job in enumerate(jobs)]
+    total = HeavyHitters(*options.approx) if options.approx else Counter()
+    runs = []
+    with contextlib.ExitStack() as stack:
+        if options.workers > 1 and len(jobs) > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=options.workers))
+            results = executor.map(count_range, *zip(*jobs))
+        else:
+            results = itertools.starmap(count_range, jobs)
+        for shard, (partial, partial_runs) in enumerate(results):
+            if options.approx:
+                total.merge(partial)
+                continue
+            if not runs and not partial_runs:
+                total.update(partial)
+                if (not options.spill_limit
+                        or len(total) <= options.spill_limit):
+                    continue
+                partial, partial_runs = Counter(), []
+            if not runs and total:
+                # Lo acumulado viene de fragmentos sin volcados anteriores a
+                # éste, así que la clave (0, 0, rango) los ordena primero.
+                runs.append(spill_run(total, options.spill_dir, 0, 0))
+                total = Counter()
+            runs.extend(partial_runs)
+            if partial:
+                runs.append(spill_run(partial, options.spill_dir, shard,
+                                      len(partial_runs)))
+    return total, runs
+
+
+def fingerprint(buffer, start, end):
+    """Huella (blake2b) de los bytes [start, end) del archivo."""
+    return hashlib.blake2b(buffer[start:end], digest_size=16).hexdigest()
+
+
+def load_state(path):
+    """Lee el estado (JSON comprimido con gzip); None si falta o no sirve."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as state_file:
+            state = json.load(state_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError):
+        print(f"Aviso: el estado '{path}' está dañado; se cuenta desde cero.")
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(path, state):
+    """Escribe el estado en un temporal y lo reemplaza de forma atómica."""
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as state_file:
+        json.dump(state, state_file, ensure_ascii=False,
+                  separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def resume_point(state, mapped, policy):
+    """(contador, desplazamiento) guardados si el estado sigue valiendo.
+
+    El estado vale si la política es la misma y las huellas de los
+    primeros bytes y de los anteriores al desplazamiento coinciden con el
+    archivo; si no, el archivo se truncó o se rotó y se devuelve None.
+    """
+    saved = state["offset"]
+    if (state["policy"] != list(policy) or saved > len(mapped)
+            or state["head"] != fingerprint(
+                mapped, 0, min(saved, FINGERPRINT_SIZE))
+            or state["tail"] != fingerprint(
+                mapped, max(saved - FINGERPRINT_SIZE, 0), saved)):
+        return None
+    return Counter(dict(state["words"])), saved
+
+
+def state_record(filename, mapped, cut, policy, counts):
+    """Estado a guardar tras procesar los bytes [0, cut) del archivo."""
+    return {
+        "version": STATE_VERSION,
+        "file": os.path.abspath(filename),
+        "offset": cut,
+        "policy": list(policy),
+        "head": fingerprint(mapped, 0, min(cut, FINGERPRINT_SIZE)),
+        "tail": fingerprint(mapped, max(cut - FINGERPRINT_SIZE, 0), cut),
+        "words": list(counts.items()),
+    }
+
+
+def count_incremental(filename, state_path, policy=DEFAULT_POLICY):
+    """Cuenta solo lo agregado al archivo desde la corrida anterior.
+
+    El estado guarda el conteo (en orden de primera aparición), el
+    desplazamiento en bytes ya procesado, la política y dos huellas (ver
+    resume_point). Si el archivo se truncó, se rotó o cambió la política,
+    el estado se descarta y se cuenta desde cero. Solo se guarda hasta el
+    último espacio: una palabra final sin espacio se suma al resultado
+    devuelto pero no al estado, porque el archivo todavía puede crecer a
+    mitad de ella.
+    """
+    if fastInput.is_compressed(filename):
+        raise ValueError("El modo incremental requiere un archivo sin "
+                         "comprimir.")
+    with fastInput.map_file(filename) as mapped:
+        size = len(mapped)
+        state = load_state(state_path)
+        resumed = None if state is None else resume_point(state, mapped,
+                                                          policy)
+        if state is not None and resumed is None:
+            print(f"Aviso: '{filename}' se truncó, se rotó o cambió la "
+                  "política; se cuenta desde cero.")
+        counts, offset = resumed or (Counter(), 0)
+        cut = fastInput.last_cut(mapped, offset, size,
+                                 fastInput.WHITESPACE) or offset
+        for block in read_blocks(filename, offset, cut):
+            counts.update(tokenize(block, policy))
+        save_state(state_path,
+                   state_record(filename, mapped, cut, policy, counts))
+        if cut < size:
+            counts = counts.copy()
+            for block in read_blocks(filename, cut, size):
+                counts.update(tokenize(block, policy))
+    return counts
+
+
+def write_report(lines, rows, output_name):
+    """Muestra y agrega al archivo el encabezado y las filas por lotes."""
+    rows = iter(rows)
+    with open(output_name, "a", encoding="utf-8") as out_file:
+        while lines:
+            text = "\n".join(lines) + "\n"
+            sys.stdout.write(text)
+            out_file.write(text)
+            lines = list(itertools.islice(rows, REPORT_BATCH))
+    print()
+
+
+def report_name(filename, base_name=None):
+    """Nombre del archivo de salida para la entrada (o `base_name`)."""
+    if base_name is None:
+        base_name = os.path.splitext(
+            os.path.basename(fastInput.strip_compression(filename)))[0]
+    return f"WordCountResults_{base_name}.txt"
+
+
+def ranked_words(counts, top=None):
+    """Pares (palabra, frecuencia) de mayor a menor frecuencia.
+
+    Con `top` solo se seleccionan las K palabras más frecuentes con un
+    heap, en O(n log K), en el mismo orden que tendrían en el reporte
+    completo.
+    """
+    if top:
+        return heapq.nlargest(top, counts.items(), key=lambda item: item[1])
+    return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+
+def save_and_print_results(sorted_words, filename, elapsed_time,
+                           base_name=None):
+    """Formatea, imprime y guarda los resultados en el archivo.
+
+    `sorted_words` son los pares (palabra, frecuencia) ya ordenados (ver
+    ranked_words, top_from_runs y external_order). El reporte se escribe
+    por lotes, sin armarlo completo en memoria. `base_name` reemplaza al
+    nombre derivado de `filename` para el archivo de salida.
+    """
+    # Construcción del reporte
+    lines = [
+        "--- Conteo de Palabras ---",
+        f"Archivo: {filename}",
+        f"Tiempo de ejecución: {elapsed_time:.6f} segundos",
+        f"{'Palabra':<20} | {'Frecuencia':<10}",
+        "-" * 35
+    ]
+
+    # Mostrar en consola y guardar
+    write_report(lines, (f"{word:<20} | {freq:<10}"
+                         for word, freq in sorted_words),
+                 report_name(filename, base_name))
+
+
+def save_and_print_approximate(summary, filename, elapsed_time, top,
+                               base_name=None):
+    """Reporte del modo aproximado: top-K con sus cotas de error."""
+    sketch = summary.sketch
+    lines = [
+        "--- Conteo de Palabras (aproximado) ---",
+        f"Archivo: {filename}",
+        f"Tiempo de ejecución: {elapsed_time:.6f} segundos",
+        f"Palabras: {sketch.total}; la frecuencia real está entre Mínimo y "
+        f"Frecuencia (Count-Min sobreestima ≤ {sketch.error_bound()} con "
+        f"probabilidad {1 - math.exp(-sketch.depth):.3f})",
+        f"{'Palabra':<20} | {'Frecuencia':<10} | {'Mínimo':<10}",
+        "-" * 48
+    ]
+    write_report(lines, (f"{word:<20} | {freq:<10} | {lower:<10}"
+                         for word, freq, lower in summary.top(top)),
+                 report_name(filename, base_name))
+
+
+def top_from_runs(runs, top):
+    """Las `top` palabras de las corridas en disco, sin ordenarlas todas."""
+    best = heapq.nsmallest(top, merge_runs(runs),
+                           key=lambda record: (-record[1], record[2]))
+    return [(word, count) for word, count, _ in best]
+
+
+def parse_args(argv):
+    """Interpreta los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Cuenta la frecuencia de palabras en un archivo.")
+    parser.add_argument("filenames", nargs="+",
+                        help="Archivo(s) de texto a procesar.")
+    parser.add_argument(
+        "--punctuation", choices=("keep", "strip", "split"),
+        default=DEFAULT_POLICY.punctuation,
+        help="Signos de puntuación: conservarlos, quitarlos de los extremos "
+             "de cada palabra o usarlos como separadores.")
+    parser.add_argument(
+        "--case", choices=("lower", "fold", "keep"),
+        default=DEFAULT_POLICY.case,
+        help="Normalización de mayúsculas: lower, casefold o ninguna.")
+    parser.add_argument(
+        "--accents", choices=("keep", "strip"),
+        default=DEFAULT_POLICY.accents,
+        help="Conservar o quitar acentos y diacríticos.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Procesos para contar fragmentos del archivo en paralelo.")
+    parser.add_argument(
+        "--spill-limit", type=int, default=0,
+        help="Palabras distintas por proceso antes de volcar conteos "
+             "parciales a disco (0 = nunca).")
+    parser.add_argument(
+        "--spill-dir", default=None,
+        help="Directorio para las corridas temporales en disco.")
+    parser.add_argument(
+        "--top", type=int, default=None,
+        help="Reportar solo las K palabras más frecuentes.")
+    parser.add_argument(
+        "--approx", action="store_true",
+        help="Top-K aproximado en memoria fija (Count-Min + Space-Saving); "
+             f"sin --top reporta {DEFAULT_APPROX_TOP} palabras.")
+    parser.add_argument(
+        "--capacity", type=int, default=DEFAULT_CAPACITY,
+        help="Contadores de Space-Saving en el modo aproximado.")
+    parser.add_argument(
+        "--sketch-width", type=int, default=DEFAULT_SKETCH_WIDTH,
+        help="Contadores por fila del Count-Min en el modo aproximado.")
+    parser.add_argument(
+        "--state", default=None,
+        help="Archivo de estado para el modo incremental: solo se cuenta "
+             "lo agregado al archivo desde la corrida anterior.")
+    return parser.parse_args(argv)
+
+
+def report_incremental(args, policy, start_time):
+    """Modo --state: cuenta lo agregado al archivo y reporta el total."""
+    if len(args.filenames) != 1 or args.approx:
+        print("Error: --state requiere un solo archivo y conteo exacto.")
+        return
+    input_file = args.filenames[0]
+    try:
+        results = count_incremental(input_file, args.state, policy)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{input_file}' no existe.")
+        return
+    except Exception as error:  # pylint: disable=broad-except
+        print(f"Error al procesar el archivo: {error}")
+        return
+    total_time = time.time() - start_time
+    save_and_print_results(ranked_words(results, args.top), input_file,
+                           total_time)
+
+
+def report_file(args, policy, start_time):
+    """Un solo archivo contado en memoria en este proceso."""
+    input_file = args.filenames[0]
+    results = get_word_frequency(input_file, policy)
+    if results is not None:
+        total_time = time.time() - start_time
+        save_and_print_results(ranked_words(results, args.top), input_file,
+                               total_time)
+
+
+def report_chunks(args, policy, start_time):
+    """Conteo por fragmentos: varios archivos, procesos, volcados o approx."""
+    base_name = None if len(args.filenames) == 1 else "lote"
+    with tempfile.TemporaryDirectory(dir=args.spill_dir) as spill_dir:
+        approx = (args.capacity, args.sketch_width) if args.approx else None
+        options = CountOptions(policy, args.workers, spill_dir,
+                               args.spill_limit, approx)
+        try:
+            counts, runs = count_files(args.filenames, options)
+        except FileNotFoundError as error:
+            print(f"Error: El archivo '{error.filename}' no existe.")
+            return
+        except Exception as error:  # pylint: disable=broad-except
+            print(f"Error al procesar el archivo: {error}")
+            return
+        total_time = time.time() - start_time
+        label = ", ".join(args.filenames)
+        if approx:
+            save_and_print_approximate(counts, label, total_time,
+                                       args.top or DEFAULT_APPROX_TOP,
+                                       base_name)
+        elif runs and args.top:
+            save_and_print_results(top_from_runs(runs, args.top), label,
+                                   total_time, base_name)
+        elif runs:
+            save_and_print_results(external_order(runs, spill_dir), label,
+                                   total_time, base_name)
+        else:
+            save_and_print_results(ranked_words(counts, args.top), label,
+                                   total_time, base_name)
+
+
+def main():
+    """Función principal (Orquestador)."""
+    start_time = time.time()
+
+    if len(sys.argv) < 2:
+        print("Uso: python wordCount.py fileWithData.txt [más archivos] "
+              "[--punctuation keep|strip|split] [--case lower|fold|keep] "
+              "[--accents keep|strip] [--workers N] [--spill-limit N] "
+              "[--top K] [--approx] [--state archivo]")
+        return
+    args = parse_args(sys.argv[1:])
+    policy = Policy(args.punctuation, args.case, args.accents)
+    if args.state:
+        report_incremental(args, policy, start_time)
+    elif (len(args.filenames) == 1 and args.workers <= 1
+            and not args.spill_limit and not args.approx):
+        report_file(args, policy, start_time)
+    else:
+        report_chunks(args, policy, start_time)
+
+
+if __name__ == "__main__":
+    main()
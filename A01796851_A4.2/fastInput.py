@@ -0,0 +1,209 @@
+# pylint: disable=invalid-name
+"""
+Módulo: fastInput.py
+Descripción: Capa de lectura compartida por computeStatistics.py,
+             convertNumbers.py y wordCount.py.
+
+Los archivos sin comprimir se proyectan en memoria con mmap y se recorren
+como bytes: los saltos de línea y espacios se buscan directamente sobre
+el mapa (find/rfind), sin decodificar UTF-8 ni crear un str por línea, y
+cada programa decodifica solo lo que necesita (float() e int() aceptan
+bytes). Los archivos .gz se leen en streaming con gzip y los .zst/.zstd
+con el paquete opcional zstandard, sin descomprimirlos a un temporal;
+como no admiten acceso por rangos, se procesan como un solo fragmento.
+"""
+
+import contextlib
+import functools
+import gzip
+import mmap
+import os
+import re
+
+try:
+    import zstandard
+except ImportError:  # zstandard es opcional
+    zstandard = None
+
+BLOCK_SIZE = 1 << 20
+SCAN_WINDOW = 1 << 16
+NEWLINE = b"\n"
+WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+GZIP_SUFFIXES = (".gz",)
+ZSTD_SUFFIXES = (".zst", ".zstd")
+
+
+def is_compressed(path):
+    """Indica si el archivo se lee con un descompresor en streaming."""
+    return str(path).lower().endswith(GZIP_SUFFIXES + ZSTD_SUFFIXES)
+
+
+def strip_compression(path):
+    """Nombre del archivo sin la extensión de compresión, si la tiene."""
+    name = str(path)
+    for suffix in GZIP_SUFFIXES + ZSTD_SUFFIXES:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+@contextlib.contextmanager
+def open_stream(path):
+    """Abre el archivo como flujo binario, descomprimiéndolo si hace falta."""
+    name = str(path).lower()
+    with contextlib.ExitStack() as stack:
+        if name.endswith(GZIP_SUFFIXES):
+            stream = stack.enter_context(gzip.open(path, "rb"))
+        elif name.endswith(ZSTD_SUFFIXES):
+            if zstandard is None:
+                raise ImportError(
+                    "Leer archivos .zst requiere el paquete 'zstandard'.")
+            raw = stack.enter_context(open(path, "rb"))
+            stream = stack.enter_context(
+                zstandard.ZstdDecompressor().stream_reader(raw))
+        else:
+            stream = stack.enter_context(open(path, "rb"))
+        try:
+            yield stream
+        finally:
+            stack.close()
+
+
+@contextlib.contextmanager
+def map_file(path):
+    """Proyecta el archivo en memoria de solo lectura.
+
+    Un archivo vacío no se puede proyectar; en ese caso se entregan bytes
+    vacíos.
+    """
+    with contextlib.ExitStack() as stack:
+        file = stack.enter_context(open(path, "rb"))
+        mapped = b""
+        if os.fstat(file.fileno()).st_size:
+            mapped = stack.enter_context(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        try:
+            yield mapped
+        finally:
+            stack.close()
+
+
+@functools.lru_cache(maxsize=None)
+def delimiter_pattern(delimiters):
+    """Expresión regular que encuentra cualquiera de los delimitadores."""
+    return re.compile(b"[" + b"".join(re.escape(bytes([byte]))
+                                      for byte in delimiters) + b"]")
+
+
+@functools.lru_cache(maxsize=None)
+def delimiter_table(delimiters):
+    """Tabla de translate que deja 1 en los delimitadores y 0 en lo demás."""
+    return bytes(1 if byte in delimiters else 0 for byte in range(256))
+
+
+def last_cut(buffer, start, limit, delimiters=NEWLINE):
+    """Posición justo después del último delimitador en [start, limit), o 0.
+
+    Con varios delimitadores se revisan ventanas de SCAN_WINDOW bytes
+    hacia atrás desde `limit`, así que el costo depende de la distancia al
+    delimitador y no del tamaño del rango.
+    """
+    if len(delimiters) == 1:
+        return buffer.rfind(delimiters, start, limit) + 1
+    table = delimiter_table(delimiters)
+    end = limit
+    while end > start:
+        begin = max(start, end - SCAN_WINDOW)
+        found = buffer[begin:end].translate(table).rfind(b"\x01")
+        if found >= 0:
+            return begin + found + 1
+        end = begin
+    return 0
+
+
+def next_cut(buffer, start, limit, delimiters=NEWLINE):
+    """Posición justo después del primer delimitador en [start, limit).
+
+    Si no hay ninguno devuelve `limit`. La búsqueda se detiene en el
+    primer delimitador, sin recorrer el resto del rango.
+    """
+    if len(delimiters) == 1:
+        found = buffer.find(delimiters, start, limit)
+        return found + 1 if found >= 0 else limit
+    match = delimiter_pattern(delimiters).search(buffer, start, limit)
+    return match.end() if match else limit
+
+
+def chunk_ranges(path, chunk_size, delimiters=NEWLINE):
+    """Divide el archivo en rangos de bytes que terminan en un delimitador.
+
+    Cada corte se hace después del primer delimitador a partir del byte
+    chunk_size - 1 del rango, así que los límites dependen solo del
+    contenido. Los delimitadores son bytes ASCII, que en UTF-8 nunca forman
+    parte de un carácter multibyte. Un archivo comprimido se devuelve como
+    un único rango (0, None).
+    """
+    if is_compressed(path):
+        with open_stream(path):
+            pass
+        return [(0, None)]
+    ranges = []
+    with map_file(path) as mapped:
+        size = len(mapped)
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            end = next_cut(mapped, end - 1, size, delimiters) \
+                if end < size else size
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_blocks(path, start=0, end=None, block_size=BLOCK_SIZE,
+                delimiters=NEWLINE):
+    """Genera bloques de bytes de [start, end) cortados en delimitadores.
+
+    Cada bloque mide alrededor de `block_size` y termina justo después de
+    un delimitador, salvo el último; un bloque sin delimitadores se
+    extiende hasta el siguiente. La búsqueda se hace sobre el mapa de
+    memoria y solo se copia el bloque entregado.
+    """
+    if is_compressed(path):
+        if start or end is not None:
+            raise ValueError("Un archivo comprimido no se puede leer por "
+                             "rangos de bytes.")
+        with open_stream(path) as stream:
+            carry = b""
+            while True:
+                chunk = stream.read(block_size)
+                if not chunk:
+                    break
+                data = carry + chunk
+                cut = last_cut(data, 0, len(data), delimiters)
+                carry = data[cut:]
+                if cut:
+                    yield data[:cut]
+            if carry:
+                yield carry
+        return
+    with map_file(path) as mapped:
+        end = len(mapped) if end is None else end
+        while start < end:
+            limit = min(start + block_size, end)
+            cut = limit
+            if limit < end:
+                cut = (last_cut(mapped, start, limit, delimiters)
+                       or next_cut(mapped, limit, end, delimiters))
+            yield mapped[start:cut]
+            start = cut
+
+
+def iter_lines(path, start=0, end=None, block_size=BLOCK_SIZE):
+    """Genera las líneas del rango como bytes, sin el salto de línea.
+
+    Separa igual que el modo texto de Python (\\n, \\r\\n y \\r), de modo que
+    los números de línea coinciden con los de open(..., 'r').
+    """
+    for block in iter_blocks(path, start, end, block_size, NEWLINE):
+        yield from block.splitlines()
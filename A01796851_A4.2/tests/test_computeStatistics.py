@@ -0,0 +1,299 @@
+"""Pruebas unitarias para computeStatistics.py."""
+# pylint: disable=invalid-name
+
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "P1"))
+sys.path.insert(0, ROOT)
+
+import computeStatistics  # noqa: E402  pylint: disable=wrong-import-position
+import frequencyTable  # noqa: E402  pylint: disable=wrong-import-position
+import fastInput  # noqa: E402  pylint: disable=wrong-import-position
+
+# (contenido, valores válidos, línea del error): con una sola línea
+# numpy.loadtxt(ndmin=1) leía "2 3" como dos valores.
+TWO_COLUMNS = (("2 3\n", [], 1),
+               ("1\n\n2 3\n4.5\n", [1.0, 4.5], 3))
+
+
+def small_chunks(filename):
+    """Fragmentos de 4 KiB para probar varios fragmentos con pocos datos."""
+    return fastInput.chunk_ranges(filename, 4096)
+
+
+class TestWorkers(unittest.TestCase):
+    """El reporte no cambia con el número de procesos."""
+
+    def setUp(self):
+        """Crea un archivo con valores de magnitudes muy distintas."""
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "datos.txt")
+        generator = random.Random(7)
+        with open(self.filename, "w", encoding="utf-8") as file:
+            for line_no in range(5000):
+                if line_no == 3210:
+                    file.write("no es número\n")
+                scale = 10.0 ** generator.randint(-3, 20)
+                file.write(f"{generator.uniform(-1, 1) * scale}\n")
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def report(self, workers, *options):
+        """Reporte (sin el tiempo) y mensajes de error de una corrida."""
+        args = computeStatistics.parse_args([self.filename, *options])
+        messages = io.StringIO()
+        with mock.patch.object(computeStatistics, "chunk_ranges",
+                               small_chunks), \
+                contextlib.redirect_stdout(messages):
+            summary = computeStatistics.compute_summary(
+                self.filename, args, workers)
+        report = computeStatistics.format_results(self.filename, summary, 0)
+        return report, messages.getvalue()
+
+    def check_workers(self, *options):
+        """Compara 1, 2 y 4 procesos con las mismas opciones."""
+        self.assertGreater(len(small_chunks(self.filename)), 4)
+        expected = self.report(1, *options)
+        self.assertIn("línea 3211", expected[1])
+        for workers in (2, 4):
+            self.assertEqual(self.report(workers, *options), expected)
+        return expected[0]
+
+    def test_python_backend(self):
+        """Backend de Python: tablas combinadas en el orden del archivo."""
+        self.check_workers("--backend", "python", "--top-k", "3")
+
+    @unittest.skipIf(computeStatistics.np is None, "NumPy no instalado")
+    def test_numpy_backend(self):
+        """Backend de NumPy: los fragmentos se cargan en paralelo."""
+        self.check_workers("--backend", "numpy", "--top-k", "3")
+
+    def test_approx(self):
+        """--approx: Welford, resúmenes y Misra-Gries combinados en orden."""
+        for budget in ("4", "1024"):
+            self.check_workers("--approx", "--sketch-size", "16",
+                               "--mode-budget", budget, "--top-k", "3")
+
+    def test_spilled_table(self):
+        """Con la tabla volcada a disco el reporte es el mismo."""
+        expected = self.check_workers("--backend", "python")
+        with mock.patch.object(frequencyTable, "DEFAULT_TABLE_BUDGET", 64):
+            self.assertEqual(self.check_workers("--backend", "python"),
+                             expected)
+
+
+class TestBatch(unittest.TestCase):
+    """Modo lote: expand_inputs, batch_row y run_batch."""
+
+    def setUp(self):
+        """Crea una carpeta con dos archivos de datos y uno vacío."""
+        self.folder = tempfile.mkdtemp()
+        self.data = os.path.join(self.folder, "datos")
+        os.mkdir(self.data)
+        for name, text in (("a.txt", "1\n2\n2\n5\n"),
+                           ("b.txt", "10\nx\n20\n"),
+                           ("c.dat", "")):
+            with open(os.path.join(self.data, name), "w",
+                      encoding="utf-8") as file:
+                file.write(text)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def path(self, name):
+        """Ruta de un archivo de la carpeta de datos."""
+        return os.path.join(self.data, name)
+
+    def test_expand_inputs(self):
+        """Directorios y patrones se expanden ordenados; lo demás se deja."""
+        missing = os.path.join(self.folder, "no_existe.txt")
+        self.assertEqual(
+            computeStatistics.expand_inputs(
+                [self.data, os.path.join(self.data, "*.txt"), missing]),
+            [self.path("a.txt"), self.path("b.txt"), self.path("c.dat"),
+             self.path("a.txt"), self.path("b.txt"), missing])
+
+    def test_batch_row(self):
+        """Cada fila lleva sus estadísticas, su estado y sus mensajes."""
+        args = computeStatistics.parse_args(["x", "--backend", "python"])
+        row, messages = computeStatistics.batch_row(self.path("b.txt"), args)
+        self.assertEqual((row["elementos"], row["media"], row["mediana"],
+                          row["moda"], row["varianza"], row["estado"]),
+                         (2, 15.0, 15.0, "N/A", 25.0, "ok"))
+        self.assertIn("línea 2: 'x'", messages)
+        for name, state in (("c.dat", "sin datos numéricos"),
+                            ("otro.txt", "no existe")):
+            row, _ = computeStatistics.batch_row(self.path(name), args)
+            self.assertEqual(row["estado"], state)
+            self.assertIsNone(row["media"])
+
+    def test_run_batch(self):
+        """El reporte consolidado es el mismo en serie y en paralelo."""
+        filenames = computeStatistics.expand_inputs([self.data])
+        for fmt in ("json", "tsv"):
+            reports = []
+            for workers in ("1", "3"):
+                summary = os.path.join(self.folder, f"lote{workers}.{fmt}")
+                args = computeStatistics.parse_args(
+                    [self.data, "--format", fmt, "--summary", summary,
+                     "--workers", workers])
+                messages = io.StringIO()
+                with contextlib.redirect_stdout(messages):
+                    out_name = computeStatistics.run_batch(filenames, args)
+                self.assertEqual(out_name, summary)
+                self.assertIn(f"{self.path('b.txt')}: Error: línea 2",
+                              messages.getvalue())
+                reports.append(self.read_rows(summary, fmt))
+            self.assertEqual(reports[0], reports[1])
+            self.assertEqual([row["estado"] for row in reports[0]],
+                             ["ok", "ok", "sin datos numéricos"])
+            self.assertEqual(str(reports[0][0]["moda"]), "2.0")
+
+    @staticmethod
+    def read_rows(path, fmt):
+        """Filas del reporte consolidado sin la columna de tiempo."""
+        with open(path, encoding="utf-8") as file:
+            if fmt == "json":
+                rows = json.load(file)
+            else:
+                rows = list(csv.DictReader(file, delimiter="\t"))
+        for row in rows:
+            del row["segundos"]
+        return rows
+
+
+class TestRunningStats(unittest.TestCase):
+    """Momentos en streaming (--approx) contra un cálculo de una pasada."""
+
+    def setUp(self):
+        """Valores de magnitudes muy distintas, con signo."""
+        generator = random.Random(11)
+        self.data = [generator.uniform(-1, 1)
+                     * 10.0 ** generator.randint(-3, 12)
+                     for _ in range(3000)]
+
+    @staticmethod
+    def stream(values):
+        """RunningStats con los valores agregados uno por uno."""
+        stats = computeStatistics.RunningStats()
+        for value in values:
+            stats.push(value)
+        return stats
+
+    def assert_close(self, stats, expected):
+        """Mismo conteo y extremos; momentos iguales salvo redondeo."""
+        self.assertEqual((stats.count, stats.minimum, stats.maximum),
+                         (expected.count, expected.minimum, expected.maximum))
+        for name in ("total", "mean", "m2"):
+            self.assertTrue(math.isclose(getattr(stats, name),
+                                         getattr(expected, name),
+                                         rel_tol=1e-9),
+                            name)
+
+    def test_chan_merge_matches_one_pass(self):
+        """Combinar fragmentos (Chan) equivale a recorrer todo de una vez."""
+        one_pass = self.stream(self.data)
+        table = [(self.data, [1] * len(self.data))]
+        exact = computeStatistics.RunningStats.from_table(
+            lambda: table, len(self.data))
+        self.assert_close(one_pass, exact)
+        for cuts in ((1,), (1500,), (2999,), (7, 100, 2048),
+                     range(250, 3000, 250)):
+            bounds = [0, *cuts, len(self.data)]
+            merged = computeStatistics.RunningStats()
+            for start, end in zip(bounds, bounds[1:]):
+                merged.merge(self.stream(self.data[start:end]))
+            self.assert_close(merged, one_pass)
+
+    def test_merge_empty(self):
+        """Un acumulador vacío no cambia el otro, en ambos sentidos."""
+        full = self.stream(self.data[:10])
+        for left, right in ((full, computeStatistics.RunningStats()),
+                            (computeStatistics.RunningStats(), full)):
+            merged = computeStatistics.RunningStats()
+            merged.merge(left)
+            merged.merge(right)
+            self.assertEqual(
+                [getattr(merged, name) for name in merged.__slots__],
+                [getattr(full, name) for name in full.__slots__])
+
+
+@unittest.skipIf(computeStatistics.np is None, "NumPy no instalado")
+class TestBackends(unittest.TestCase):
+    """Los backends de Python y de NumPy imprimen el mismo reporte."""
+
+    def report(self, filename, backend):
+        """Reporte (sin el tiempo) y mensajes de error de un backend."""
+        args = computeStatistics.parse_args([filename, "--backend", backend,
+                                             "--top-k", "3"])
+        messages = io.StringIO()
+        with contextlib.redirect_stdout(messages):
+            summary = computeStatistics.compute_summary(filename, args)
+        report = computeStatistics.format_results(filename, summary, 0)
+        return report, messages.getvalue()
+
+    def test_bundled_cases(self):
+        """TC1 a TC7: mismos dígitos en media, varianza, mediana y moda."""
+        for number in range(1, 8):
+            filename = os.path.join(ROOT, "P1", "1_source", f"TC{number}.txt")
+            with self.subTest(filename=filename):
+                self.assertEqual(self.report(filename, "python"),
+                                 self.report(filename, "numpy"))
+
+
+@unittest.skipIf(computeStatistics.np is None, "NumPy no instalado")
+class TestNumpyLoader(unittest.TestCase):
+    """El cargador de NumPy acepta solo un número por línea."""
+
+    def setUp(self):
+        """Crea una carpeta temporal."""
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "datos.txt")
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def write(self, text):
+        """Escribe el archivo de prueba y devuelve su tamaño."""
+        with open(self.filename, "w", encoding="utf-8") as file:
+            file.write(text)
+        return len(text)
+
+    def test_load_array(self):
+        """"2 3" se reporta como inválido, no como dos valores."""
+        for text, expected, _ in TWO_COLUMNS:
+            self.write(text)
+            messages = io.StringIO()
+            with contextlib.redirect_stdout(messages):
+                values = computeStatistics.load_array(self.filename)
+            self.assertEqual(values.tolist(), expected)
+            self.assertIn("'2 3' no es", messages.getvalue())
+
+    def test_load_chunk(self):
+        """El fragmento devuelve el error con su número de línea."""
+        for text, expected, line_no in TWO_COLUMNS:
+            size = self.write(text)
+            values, _, errors = computeStatistics.load_chunk(
+                self.filename, 0, size)
+            self.assertEqual(values.tolist(), expected)
+            self.assertEqual(errors, [(line_no, "2 3")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Pruebas unitarias para convertNumbers.py."""
+# pylint: disable=invalid-name
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "P2"))
+sys.path.insert(0, ROOT)
+
+import convertNumbers  # noqa: E402  pylint: disable=wrong-import-position
+import fastInput  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def small_chunks(filename):
+    """Fragmentos de 4 KiB para probar varios fragmentos con pocos datos."""
+    return fastInput.chunk_ranges(filename, 4096)
+
+
+class TestParseNumbers(unittest.TestCase):
+    """Lectura de los números de cada línea."""
+
+    def parse(self, *lines):
+        """Enteros válidos y errores (línea, texto) de las líneas dadas."""
+        errors = []
+        numbers = list(convertNumbers.parse_numbers(
+            lines, lambda *error: errors.append(error)))
+        return numbers, errors
+
+    def test_large_integers_are_exact(self):
+        """Un entero mayor que 2**53 no se redondea a float."""
+        numbers, _ = self.parse(b"9007199254740993", b"-" + b"9" * 40)
+        self.assertEqual(numbers, [2 ** 53 + 1, -int("9" * 40)])
+
+    def test_decimals_are_truncated(self):
+        """Decimales y exponentes se truncan como antes."""
+        numbers, _ = self.parse(b"-7.9", b"2e3", b" 12 ")
+        self.assertEqual(numbers, [-7, 2000, 12])
+
+    def test_overflow_is_invalid(self):
+        """inf y valores fuera de rango se reportan sin detener la lectura."""
+        numbers, errors = self.parse(b"inf", b"1e400", b"nan", b"abc", b"5")
+        self.assertEqual(numbers, [5])
+        self.assertEqual([line for line, _ in errors], [1, 2, 3, 4])
+
+
+class TestPipeline(unittest.TestCase):
+    """Conversión en streaming: convert_lines, format_batches y reporte."""
+
+    def setUp(self):
+        """Trabaja en una carpeta temporal."""
+        self.folder = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        os.chdir(self.folder)
+        self.addCleanup(os.chdir, cwd)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def test_convert_lines_is_lazy(self):
+        """Cada fila se convierte cuando se pide, sin leer de más."""
+        read = []
+
+        def lines():
+            for line in (b"5", b"x", b"-3", b"255"):
+                read.append(line)
+                yield line
+
+        errors = []
+        rows = convertNumbers.convert_lines(
+            lines(), on_error=lambda *error: errors.append(error))
+        self.assertEqual(next(rows), (5, "101", "5"))
+        self.assertEqual(read, [b"5"])
+        self.assertEqual(next(rows), (-3, "-11", "-3"))
+        self.assertEqual((read, errors), ([b"5", b"x", b"-3"], [(2, "x")]))
+
+    def test_errors_stay_out_of_the_table(self):
+        """La tabla en pantalla es la del archivo; los errores van aparte."""
+        filename = os.path.join(self.folder, "datos.txt")
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write("1\nabc\n2\n\n3.9\n1e999\n")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, "argv", ["convertNumbers.py", filename]), \
+                contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            convertNumbers.main()
+        with open(convertNumbers.output_name(filename), encoding="utf-8") \
+                as file:
+            self.assertEqual(stdout.getvalue(), file.read())
+        self.assertNotIn("Error", stdout.getvalue())
+        self.assertIn("Filas: 3\n", stdout.getvalue())
+        self.assertEqual([line.split("'")[0] for line in
+                          stderr.getvalue().splitlines()],
+                         ["Error: línea 2: ", "Error: línea 6: "])
+
+    def test_batch_size(self):
+        """El reporte no depende del tamaño de los lotes."""
+        lines = [str(number).encode() for number in range(-50, 50)]
+        options = convertNumbers.DEFAULT_OPTIONS._replace(
+            fmt=convertNumbers.FORMATS["csv"], echo=False)
+        reports = []
+        for batch_size in (1, 7, 4096):
+            rows = convertNumbers.convert_lines(iter(lines))
+            self.assertEqual(convertNumbers.save_results(
+                rows, "datos.txt", 0, options, batch_size), 100)
+            with open("ConvertionResults_datos.csv", encoding="utf-8") as file:
+                reports.append(file.read())
+        self.assertEqual(reports[1:], reports[:1] * 2)
+
+
+class TestWorkers(unittest.TestCase):
+    """--workers N escribe exactamente lo mismo que la conversión en serie."""
+
+    def setUp(self):
+        """Crea un archivo con enteros grandes y líneas inválidas."""
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "numeros.txt")
+        generator = random.Random(3)
+        with open(self.filename, "w", encoding="utf-8") as file:
+            for line_no in range(3000):
+                if line_no % 700 == 5:
+                    file.write("no es número\n")
+                file.write(f"{generator.randint(-2 ** 70, 2 ** 70)}\n")
+        cwd = os.getcwd()
+        os.chdir(self.folder)
+        self.addCleanup(os.chdir, cwd)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def run_main(self, *options):
+        """Reporte, salida estándar y errores, sin el tiempo de cierre."""
+        argv = ["convertNumbers.py", self.filename, *options]
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(sys, "argv", argv), \
+                mock.patch.object(convertNumbers, "chunk_ranges",
+                                  small_chunks), \
+                contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            convertNumbers.main()
+        name = convertNumbers.output_name(
+            self.filename, convertNumbers.FORMATS[options[-1]])
+        with open(name, "rb") as file:
+            report = file.read()
+        os.remove(name)
+        # El cierre lleva el tiempo: en el binario son los 8 bytes finales.
+        if options[-1] == "records":
+            report = report[:-8]
+        else:
+            report = report.rsplit(b"Tiempo", 1)[0]
+        return (report, stdout.getvalue().rsplit("Tiempo", 1)[0],
+                stderr.getvalue())
+
+    def test_same_output(self):
+        """Todos los formatos, con 1, 2 y 4 procesos."""
+        self.assertGreater(len(small_chunks(self.filename)), 4)
+        for fmt in ("text", "csv", "jsonl", "records"):
+            options = ("--bases", "bin,oct,hex,b36,c2", "--format", fmt)
+            serial = self.run_main(*options)
+            self.assertIn("línea 6: 'no es número'", serial[2])
+            for workers in ("2", "4"):
+                with self.subTest(fmt=fmt, workers=workers):
+                    self.assertEqual(
+                        self.run_main("--workers", workers, *options),
+                        serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
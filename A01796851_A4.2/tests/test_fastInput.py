@@ -0,0 +1,132 @@
+"""Pruebas unitarias para fastInput.py."""
+# pylint: disable=invalid-name
+
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fastInput  # noqa: E402  pylint: disable=wrong-import-position
+
+# Fin de línea de Windows, CR solo (Mac clásico), líneas vacías y texto
+# con caracteres multibyte, sin salto de línea final.
+MIXED = "uno\r\ndos\rtrés\n\r\n\rcuatro\r\ncinco é ñ\r\n\nfin".encode()
+
+
+class TestLines(unittest.TestCase):
+    """iter_lines separa las líneas igual que el modo texto de Python."""
+
+    def setUp(self):
+        """Escribe el texto mixto sin comprimir y comprimido con gzip."""
+        self.folder = tempfile.mkdtemp()
+        self.plain = os.path.join(self.folder, "datos.txt")
+        with open(self.plain, "wb") as file:
+            file.write(MIXED)
+        self.compressed = os.path.join(self.folder, "datos.txt.gz")
+        with gzip.open(self.compressed, "wb") as file:
+            file.write(MIXED)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def expected(self):
+        """Líneas de open(..., 'r'), codificadas en UTF-8."""
+        with open(self.plain, encoding="utf-8") as file:
+            return [line.rstrip("\n").encode() for line in file]
+
+    def test_crlf_and_lone_cr(self):
+        """\\r\\n y \\r solo terminan una línea con cualquier bloque."""
+        expected = self.expected()
+        self.assertEqual(expected[:3], [b"uno", b"dos", "trés".encode()])
+        for block_size in (1, 2, 3, 5, 64, fastInput.BLOCK_SIZE):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(
+                    list(fastInput.iter_lines(self.plain,
+                                              block_size=block_size)),
+                    expected)
+
+    def test_gzip_input(self):
+        """Un .gz se lee en streaming con las mismas líneas y bloques."""
+        self.assertTrue(fastInput.is_compressed(self.compressed))
+        self.assertEqual(fastInput.strip_compression(self.compressed),
+                         self.plain)
+        self.assertEqual(fastInput.chunk_ranges(self.compressed, 4),
+                         [(0, None)])
+        for block_size in (1, 3, 64):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(
+                    list(fastInput.iter_lines(self.compressed,
+                                              block_size=block_size)),
+                    self.expected())
+                blocks = list(fastInput.iter_blocks(
+                    self.compressed, block_size=block_size,
+                    delimiters=fastInput.WHITESPACE))
+                self.assertEqual(b"".join(blocks), MIXED)
+                for block in blocks[:-1]:
+                    self.assertIn(block[-1:], fastInput.WHITESPACE)
+        with self.assertRaises(ValueError):
+            list(fastInput.iter_lines(self.compressed, 1, 5))
+
+
+class TestChunkRanges(unittest.TestCase):
+    """chunk_ranges corta justo después de un delimitador."""
+
+    def setUp(self):
+        """Crea una carpeta temporal."""
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "datos.txt")
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def write(self, data):
+        """Escribe los bytes del archivo de prueba."""
+        with open(self.filename, "wb") as file:
+            file.write(data)
+
+    def check(self, data, chunk_size, delimiters):
+        """Rangos contiguos, cortados en delimitadores; devuelve los cortes."""
+        ranges = fastInput.chunk_ranges(self.filename, chunk_size,
+                                        delimiters)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertIn(data[end - 1], delimiters)
+        for start, end in ranges:
+            data[start:end].decode("utf-8")
+        return [end for _, end in ranges]
+
+    def test_delimiter_at_boundary(self):
+        """Un delimitador en el byte chunk_size - 1 cierra el rango ahí."""
+        data = b"abc\ndefg\nhi\n"
+        self.write(data)
+        self.assertEqual(self.check(data, 4, fastInput.NEWLINE),
+                         [4, 9, 12])
+        self.assertEqual(self.check(data, 5, fastInput.NEWLINE), [9, 12])
+        self.assertEqual(self.check(data, 100, fastInput.NEWLINE), [12])
+
+    def test_whitespace_and_multibyte(self):
+        """Con varios delimitadores no se parte ningún carácter UTF-8."""
+        data = "añó\tπ é\r\nñandú\x0bß  €\n".encode() * 50
+        self.write(data)
+        for chunk_size in (1, 2, 3, 7, 16, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                self.check(data, chunk_size, fastInput.WHITESPACE)
+                self.check(data, chunk_size, fastInput.NEWLINE)
+
+    def test_empty_file(self):
+        """Un archivo vacío no tiene rangos."""
+        self.write(b"")
+        self.assertEqual(fastInput.chunk_ranges(self.filename, 4), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
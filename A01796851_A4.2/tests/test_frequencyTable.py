@@ -0,0 +1,66 @@
+"""Pruebas unitarias para frequencyTable.py."""
+# pylint: disable=invalid-name
+
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "P1"))
+
+import frequencyTable  # noqa: E402  pylint: disable=wrong-import-position
+
+
+class TestFrequencyTable(unittest.TestCase):
+    """Tabla de frecuencias exacta con presupuesto de memoria."""
+
+    def build(self, data, budget, parts=1):
+        """Tabla de `data` repartida en `parts` fragmentos combinados."""
+        size = -(-len(data) // parts)
+        tables = []
+        for start in range(0, len(data), size):
+            table = frequencyTable.FrequencyTable(budget)
+            table.extend(data[start:start + size])
+            self.assertLessEqual(len(table.counts), budget)
+            tables.append(table)
+        for table in tables[1:]:
+            tables[0].merge(table)
+        self.addCleanup(tables[0].close)
+        return tables[0]
+
+    def test_budget_bounds_memory(self):
+        """Con un presupuesto pequeño la tabla se vuelca y da lo mismo."""
+        generator = random.Random(5)
+        data = [float(generator.randrange(300)) for _ in range(2000)]
+        expected = self.build(data, 10 ** 6)
+        self.assertFalse(expected.runs)
+        for budget, parts in ((16, 1), (16, 3), (5, 4)):
+            table = self.build(data, budget, parts)
+            self.assertTrue(table.runs)
+            self.assertEqual(table.median(), expected.median())
+            self.assertEqual(table.mode(), expected.mode())
+            self.assertEqual(table.top(5), expected.top(5))
+            paths = [path for path, _, _ in table.runs]
+            table.close()
+            self.assertFalse(any(map(os.path.exists, paths)))
+
+    def test_all_distinct_is_na(self):
+        """Si ningún valor se repite la moda es N/A, en memoria o en disco."""
+        data = [float(value) for value in range(500, 0, -1)]
+        for budget in (10 ** 6, 8):
+            table = self.build(data, budget)
+            self.assertEqual(table.mode(), "N/A")
+            self.assertEqual(table.median(), 250.5)
+
+    def test_ties_follow_first_appearance(self):
+        """Las modas empatadas salen en orden de primera aparición."""
+        data = [3.0, 1.0, 2.0, 1.0, 3.0, 5.0, 2.0]
+        for budget in (10 ** 6, 2):
+            table = self.build(data, budget, 2)
+            self.assertEqual(table.mode(), [3.0, 1.0, 2.0])
+            self.assertEqual(table.top(2), [(3.0, 2), (1.0, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
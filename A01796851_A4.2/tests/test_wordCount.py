@@ -0,0 +1,215 @@
+"""Pruebas unitarias para wordCount.py."""
+# pylint: disable=invalid-name
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "P3"))
+sys.path.insert(0, ROOT)
+
+import wordCount  # noqa: E402  pylint: disable=wrong-import-position
+import fastInput  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def small_chunks(filename):
+    """Fragmentos de 1 KiB para probar varios fragmentos con pocos datos."""
+    return fastInput.chunk_ranges(filename, 1024, fastInput.WHITESPACE)
+
+
+class TestSpill(unittest.TestCase):
+    """Con volcados a disco el conteo es el mismo que con un Counter."""
+
+    def setUp(self):
+        """Crea dos archivos con muchas palabras distintas."""
+        self.folder = tempfile.mkdtemp()
+        self.spill_dir = os.path.join(self.folder, "corridas")
+        os.mkdir(self.spill_dir)
+        generator = random.Random(5)
+        self.filenames = []
+        for name in ("a.txt", "b.txt"):
+            path = os.path.join(self.folder, name)
+            words = [f"p{int(generator.paretovariate(1.2))}"
+                     for _ in range(3000)]
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(" ".join(words) + "\n")
+            self.filenames.append(path)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def expected(self):
+        """Counter de todas las palabras, en el orden de los archivos."""
+        counts = Counter()
+        for path in self.filenames:
+            with open(path, encoding="utf-8") as file:
+                counts.update(file.read().split())
+        return counts
+
+    def count(self, workers, spill_limit):
+        """Conteo por fragmentos de 1 KiB con el límite de volcado dado."""
+        options = wordCount.CountOptions(wordCount.DEFAULT_POLICY, workers,
+                                         self.spill_dir, spill_limit, None)
+        with mock.patch.object(wordCount, "chunk_ranges", small_chunks):
+            return wordCount.count_files(self.filenames, options)
+
+    def test_spill_and_merge(self):
+        """merge_runs y external_order coinciden con el Counter."""
+        expected = self.expected()
+        ordered = sorted(expected.items(), key=lambda item: item[1],
+                         reverse=True)
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                counts, runs = self.count(workers, 4)
+                self.assertFalse(counts)
+                self.assertGreater(len(runs), len(self.filenames))
+                merged = {word: hits
+                          for word, hits, _ in wordCount.merge_runs(runs)}
+                self.assertEqual(merged, dict(expected))
+                self.assertEqual(
+                    list(wordCount.external_order(runs, self.spill_dir, 7)),
+                    ordered)
+                self.assertEqual(wordCount.top_from_runs(runs, 5),
+                                 ordered[:5])
+
+    def test_without_spill(self):
+        """Sin límite de volcado se devuelve el Counter en memoria."""
+        counts, runs = self.count(2, 0)
+        self.assertEqual(runs, [])
+        self.assertEqual(list(counts.items()),
+                         list(self.expected().items()))
+
+
+class TestHeavyHitters(unittest.TestCase):
+    """Top-K aproximado contra el conteo exacto en datos sesgados."""
+
+    def setUp(self):
+        """Palabras con frecuencias de una distribución de Pareto."""
+        generator = random.Random(3)
+        self.words = [f"w{int(generator.paretovariate(1.0))}"
+                      for _ in range(20000)]
+        self.exact = Counter(self.words)
+
+    def summary(self, parts):
+        """HeavyHitters combinado de `parts` fragmentos por bloques."""
+        total = wordCount.HeavyHitters(32, 1024)
+        step = len(self.words) // parts
+        for start in range(0, len(self.words), step):
+            partial = wordCount.HeavyHitters(32, 1024)
+            for block in range(start, start + step, 100):
+                partial.update(Counter(self.words[block:block + 100]))
+            total.merge(partial)
+        return total
+
+    def test_top_matches_exact(self):
+        """Las K más frecuentes y sus conteos coinciden con Counter."""
+        expected = [(word, hits, hits)
+                    for word, hits in self.exact.most_common(5)]
+        for parts in (1, 4):
+            with self.subTest(parts=parts):
+                summary = self.summary(parts)
+                self.assertEqual(summary.top(5), expected)
+                for word, estimate, lower in summary.top(32):
+                    self.assertLessEqual(lower, self.exact[word])
+                    self.assertGreaterEqual(estimate, self.exact[word])
+
+
+class TestIncremental(unittest.TestCase):
+    """Modo incremental: estado JSON con gzip y huellas del archivo."""
+
+    def setUp(self):
+        """Crea una carpeta temporal con el archivo y su estado."""
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, "bitacora.txt")
+        self.state = os.path.join(self.folder, "estado.json.gz")
+        self.write("w", "Hola mundo hola\n")
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def write(self, mode, text):
+        """Escribe o agrega texto al archivo."""
+        with open(self.filename, mode, encoding="utf-8") as file:
+            file.write(text)
+
+    def run_count(self):
+        """Conteo incremental, rangos leídos y mensajes impresos."""
+        ranges = []
+        original = wordCount.read_blocks
+
+        def read_blocks(filename, start=0, end=None):
+            ranges.append((start, end))
+            return original(filename, start, end)
+
+        messages = io.StringIO()
+        with mock.patch.object(wordCount, "read_blocks", read_blocks), \
+                contextlib.redirect_stdout(messages):
+            counts = wordCount.count_incremental(self.filename, self.state)
+        return counts, ranges, messages.getvalue()
+
+    def expected(self):
+        """Counter del archivo completo con la política por omisión."""
+        return wordCount.get_word_frequency(self.filename)
+
+    def test_state_file(self):
+        """El estado es JSON comprimido con el conteo y el desplazamiento."""
+        counts, _, _ = self.run_count()
+        self.assertEqual(counts, Counter({"hola": 2, "mundo": 1}))
+        with gzip.open(self.state, "rt", encoding="utf-8") as file:
+            state = json.load(file)
+        self.assertEqual(state["version"], wordCount.STATE_VERSION)
+        self.assertEqual(state["offset"], os.path.getsize(self.filename))
+        self.assertEqual(state["policy"], list(wordCount.DEFAULT_POLICY))
+        self.assertEqual(state["words"], [["hola", 2], ["mundo", 1]])
+
+    def test_unchanged_file(self):
+        """Sin cambios no se vuelve a leer nada y el conteo es el mismo."""
+        first, _, _ = self.run_count()
+        counts, ranges, messages = self.run_count()
+        self.assertEqual(counts, first)
+        self.assertEqual(messages, "")
+        size = os.path.getsize(self.filename)
+        self.assertTrue(all(start == size for start, _ in ranges))
+
+    def test_appended_file(self):
+        """Solo se leen los bytes agregados; la palabra final no se guarda."""
+        self.run_count()
+        size = os.path.getsize(self.filename)
+        self.write("a", "adiós mundo cru")
+        counts, ranges, messages = self.run_count()
+        self.assertEqual(messages, "")
+        self.assertEqual(counts, self.expected())
+        self.assertEqual(ranges[0][0], size)
+        self.write("a", "el\n")
+        counts, _, _ = self.run_count()
+        self.assertEqual(counts, self.expected())
+        self.assertEqual(counts["cruel"], 1)
+        self.assertNotIn("cru", counts)
+
+    def test_rewritten_file(self):
+        """Un archivo reescrito (mismo tamaño) o truncado se cuenta de cero."""
+        for text in ("Chao mundo chao\n", "Corto\n"):
+            self.run_count()
+            self.write("w", text)
+            counts, ranges, messages = self.run_count()
+            self.assertIn("se cuenta desde cero", messages)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(counts, self.expected())
+            self.write("w", "Hola mundo hola\n")
+            os.remove(self.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,110 +1,880 @@
-# pylint: disable=invalid-name
-"""
-Programa para calcular el costo total de ventas desde archivos JSON.
-"""
-
-import sys
-import json
-import time
-import os
-
-
-def load_json_file(file_path):
-    """Carga un archivo JSON y maneja errores de lectura."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        print(f"Error: El archivo '{file_path}' no fue encontrado.")
-    except json.JSONDecodeError:
-        print(f"Error: El archivo '{file_path}' no es un JSON válido.")
-    return None
-
-
-def compute_total_sales(price_catalogue, sales_record):
-    """Calcula el total de ventas cruzando precios y registros."""
-    total_cost = 0.0
-    errors = []
-    price_map = {}
-
-    for item in price_catalogue:
-        name = item.get("title")
-        price = item.get("price")
-        if name and isinstance(price, (int, float)):
-            price_map[name] = price
-
-    for record in sales_record:
-        product_name = record.get("Product")
-        quantity = record.get("Quantity")
-
-        if product_name in price_map and isinstance(quantity, (int, float)):
-            total_cost += price_map[product_name] * quantity
-        else:
-            msg = f"Dato inválido o no encontrado: {record}"
-            errors.append(msg)
-
-    return total_cost, errors
-
-
-def format_save_results(total, elapsed_time, sales_file, errors):
-    """Formatea los resultados, los imprime y los guarda."""
-    for error in errors:
-        print(f"Advertencia: {error}")
-
-    header = "-" * 40
-    result_output = (
-        f"{header}\n"
-        f"REPORTE DE VENTAS PARA: {sales_file}\n"
-        f"{header}\n"
-        f"Total de ventas calculadas: ${total:,.2f}\n"
-        f"Tiempo de ejecución: {elapsed_time:.4f} segundos\n"
-        f"{header}"
-    )
-
-    print(result_output)
-
-    output_dir = "Results"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    # Usamos el nombre limpio para el archivo de salida
-    file_name = f"SalesResults_{sales_file}.txt"
-    file_path = os.path.join(output_dir, file_name)
-
-    try:
-        with open(file_path, "w", encoding="utf-8") as out_file:
-            out_file.write(result_output)
-        print(f"Archivo guardado en: {file_path}")
-    except IOError as e:
-        print(f"Error al escribir en '{file_path}': {e}")
-
-
-def main():
-    """Función principal para obtener el cálculo de ventas."""
-    usage_msg = "Uso: python computeSales.py catalogue.json sales.json"
-    if len(sys.argv) != 3:
-        print(usage_msg)
-        return
-
-    start_time = time.time()
-    price_file = sys.argv[1]
-    sales_arg = sys.argv[2]
-
-    prices = load_json_file(price_file)
-    sales_data = load_json_file(sales_arg)
-
-    if prices is None or sales_data is None:
-        return
-
-    total_calculated, found_errors = compute_total_sales(prices, sales_data)
-    elapsed = time.time() - start_time
-
-    # Esto elimina las carpetas (Sales_list/) del nombre del resultado.
-    clean_sales_name = os.path.basename(sales_arg)
-
-    format_save_results(total_calculated, elapsed, clean_sales_name,
-                        found_errors)
-
-
-if __name__ == "__main__":
-    main()
+# pylint: disable=invalid-name
+"""
+Programa para calcular el costo total de ventas desde archivos JSON.
+
+El catálogo se convierte en un CatalogueIndex (búsqueda exacta más un
+índice invertido de trigramas para nombres aproximados) que se guarda en
+disco con el hash del archivo del catálogo, para no reconstruirlo en cada
+ejecución.
+
+Con varios archivos de ventas o un directorio el programa trabaja en modo
+lote: el índice del catálogo se carga una sola vez, los archivos se
+reparten en un pool de --workers procesos que reciben el índice al
+iniciar, y se escribe un solo reporte (Results/SalesResults_lote.txt) con
+los totales por archivo, por fecha, por producto y por SALE_ID.
+
+Los importes se calculan en centavos enteros (Decimal solo para precios o
+cantidades con más de dos decimales), de modo que el total es exacto y
+los subtotales por grupo suman exactamente el total.
+
+Si NumPy está instalado, el cálculo usa por defecto un motor columnar:
+los registros se convierten por lotes en arreglos (producto codificado
+contra el catálogo y cantidad), los totales y subtotales se obtienen con
+sumas agrupadas de NumPy y los registros inválidos se detectan con
+máscaras; con --backend python se usa el ciclo por registro.
+
+Con --stream (o con un archivo .jsonl/.ndjson) las ventas se leen
+registro por registro y se suman conforme llegan, en memoria constante;
+se usa ijson si está instalado y, si no, un lector incremental de la
+biblioteca estándar.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import itertools
+import os
+import sys
+import json
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+try:
+    import ijson
+except ImportError:  # ijson es opcional
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_CACHE_DIR = ".catalogue_cache"
+INDEX_VERSION = 3
+STREAM_CHUNK = 1 << 16
+# Caracteres finales del búfer en los que un error puede ser un corte.
+TRUNCATION_MARGIN = 16
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+SALES_SUFFIXES = (".json",) + JSON_LINES_SUFFIXES
+GROUP_FIELDS = ("SALE_Date", "Product", "SALE_ID")
+GROUP_TITLES = {"SALE_Date": "Por fecha (SALE_Date)",
+                "Product": "Por producto",
+                "SALE_ID": "Por venta (SALE_ID)"}
+BATCH_REPORT = "SalesResults_lote.txt"
+COLUMN_BATCH = 1 << 16
+COLUMN_QUANTITY_LIMIT = 1 << 31
+# Tipo de la cantidad -> 1 entero (vectorizable), 2 otro número, 0 inválida.
+QUANTITY_KINDS = {int: 1, float: 2, bool: 2}
+
+# Resultado de un archivo del lote; `failure` es el motivo si no se leyó.
+FileResult = namedtuple("FileResult", "name total errors groups failure")
+
+# Índice del catálogo en cada proceso del pool (ver init_worker).
+_WORKER_INDEX = None
+
+
+def load_json_file(file_path):
+    """Carga un archivo JSON y maneja errores de lectura."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{file_path}' no fue encontrado.")
+    except json.JSONDecodeError:
+        print(f"Error: El archivo '{file_path}' no es un JSON válido.")
+    return None
+
+
+def is_json_lines(file_path):
+    """Indica si el archivo es JSON Lines por su extensión."""
+    return file_path.lower().endswith(JSON_LINES_SUFFIXES)
+
+
+def is_truncated(error, text):
+    """Indica si un error de raw_decode se debe a que `text` quedó cortado.
+
+    Un elemento cortado falla en los últimos caracteres del búfer (un
+    literal, número o escape a medias) o como cadena sin cerrar; cualquier
+    otro error es de formato y no se resuelve leyendo más.
+    """
+    return (error.pos >= len(text) - TRUNCATION_MARGIN
+            or error.msg.startswith("Unterminated string"))
+
+
+def stream_json_array(file, chunk_size=STREAM_CHUNK):
+    """Genera los elementos de un arreglo JSON de nivel superior uno a uno.
+
+    Solo usa la biblioteca estándar: el texto se lee por bloques y cada
+    elemento se decodifica con JSONDecoder.raw_decode; si un elemento queda
+    cortado al final del búfer (ver is_truncated) se lee el siguiente
+    bloque y se reintenta; los demás errores se elevan de inmediato. El
+    búfer nunca guarda más que el elemento en curso y un bloque.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size)
+    eof = not buffer
+    pos = 0
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return not eof
+
+    def skip_space():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_space()
+    if buffer[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Se esperaba un arreglo", buffer, pos)
+    pos += 1
+    skip_space()
+    if buffer[pos:pos + 1] == "]":
+        return
+    while True:
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+            incomplete = end == len(buffer) and not eof
+        except json.JSONDecodeError as error:
+            if eof or not is_truncated(error, buffer):
+                raise
+            incomplete = True
+        if incomplete:
+            fill()
+            continue
+        yield element
+        pos = end
+        skip_space()
+        separator = buffer[pos:pos + 1]
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Se esperaba ',' o ']'", buffer,
+                                       pos - 1)
+        skip_space()
+
+
+def stream_json_lines(file):
+    """Genera un registro por cada línea no vacía de un archivo JSON Lines."""
+    for line_no, line in enumerate(file, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                message = f"línea {line_no}: {error.msg}"
+                raise json.JSONDecodeError(message, line,
+                                           error.pos) from error
+
+
+def iter_sales_records(file_path):
+    """Genera los registros de ventas sin cargar el archivo completo.
+
+    Acepta un arreglo JSON (con ijson si está instalado, o el lector de la
+    biblioteca estándar) o JSON Lines (.jsonl/.ndjson). Los errores de
+    formato se elevan como json.JSONDecodeError.
+    """
+    if is_json_lines(file_path):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            yield from stream_json_lines(file)
+    elif ijson is not None:
+        with open(file_path, 'rb') as file:
+            try:
+                yield from ijson.items(file, "item", use_float=True)
+            except ijson.JSONError as error:
+                raise json.JSONDecodeError(str(error), "", 0) from error
+    else:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            yield from stream_json_array(file)
+
+
+def read_sales(file_path, stream=False):
+    """Registros de ventas de un archivo, en lista o como generador.
+
+    Con `stream` (o para JSON Lines) se leen en streaming; los errores se
+    elevan como FileNotFoundError o json.JSONDecodeError.
+    """
+    if stream or is_json_lines(file_path):
+        return iter_sales_records(file_path)
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def exact_number(value, scale=0):
+    """Valor exacto de un número JSON multiplicado por 10**scale.
+
+    Devuelve int si el resultado es entero y Decimal si no. Un float se
+    toma por su representación decimal más corta, así que 28.1 vale
+    exactamente 28.1 y no 28.10000000000000142...
+    """
+    if isinstance(value, int):
+        return value * 10 ** scale
+    number = Decimal(repr(value)).scaleb(scale)
+    if number.is_finite() and number == number.to_integral_value():
+        return int(number)
+    return number
+
+
+def to_money(cents):
+    """Convierte un importe en centavos (int o Decimal) a Decimal en pesos."""
+    return Decimal(cents).scaleb(-2)
+
+
+def normalize_name(name):
+    """Forma canónica de un nombre: casefold y espacios simples."""
+    return " ".join(name.casefold().split())
+
+
+def trigrams(name):
+    """Conjunto de trigramas del nombre normalizado, con bordes."""
+    padded = f" {normalize_name(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogueIndex:
+    """Índice del catálogo de precios: búsqueda exacta y aproximada.
+
+    Primero se busca el título exacto en un diccionario y luego su forma
+    normalizada. Si no aparece, un índice invertido de trigramas da las
+    candidatas que comparten algún trigrama con el nombre, y se elige la de
+    mayor coeficiente de Dice (2|A∩B| / (|A| + |B|)) si alcanza el umbral.
+
+    `cents` guarda cada precio como número exacto de centavos: int para
+    los precios con dos decimales o menos, Decimal para los demás.
+    """
+
+    def __init__(self, price_catalogue):
+        self.prices = {}
+        for item in price_catalogue:
+            name = item.get("title")
+            price = item.get("price")
+            if name and isinstance(price, (int, float)):
+                self.prices[name] = price
+        self.cents = {title: exact_number(price, 2)
+                      for title, price in self.prices.items()}
+        self.titles = list(self.prices)
+        self.normalized = {normalize_name(title): title
+                           for title in self.titles}
+        self.sizes = []
+        self.postings = {}
+        for title_id, title in enumerate(self.titles):
+            grams = trigrams(title)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(title_id)
+
+    def state(self):
+        """Estado del índice como datos JSON, para from_state."""
+        return {"prices": list(self.prices.items()), "sizes": self.sizes,
+                "postings": self.postings}
+
+    @classmethod
+    def from_state(cls, state):
+        """Reconstruye un índice a partir de state() de otro ya construido.
+
+        Solo se aceptan los tipos que produce state(); cualquier otra forma
+        eleva ValueError.
+        """
+        try:
+            prices = dict(state["prices"])
+            sizes = list(state["sizes"])
+            postings = dict(state["postings"])
+            valid = (
+                all(isinstance(price, (int, float))
+                    for price in prices.values())
+                and len(sizes) == len(prices)
+                and all(isinstance(size, int) for size in sizes)
+                and all(isinstance(gram, str) and isinstance(ids, list)
+                        and all(isinstance(title_id, int)
+                                and 0 <= title_id < len(sizes)
+                                for title_id in ids)
+                        for gram, ids in postings.items()))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"Estado de índice inválido: {error}") from error
+        if not valid:
+            raise ValueError("Estado de índice inválido")
+        index = cls.__new__(cls)
+        index.prices = prices
+        index.cents = {title: exact_number(price, 2)
+                       for title, price in prices.items()}
+        index.titles = list(prices)
+        index.normalized = {normalize_name(title): title
+                            for title in index.titles}
+        index.sizes = sizes
+        index.postings = postings
+        return index
+
+    def lookup(self, name, threshold=DEFAULT_THRESHOLD):
+        """Devuelve (título, precio, confianza) o None si no hay coincidencia.
+
+        La confianza es 1.0 para coincidencias exactas o normalizadas.
+        """
+        if name in self.prices:
+            return name, self.prices[name], 1.0
+        if not isinstance(name, str):
+            return None
+        title = self.normalized.get(normalize_name(name))
+        if title is not None:
+            return title, self.prices[title], 1.0
+        if threshold > 1:
+            return None
+        grams = trigrams(name)
+        shared = Counter(title_id for gram in grams
+                         for title_id in self.postings.get(gram, ()))
+        best_score, best_id = 0.0, None
+        for title_id, common in shared.items():
+            score = 2 * common / (len(grams) + self.sizes[title_id])
+            if score >= threshold and (best_id is None or score > best_score):
+                best_score, best_id = score, title_id
+        if best_id is None:
+            return None
+        title = self.titles[best_id]
+        return title, self.prices[title], best_score
+
+
+def load_catalogue_index(file_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Carga el índice del catálogo, reutilizando el guardado en disco.
+
+    La caché se identifica con el SHA-256 del archivo del catálogo, así que
+    un catálogo modificado produce un índice nuevo. Se guarda como JSON y
+    se valida con CatalogueIndex.from_state: una caché dañada o ajena se
+    ignora y el índice se reconstruye. Devuelve None si el catálogo no se
+    puede leer.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        print(f"Error: El archivo '{file_path}' no fue encontrado.")
+        return None
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir,
+                                  f"{digest}.v{INDEX_VERSION}.json")
+        try:
+            with open(cache_path, "r", encoding="utf-8") as cache_file:
+                return CatalogueIndex.from_state(json.load(cache_file))
+        except (OSError, ValueError, RecursionError):
+            pass
+    catalogue = load_json_file(file_path)
+    if catalogue is None:
+        return None
+    index = CatalogueIndex(catalogue)
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temporary = f"{cache_path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as cache_file:
+                json.dump(index.state(), cache_file)
+            os.replace(temporary, cache_path)
+        except OSError as e:
+            print(f"Aviso: no se pudo guardar el índice en "
+                  f"'{cache_path}': {e}")
+    return index
+
+
+def group_key(value):
+    """Llave de agrupación para un valor que no se puede usar en un dict."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def group_order(key):
+    """Orden de las llaves de un grupo: números, luego texto, luego nulos."""
+    if isinstance(key, (int, float)):
+        return 0, key, ""
+    return (1, 0, key) if key is not None else (2, 0, "")
+
+
+def add_to_groups(groups, record, title, amount):
+    """Suma `amount` al subtotal del registro en cada campo de `groups`."""
+    for field, subtotals in groups.items():
+        key = title if field == "Product" else record.get(field)
+        try:
+            subtotals[key] += amount
+        except TypeError:
+            subtotals[group_key(key)] += amount
+
+
+def compute_total_sales(price_catalogue, sales_record, index=None,
+                        threshold=DEFAULT_THRESHOLD, groups=None):
+    """Calcula el total de ventas cruzando precios y registros.
+
+    `index` es un CatalogueIndex ya construido; si no se da, se construye a
+    partir de `price_catalogue`. Los productos que solo coinciden de forma
+    aproximada se suman y se reportan en la lista de advertencias.
+    `groups`, si se da, es un diccionario {campo: Counter} donde se acumula
+    el subtotal en centavos de cada valor del campo ("Product" usa el
+    título del catálogo).
+
+    La aritmética es exacta: las cantidades se acumulan como enteros (o
+    Decimal si no lo son) por producto y cada acumulado se multiplica una
+    sola vez por el precio en centavos, sin pasar por float. El total se
+    devuelve como Decimal y los subtotales de cada grupo suman
+    exactamente el total.
+    """
+    errors = []
+    if index is None:
+        index = CatalogueIndex(price_catalogue)
+    cents = index.cents
+    quantities = dict.fromkeys(cents, 0)
+
+    for record in sales_record:
+        product_name = record.get("Product")
+        quantity = record.get("Quantity")
+        if product_name in cents:
+            match = (product_name, None, 1.0)
+        else:
+            match = index.lookup(product_name, threshold)
+
+        if match is not None and isinstance(quantity, (int, float)):
+            title = match[0]
+            units = (quantity if isinstance(quantity, int)
+                     else exact_number(quantity))
+            quantities[title] += units
+            if groups is not None:
+                add_to_groups(groups, record, title, cents[title] * units)
+            if title != product_name:
+                errors.append(f"Producto aproximado: '{product_name}' -> "
+                              f"'{title}' (confianza {match[2]:.2f}) "
+                              f"en {record}")
+        else:
+            errors.append(f"Dato inválido o no encontrado: {record}")
+
+    total_cents = sum(cents[title] * units
+                      for title, units in quantities.items())
+    return to_money(total_cents), errors
+
+
+def encode_column(values, codes, fallback=group_key):
+    """Codifica una columna como arreglo de ids (codificación por diccionario).
+
+    `codes` (valor -> id) se comparte entre lotes, así que cada valor
+    conserva su id. Los valores que no se pueden usar como llave se
+    codifican como `fallback(valor)`.
+    """
+    try:
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                codes[value] = len(codes)
+        ids = list(map(codes.__getitem__, values))
+    except TypeError:
+        ids = []
+        for value in values:
+            try:
+                ids.append(codes.setdefault(value, len(codes)))
+            except TypeError:
+                ids.append(codes.setdefault(fallback(value), len(codes)))
+    return np.array(ids, dtype=np.int64)
+
+
+class ProductCodes:
+    """Codifica los nombres de producto contra el catálogo.
+
+    Cada nombre distinto se busca una sola vez con CatalogueIndex.lookup;
+    `product` (id del título, -1 si no se encontró) y `approximate` se
+    indexan con el id del nombre.
+    """
+
+    def __init__(self, index, threshold):
+        self.index = index
+        self.threshold = threshold
+        self.title_ids = {title: title_id
+                          for title_id, title in enumerate(index.titles)}
+        self.names = {}
+        self.matches = []
+        self.product = np.zeros(0, dtype=np.int64)
+        self.approximate = np.zeros(0, dtype=bool)
+
+    def encode(self, names):
+        """Ids de nombre, de título y máscara de aproximados de un lote."""
+        name_ids = encode_column(names, self.names, lambda value: None)
+        if len(self.matches) < len(self.names):
+            for name in itertools.islice(self.names, len(self.matches), None):
+                match = self.index.lookup(name, self.threshold)
+                self.matches.append(
+                    (-1, 0.0, False) if match is None else
+                    (self.title_ids[match[0]], match[2], match[0] != name))
+            self.product = np.array([match[0] for match in self.matches],
+                                    dtype=np.int64)
+            self.approximate = np.array([match[2] for match in self.matches],
+                                        dtype=bool)
+        return name_ids, self.product[name_ids], self.approximate[name_ids]
+
+    def confidence(self, name_id):
+        """Confianza de la coincidencia del nombre con id `name_id`."""
+        return self.matches[name_id][1]
+
+
+def quantity_column(values):
+    """Cantidades de un lote como (tipo, int64); ver QUANTITY_KINDS.
+
+    Los enteros de magnitud COLUMN_QUANTITY_LIMIT o mayor se marcan como
+    tipo 2 antes de convertirlos, para que se sumen fuera de int64 sin
+    riesgo de desbordamiento.
+    """
+    kinds = np.fromiter(map(QUANTITY_KINDS.get, map(type, values),
+                            itertools.repeat(0)), np.int8, len(values))
+    whole = [value if kind == 1 else 0
+             for value, kind in zip(values, kinds.tolist())]
+    if whole and not (-COLUMN_QUANTITY_LIMIT < min(whole)
+                      and max(whole) < COLUMN_QUANTITY_LIMIT):
+        large = [abs(value) >= COLUMN_QUANTITY_LIMIT for value in whole]
+        kinds[large] = 2
+        whole = [0 if big else value for value, big in zip(whole, large)]
+    return kinds, np.array(whole, dtype=np.int64)
+
+
+class ColumnarTotals:
+    """Acumula, lote por lote, las cantidades y subtotales de ventas.
+
+    Las cantidades enteras con precio entero en centavos se suman por
+    producto, o por par (grupo, producto), con np.add.at en int64; el
+    resto de los registros válidos se suma uno a uno con exact_number.
+    """
+
+    def __init__(self, index, threshold, groups=None):
+        self.products = ProductCodes(index, threshold)
+        self.title_cents = [index.cents[title] for title in index.titles]
+        # El último elemento (False) es el que toman los productos con id -1.
+        self.integer_price = np.array(
+            [isinstance(price, int) for price in self.title_cents] + [False])
+        self.quantities = [0] * len(self.title_cents)
+        self.subtotals = groups or {}
+        # Por campo: (valor -> id, valores en orden de id, subtotales).
+        self.groups = {field: ({}, [], subtotals)
+                       for field, subtotals in self.subtotals.items()}
+        self.errors = []
+
+    def add_batch(self, batch):
+        """Suma un lote de registros y reporta los inválidos o aproximados."""
+        name_ids, product, approximate = self.products.encode(
+            [record.get("Product") for record in batch])
+        kinds, units = quantity_column(
+            [record.get("Quantity") for record in batch])
+        valid = (product >= 0) & (kinds > 0)
+        fast = valid & (kinds == 1) & self.integer_price[product]
+        self.add_fast(batch, fast, product[fast], units[fast])
+        for position in np.flatnonzero(valid & ~fast).tolist():
+            self.add_record(batch[position], int(product[position]))
+        for position in np.flatnonzero(~valid | approximate).tolist():
+            record = batch[position]
+            if valid[position]:
+                title = self.products.index.titles[product[position]]
+                confidence = self.products.confidence(name_ids[position])
+                self.errors.append(
+                    f"Producto aproximado: '{record.get('Product')}' -> "
+                    f"'{title}' (confianza {confidence:.2f}) en {record}")
+            else:
+                self.errors.append(f"Dato inválido o no encontrado: {record}")
+
+    def add_fast(self, batch, fast, product, units):
+        """Suma con np.add.at los registros marcados en `fast`."""
+        sums = np.zeros(len(self.quantities), dtype=np.int64)
+        np.add.at(sums, product, units)
+        for title_id in np.flatnonzero(sums).tolist():
+            self.quantities[title_id] += int(sums[title_id])
+        for field, (codes, keys, subtotals) in self.groups.items():
+            if field == "Product":
+                keys, group_ids = self.products.index.titles, product
+            else:
+                group_ids = encode_column(
+                    [record.get(field) for record in batch], codes)[fast]
+                keys.extend(itertools.islice(codes, len(keys), None))
+            self.add_pairs(subtotals, keys, group_ids, product, units)
+
+    def add_pairs(self, subtotals, keys, group_ids, product, units):
+        """Suma las unidades por par (grupo, producto) en `subtotals`."""
+        width = len(self.title_cents)
+        pairs, inverse = np.unique(group_ids * width + product,
+                                   return_inverse=True)
+        pair_units = np.zeros(len(pairs), dtype=np.int64)
+        np.add.at(pair_units, inverse.ravel(), units)
+        for pair, total in zip(pairs.tolist(), pair_units.tolist()):
+            group_id, title_id = divmod(pair, width)
+            subtotals[keys[group_id]] += self.title_cents[title_id] * total
+
+    def add_record(self, record, title_id):
+        """Suma un registro válido con aritmética exacta."""
+        record_units = exact_number(record.get("Quantity"))
+        self.quantities[title_id] += record_units
+        add_to_groups(self.subtotals, record,
+                      self.products.index.titles[title_id],
+                      self.title_cents[title_id] * record_units)
+
+    def total(self):
+        """Total de ventas acumulado, en pesos."""
+        return to_money(sum(price * units for price, units
+                            in zip(self.title_cents, self.quantities)))
+
+
+def columnar_total_sales(price_catalogue, sales_record, index=None,
+                         threshold=DEFAULT_THRESHOLD, groups=None):
+    """Versión columnar (NumPy) de compute_total_sales, con el mismo resultado.
+
+    Los registros se procesan en lotes de COLUMN_BATCH con ColumnarTotals:
+    cada lote se convierte en columnas, el producto se codifica contra el
+    catálogo y los registros inválidos o aproximados se identifican con
+    máscaras. Cada suma en int64 se multiplica por el precio en centavos
+    con enteros de Python, así que el total sigue siendo exacto.
+    """
+    if index is None:
+        index = CatalogueIndex(price_catalogue)
+    totals = ColumnarTotals(index, threshold, groups)
+    records = iter(sales_record)
+    for batch in iter(lambda: list(itertools.islice(records, COLUMN_BATCH)),
+                      []):
+        totals.add_batch(batch)
+    return totals.total(), totals.errors
+
+
+def format_save_results(total, elapsed_time, sales_file, errors):
+    """Formatea los resultados, los imprime y los guarda."""
+    for error in errors:
+        print(f"Advertencia: {error}")
+
+    header = "-" * 40
+    result_output = (
+        f"{header}\n"
+        f"REPORTE DE VENTAS PARA: {sales_file}\n"
+        f"{header}\n"
+        f"Total de ventas calculadas: ${total:,.2f}\n"
+        f"Tiempo de ejecución: {elapsed_time:.4f} segundos\n"
+        f"{header}"
+    )
+
+    print(result_output)
+
+    output_dir = "Results"
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Usamos el nombre limpio para el archivo de salida
+    file_name = f"SalesResults_{sales_file}.txt"
+    file_path = os.path.join(output_dir, file_name)
+
+    try:
+        with open(file_path, "w", encoding="utf-8") as out_file:
+            out_file.write(result_output)
+        print(f"Archivo guardado en: {file_path}")
+    except IOError as e:
+        print(f"Error al escribir en '{file_path}': {e}")
+
+
+def expand_sales_paths(paths):
+    """Expande los directorios a sus archivos de ventas, en orden."""
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(SALES_SUFFIXES)
+                and os.path.isfile(os.path.join(path, name)))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def init_worker(state):
+    """Reconstruye una vez por proceso el índice compartido del catálogo."""
+    global _WORKER_INDEX  # pylint: disable=global-statement
+    _WORKER_INDEX = CatalogueIndex.from_state(state)
+
+
+def sales_engine(columnar):
+    """Función que calcula el total: columnar (NumPy) o ciclo por registro."""
+    return columnar_total_sales if columnar else compute_total_sales
+
+
+def aggregate_file(file_path, threshold, stream, columnar=False, index=None):
+    """Suma un archivo de ventas y sus subtotales por GROUP_FIELDS.
+
+    Un archivo que no se puede leer se reporta en `failure` sin detener
+    el lote.
+    """
+    name = os.path.basename(file_path)
+    groups = {field: Counter() for field in GROUP_FIELDS}
+    try:
+        total, errors = sales_engine(columnar)(
+            None, read_sales(file_path, stream), index or _WORKER_INDEX,
+            threshold, groups)
+    except FileNotFoundError:
+        return FileResult(name, 0, [], {}, "no fue encontrado")
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        reason = getattr(error, "msg", None) or error.reason
+        return FileResult(name, 0, [], {}, f"no es un JSON válido: {reason}")
+    except OSError as error:
+        reason = error.strerror or error
+        return FileResult(name, 0, [], {}, f"no se pudo leer: {reason}")
+    return FileResult(name, total, errors, groups, None)
+
+
+def run_batch(index, filenames, args, columnar=False):
+    """Procesa varios archivos de ventas en un pool de procesos.
+
+    El índice del catálogo se construye (o se lee de la caché) una sola vez
+    y se envía a cada proceso al iniciarlo, no con cada archivo. Devuelve
+    los resultados en el orden de `filenames`.
+    """
+    jobs = [(path, args.threshold, args.stream, columnar)
+            for path in filenames]
+    workers = args.workers or os.cpu_count() or 1
+    with contextlib.ExitStack() as stack:
+        if workers > 1 and len(jobs) > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs)),
+                initializer=init_worker, initargs=(index.state(),)))
+            chunksize = max(1, len(jobs) // (4 * workers))
+            return list(executor.map(aggregate_file, *zip(*jobs),
+                                     chunksize=chunksize))
+        return list(itertools.starmap(
+            aggregate_file, ((*job, index) for job in jobs)))
+
+
+def format_batch_report(results, elapsed_time):
+    """Arma el reporte consolidado: totales por archivo y por grupo."""
+    header = "-" * 40
+    totals = {field: Counter() for field in GROUP_FIELDS}
+    lines = [header, f"REPORTE DE VENTAS CONSOLIDADO: {len(results)} archivos",
+             header, "Por archivo:"]
+    grand_total = 0
+    for result in results:
+        if result.failure:
+            lines.append(f"  {result.name}: Error: {result.failure}")
+            continue
+        grand_total += result.total
+        lines.append(f"  {result.name}: ${result.total:,.2f}")
+        for field, subtotals in result.groups.items():
+            totals[field].update(subtotals)
+    for field in GROUP_FIELDS:
+        lines.append(f"{GROUP_TITLES[field]}:")
+        lines.extend(f"  {key}: ${to_money(totals[field][key]):,.2f}"
+                     for key in sorted(totals[field], key=group_order))
+    lines += [header,
+              f"Total de ventas calculadas: ${grand_total:,.2f}",
+              f"Tiempo de ejecución: {elapsed_time:.4f} segundos",
+              header]
+    return "\n".join(lines)
+
+
+def save_batch_results(results, elapsed_time):
+    """Imprime las advertencias y el reporte consolidado, y lo guarda."""
+    for result in results:
+        for error in result.errors:
+            print(f"Advertencia: {result.name}: {error}")
+    result_output = format_batch_report(results, elapsed_time)
+    print(result_output)
+
+    output_dir = "Results"
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, BATCH_REPORT)
+    try:
+        with open(file_path, "w", encoding="utf-8") as out_file:
+            out_file.write(result_output)
+        print(f"Archivo guardado en: {file_path}")
+    except IOError as e:
+        print(f"Error al escribir en '{file_path}': {e}")
+
+
+def parse_args(argv):
+    """Interpreta los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Calcula el costo total de ventas desde archivos JSON.")
+    parser.add_argument("catalogue", help="Catálogo de precios (JSON).")
+    parser.add_argument(
+        "sales", nargs="+",
+        help="Registro de ventas (JSON); varios archivos o un directorio "
+             "activan el modo lote con un reporte consolidado.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Confianza mínima para aceptar un producto aproximado "
+             "(mayor que 1 desactiva la búsqueda aproximada).")
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR,
+        help="Carpeta para el índice del catálogo ('' para no usar caché).")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Leer las ventas registro por registro en memoria constante "
+             "(siempre activo para .jsonl/.ndjson).")
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Procesos para el modo lote (por defecto, uno por CPU).")
+    parser.add_argument(
+        "--backend", choices=("auto", "python", "numpy"), default="auto",
+        help="Motor de cálculo; 'auto' usa el motor columnar de NumPy si "
+             "está instalado y, si no, el ciclo por registro.")
+    return parser.parse_args(argv)
+
+
+def total_single_file(engine, index, sales_arg, args):
+    """Total y advertencias de un solo archivo, o None si no se pudo leer."""
+    if args.stream or is_json_lines(sales_arg):
+        try:
+            return engine(None, iter_sales_records(sales_arg), index,
+                          args.threshold)
+        except FileNotFoundError:
+            print(f"Error: El archivo '{sales_arg}' no fue encontrado.")
+        except json.JSONDecodeError as error:
+            print(f"Error: El archivo '{sales_arg}' no es un JSON válido: "
+                  f"{error.msg}")
+        return None
+    sales_data = load_json_file(sales_arg)
+    if sales_data is None:
+        return None
+    return engine(None, sales_data, index, args.threshold)
+
+
+def main():
+    """Función principal para obtener el cálculo de ventas."""
+    usage_msg = "Uso: python computeSales.py catalogue.json sales.json"
+    if len(sys.argv) < 3:
+        print(usage_msg)
+        return
+
+    start_time = time.time()
+    args = parse_args(sys.argv[1:])
+    filenames = expand_sales_paths(args.sales)
+    if args.backend == "numpy" and np is None:
+        print("Error: El backend 'numpy' requiere tener NumPy instalado.")
+        return
+    columnar = np is not None and args.backend != "python"
+    engine = sales_engine(columnar)
+
+    index = load_catalogue_index(args.catalogue, args.cache_dir)
+    if index is None:
+        return
+
+    if len(filenames) != 1 or filenames != args.sales:
+        if not filenames:
+            print("Error: No se encontraron archivos de ventas.")
+            return
+        results = run_batch(index, filenames, args, columnar)
+        save_batch_results(results, time.time() - start_time)
+        return
+    sales_arg = filenames[0]
+    result = total_single_file(engine, index, sales_arg, args)
+    if result is None:
+        return
+    total_calculated, found_errors = result
+    elapsed = time.time() - start_time
+
+    # Esto elimina las carpetas (Sales_list/) del nombre del resultado.
+    clean_sales_name = os.path.basename(sales_arg)
+
+    format_save_results(total_calculated, elapsed, clean_sales_name,
+                        found_errors)
+
+
+if __name__ == "__main__":
+    main()
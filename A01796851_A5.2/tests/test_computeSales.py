@@ -0,0 +1,248 @@
+"""Pruebas unitarias para computeSales.py."""
+# pylint: disable=invalid-name
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import computeSales  # noqa: E402  pylint: disable=wrong-import-position
+
+CATALOGUE = [{"title": "Leche", "price": 21.5},
+             {"title": "Pan", "price": 3},
+             {"title": "Queso", "price": 0.125}]
+
+
+class TestCatalogueCache(unittest.TestCase):
+    """Caché del índice del catálogo en disco."""
+
+    def setUp(self):
+        """Escribe el catálogo en una carpeta temporal."""
+        self.folder = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.folder, "cache")
+        self.catalogue = os.path.join(self.folder, "catalogo.json")
+        with open(self.catalogue, "w", encoding="utf-8") as file:
+            json.dump(CATALOGUE, file)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def load(self):
+        """Índice cargado con la caché de la prueba."""
+        return computeSales.load_catalogue_index(self.catalogue,
+                                                 self.cache_dir)
+
+    def test_cache_matches_fresh_index(self):
+        """El índice leído de la caché busca igual que uno nuevo."""
+        fresh = self.load()
+        cached = self.load()
+        [name] = os.listdir(self.cache_dir)
+        self.assertTrue(name.endswith(".json"))
+        self.assertEqual(vars(cached), vars(fresh))
+        for name in ("Pan", "leche", "Qeso", "Nada"):
+            self.assertEqual(cached.lookup(name), fresh.lookup(name))
+
+    def test_bad_cache_is_rebuilt(self):
+        """Una caché dañada o con otra forma se ignora."""
+        fresh = self.load()
+        cache_path = os.path.join(self.cache_dir,
+                                  os.listdir(self.cache_dir)[0])
+        for content in ("{", "[]", '{"prices": [["Pan", "3"]], '
+                        '"sizes": [1], "postings": {}}',
+                        '{"prices": [], "sizes": [], '
+                        '"postings": {"pan": [7]}}'):
+            with open(cache_path, "w", encoding="utf-8") as file:
+                file.write(content)
+            self.assertEqual(vars(self.load()), vars(fresh))
+
+    def test_invalid_state(self):
+        """from_state rechaza estados que no produce state()."""
+        with self.assertRaises(ValueError):
+            computeSales.CatalogueIndex.from_state({"prices": 5})
+
+
+class TestBatch(unittest.TestCase):
+    """Modo lote: un archivo con error no detiene a los demás."""
+
+    def setUp(self):
+        """Crea un archivo de ventas válido y uno ilegible."""
+        self.folder = tempfile.mkdtemp()
+        self.good = os.path.join(self.folder, "buenas.json")
+        with open(self.good, "w", encoding="utf-8") as file:
+            json.dump([{"Product": "Pan", "Quantity": 2,
+                        "SALE_Date": "a", "SALE_ID": 1}], file)
+        self.unreadable = os.path.join(self.folder, "carpeta.json")
+        os.mkdir(self.unreadable)
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def test_unreadable_file_is_reported(self):
+        """Un OSError al leer se reporta por archivo."""
+        index = computeSales.CatalogueIndex(CATALOGUE)
+        args = computeSales.parse_args(
+            ["catalogo.json", self.unreadable, self.good, "--workers", "1"])
+        results = computeSales.run_batch(
+            index, [self.unreadable, self.good], args)
+        self.assertIn("no se pudo leer", results[0].failure)
+        self.assertIsNone(results[1].failure)
+        self.assertEqual(results[1].total, computeSales.to_money(600))
+        for stream in (False, True):
+            result = computeSales.aggregate_file(
+                self.unreadable, 0.8, stream, index=index)
+            self.assertIn("no se pudo leer", result.failure)
+
+
+class TestBatchTotals(unittest.TestCase):
+    """Modo lote: totales por archivo, por grupo y total general."""
+
+    def setUp(self):
+        """Crea un archivo JSON y uno JSON Lines con un producto inválido."""
+        self.folder = tempfile.mkdtemp()
+        self.filenames = [os.path.join(self.folder, name)
+                          for name in ("a.json", "b.jsonl", "falta.json")]
+        with open(self.filenames[0], "w", encoding="utf-8") as file:
+            json.dump([{"Product": "Leche", "Quantity": 2,
+                        "SALE_Date": "01/01/24", "SALE_ID": 1},
+                       {"Product": "Pan", "Quantity": 1,
+                        "SALE_Date": "02/01/24", "SALE_ID": 1}], file)
+        with open(self.filenames[1], "w", encoding="utf-8") as file:
+            for product, quantity, date in (("Queso", 8, "01/01/24"),
+                                            ("Pan", 3, "02/01/24"),
+                                            ("Nada", 3, "02/01/24")):
+                file.write(json.dumps({"Product": product,
+                                       "Quantity": quantity,
+                                       "SALE_Date": date,
+                                       "SALE_ID": 2}) + "\n")
+
+    def tearDown(self):
+        """Borra la carpeta temporal."""
+        shutil.rmtree(self.folder)
+
+    def test_per_file_and_grand_total(self):
+        """El reporte suma cada archivo y el total general, en serie o no."""
+        index = computeSales.CatalogueIndex(CATALOGUE)
+        for workers in ("1", "2"):
+            with self.subTest(workers=workers):
+                args = computeSales.parse_args(
+                    ["catalogo.json", *self.filenames, "--workers", workers])
+                results = computeSales.run_batch(index, self.filenames, args)
+                self.assertEqual([result.total for result in results[:2]],
+                                 [computeSales.to_money(4600),
+                                  computeSales.to_money(1000)])
+                self.assertEqual(len(results[1].errors), 1)
+                self.assertEqual(results[2].failure, "no fue encontrado")
+                report = computeSales.format_batch_report(results, 0)
+                self.assertIn("\n  a.json: $46.00\n"
+                              "  b.jsonl: $10.00\n"
+                              "  falta.json: Error: no fue encontrado\n",
+                              report)
+                self.assertIn("\n  01/01/24: $44.00\n  02/01/24: $12.00\n",
+                              report)
+                self.assertIn("\n  Leche: $43.00\n  Pan: $12.00\n"
+                              "  Queso: $1.00\n", report)
+                self.assertIn("\nTotal de ventas calculadas: $56.00\n",
+                              report)
+
+
+class CountingReader(io.StringIO):
+    """StringIO que cuenta cuántos caracteres se han leído."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+class TestStreamJsonArray(unittest.TestCase):
+    """Lectura por bloques de un arreglo JSON."""
+
+    def test_elements_across_chunks(self):
+        """Elementos cortados entre bloques se decodifican completos."""
+        records = [{"Product": "Pan", "Quantity": -1.5e-3, "ok": True,
+                    "texto": "a\u00e9\\\" " * number, "nada": None}
+                   for number in range(40)]
+        text = json.dumps(records, indent=1)
+        for chunk_size in (1, 2, 7, 64):
+            stream = computeSales.stream_json_array(io.StringIO(text),
+                                                    chunk_size)
+            self.assertEqual(list(stream), records)
+
+    def test_bad_early_element(self):
+        """Un elemento inválido al inicio falla sin leer el resto."""
+        text = ('[{"Product": "Pan"}, {"Product": tru, "Quantity": 1}, '
+                + ", ".join(['{"Product": "Pan", "Quantity": 1}'] * 100000)
+                + "]")
+        for bad in ("tru", "[1 2]", '"a\\qb"', "01"):
+            file = CountingReader(text.replace("tru", bad, 1))
+            stream = computeSales.stream_json_array(file, 4096)
+            self.assertEqual(next(stream), {"Product": "Pan"})
+            with self.assertRaises(json.JSONDecodeError):
+                next(stream)
+            self.assertLessEqual(file.consumed, 4096)
+
+    def test_truncated_file(self):
+        """Un archivo cortado se reporta como error de formato."""
+        text = '[{"Product": "Pan", "Quantity": 1}, {"Product": "Pa'
+        stream = computeSales.stream_json_array(io.StringIO(text), 8)
+        self.assertEqual(next(stream), {"Product": "Pan", "Quantity": 1})
+        with self.assertRaises(json.JSONDecodeError):
+            next(stream)
+
+
+@unittest.skipIf(computeSales.np is None, "NumPy no instalado")
+class TestColumnar(unittest.TestCase):
+    """El motor columnar da el mismo resultado que compute_total_sales."""
+
+    def check_same(self, sales):
+        """Compara total, errores y subtotales de ambos motores."""
+        results = []
+        for engine in (computeSales.compute_total_sales,
+                       computeSales.columnar_total_sales):
+            groups = {field: defaultdict(int)
+                      for field in ("SALE_Date", "Product")}
+            total, errors = engine(CATALOGUE, sales, groups=groups)
+            results.append((total, errors,
+                            {field: dict(subtotals)
+                             for field, subtotals in groups.items()}))
+        self.assertEqual(results[1], results[0])
+        return results[0][0]
+
+    def test_extreme_quantities(self):
+        """-2**63 y otros enteros grandes no se desbordan en int64."""
+        for quantities in ((-2 ** 63, -4), (2 ** 63 - 1, 1),
+                           (2 ** 31, -2 ** 31, 2 ** 31 - 1, 10 ** 30, 5)):
+            sales = [{"Product": "Pan", "Quantity": quantity,
+                      "SALE_Date": "a"} for quantity in quantities]
+            total = self.check_same(sales)
+            self.assertEqual(total,
+                             computeSales.to_money(300 * sum(quantities)))
+
+    def test_batches_share_codes(self):
+        """Los ids de grupo y de producto se conservan entre lotes."""
+        sales = [{"Product": ("Leche", "Pan", "queso ", "Nada")[number % 4],
+                  "Quantity": (1, 2.5, True, "3", 7)[number % 5],
+                  "SALE_Date": (f"d{number % 7}" if number % 11
+                                else {"día": number % 3})}
+                 for number in range(200)]
+        for size in (1, 3, 64):
+            with mock.patch.object(computeSales, "COLUMN_BATCH", size):
+                self.check_same(sales)
+
+
+if __name__ == "__main__":
+    unittest.main()
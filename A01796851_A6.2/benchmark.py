@@ -0,0 +1,178 @@
+"""Compara los backends JSON y SQLite del sistema de reservaciones.
+
+Para cada tamaño N se crea una carpeta temporal con N clientes, N
+reservaciones y N/100 hoteles, y se mide con cada backend:
+
+- poblar: guardar las tres colecciones completas con save_*.
+- arranque: primera consulta después de cerrar todo (carga en frío).
+- consultas: búsquedas de reservaciones por ID.
+- reservas / cancelaciones: llamadas a create_reservation y
+  cancel_reservation.
+- lote / cancelar lote: las mismas operaciones con create_reservations y
+  cancel_reservations, en una sola llamada.
+
+Con --stress, en lugar de lo anterior, --workers procesos reservan a la vez
+el mismo hotel hasta agotarlo; se verifica que no haya sobreventa y se
+reporta cuántas reservaciones por segundo se confirmaron.
+
+Uso: python benchmark.py [--sizes 10000 100000 1000000]
+     python benchmark.py --stress [--workers 4] [--rooms 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from src.customer import Customer
+from src.hotel import Hotel
+from src.repository import Repository
+from src.reservations import Reservation
+from src.sqlite_repository import SQLiteRepository
+from src import storage
+
+
+def close_all():
+    """Olvida los repositorios en memoria y cierra las bases de datos."""
+    Repository.sync_all()
+    Repository._instances.clear()  # pylint: disable=protected-access
+    SQLiteRepository.close_all()
+
+
+def timed(function, *args):
+    """Segundos que tarda function(*args), sin mostrar lo que imprime."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args)
+    return time.perf_counter() - start
+
+
+def run(backend, size, operations):
+    """Mide un backend con `size` registros; devuelve {medida: segundos}."""
+    hotels = max(1, size // 100)
+    rooms = 2 * size
+    results = {}
+    storage.configure(backend, os.path.join('data', 'reservations.db'))
+    results['poblar'] = timed(lambda: (
+        Hotel.save_hotels([{'hotel_id': h, 'name': f"Hotel {h}",
+                            'location': "Ciudad", 'rooms': rooms}
+                           for h in range(hotels)]),
+        Customer.save_customers([{'customer_id': c, 'name': f"Cliente {c}",
+                                  'email': f"c{c}@mail.com"}
+                                 for c in range(size)]),
+        Reservation.save_reservations([{'reservation_id': r,
+                                        'customer_id': r,
+                                        'hotel_id': r % hotels}
+                                       for r in range(size)])))
+    close_all()
+    results['arranque'] = timed(Reservation.repository().get, 0)
+
+    ids = [random.randrange(size) for _ in range(operations)]
+    results['consultas'] = timed(
+        lambda: [Reservation.repository().get(r) for r in ids])
+    new_ids = range(size, size + operations)
+    results['reservas'] = timed(lambda: [
+        Reservation.create_reservation(r, r % size, r % hotels)
+        for r in new_ids])
+    results['cancelaciones'] = timed(
+        lambda: [Reservation.cancel_reservation(r) for r in new_ids])
+    results['lote'] = timed(Reservation.create_reservations,
+                            [(r, r % size, r % hotels) for r in new_ids])
+    results['cancelar lote'] = timed(Reservation.cancel_reservations, new_ids)
+    close_all()
+    return results
+
+
+def book_until_full(backend, first_id):
+    """Proceso de --stress: reserva hasta que el hotel se agota."""
+    storage.configure(backend, os.path.join('data', 'reservations.db'))
+    booked = 0
+    res_id = first_id
+    with contextlib.redirect_stdout(io.StringIO()):
+        while Reservation.create_reservation(res_id, 1, 1):
+            booked += 1
+            res_id += 1
+    return booked
+
+
+def stress(backend, workers, rooms):
+    """Reserva desde varios procesos; devuelve (reservas, segundos)."""
+    storage.configure(backend, os.path.join('data', 'reservations.db'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        Reservation.save_reservations([])
+        Hotel.save_hotels([])
+        Customer.save_customers([])
+        Hotel.create_hotel(1, "Plaza", "Cancun", rooms)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+    close_all()
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        booked = sum(pool.starmap(book_until_full, [
+            (backend, worker * rooms) for worker in range(workers)]))
+    elapsed = time.perf_counter() - start
+    stored = len(Reservation.load_reservations())
+    left = Hotel.load_hotels()[0]['a_rooms']
+    close_all()
+    if booked != rooms or stored != rooms or left != 0:
+        raise AssertionError(f"Sobreventa: {booked} confirmadas, {stored} "
+                             f"guardadas, {left} libres de {rooms}.")
+    return booked, elapsed
+
+
+def in_temp_folder(function, *args):
+    """Ejecuta function(*args) dentro de una carpeta temporal con data/."""
+    origin = os.getcwd()
+    folder = tempfile.mkdtemp()
+    try:
+        os.chdir(folder)
+        os.makedirs('data')
+        return function(*args)
+    finally:
+        os.chdir(origin)
+        shutil.rmtree(folder)
+
+
+def main():
+    """Corre la comparación e imprime una tabla por tamaño."""
+    parser = argparse.ArgumentParser(
+        description="Compara los backends JSON y SQLite.")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--operations", type=int, default=1000,
+                        help="Consultas, reservas y cancelaciones por prueba.")
+    parser.add_argument("--backends", nargs="+",
+                        default=list(storage.BACKENDS),
+                        choices=storage.BACKENDS)
+    parser.add_argument("--stress", action="store_true",
+                        help="Prueba de estrés con varios procesos.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rooms", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.stress:
+        for backend in args.backends:
+            booked, elapsed = in_temp_folder(stress, backend, args.workers,
+                                             args.rooms)
+            print(f"{backend:<8}{booked} reservaciones sin sobreventa con "
+                  f"{args.workers} procesos: {booked / elapsed:,.0f}/s")
+        return
+
+    for size in args.sizes:
+        print(f"N = {size:,}")
+        print(f"{'backend':<8}" + "".join(
+            f"{name:>15}" for name in
+            ('poblar', 'arranque', 'consultas', 'reservas', 'cancelaciones',
+             'lote', 'cancelar lote')))
+        for backend in args.backends:
+            results = in_temp_folder(run, backend, size, args.operations)
+            print(f"{backend:<8}" + "".join(
+                f"{seconds:>14.4f}s" for seconds in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """Módulo para la gestión de clientes en el sistema de reservaciones."""
 
-import json
-import os
+try:
+    from src.storage import open_repository
+except ImportError:
+    from storage import open_repository
 
 
 class Customer:
@@ -15,57 +17,53 @@ class Customer:
         self.name = name
         self.email = email
 
+    @classmethod
+    def repository(cls):
+        """Repositorio indexado por customer_id del archivo de clientes."""
+        return open_repository(cls.FILE_PATH, 'customer_id',
+                               "Error al leer el archivo de clientes",
+                               "Error al guardar el archivo de clientes")
+
     @classmethod
     def load_customers(cls):
         """Carga la lista de clientes desde el archivo JSON."""
-        if not os.path.exists(cls.FILE_PATH):
-            return []
-        try:
-            with open(cls.FILE_PATH, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (json.JSONDecodeError, IOError) as error:
-            print(f"Error al leer el archivo de clientes: {error}")
-            return []
+        return cls.repository().all()
 
     @classmethod
     def save_customers(cls, customers):
         """Guarda la lista de clientes en el archivo JSON."""
-        try:
-            with open(cls.FILE_PATH, 'w', encoding='utf-8') as file:
-                json.dump(customers, file, indent=4)
-        except IOError as error:
-            print(f"Error al guardar el archivo de clientes: {error}")
+        cls.repository().replace_all(customers)
 
     @classmethod
     def create_customer(cls, customer_id, name, email):
         """Crea un nuevo cliente y lo guarda en el archivo."""
-        customers = cls.load_customers()
-        if any(c['customer_id'] == customer_id for c in customers):
+        repository = cls.repository()
+        if repository.contains(customer_id):
             print(f"Error: El cliente con ID {customer_id} ya existe.")
             return None
 
-        new_customer_data = {
+        repository.insert({
             'customer_id': customer_id,
             'name': name,
             'email': email
-        }
-        customers.append(new_customer_data)
-        cls.save_customers(customers)
+        })
         print(f"Cliente '{name}' creado exitosamente.")
         return cls(customer_id, name, email)
 
     @classmethod
     def delete_customer(cls, customer_id):
-        """Elimina un cliente del registro por su ID."""
-        customers = cls.load_customers()
-        updated_customers = [c for c in customers
-                             if c['customer_id'] != customer_id]
-
-        if len(customers) == len(updated_customers):
+        """Elimina un cliente y cancela sus reservaciones."""
+        # Importación diferida: reservations.py importa este módulo.
+        # pylint: disable=import-outside-toplevel
+        try:
+            from src.reservations import Reservation
+        except ImportError:
+            from reservations import Reservation
+        if not Reservation.delete_with_reservations(cls, 'customer_id',
+                                                    customer_id):
             print(f"Error: No se encontró al cliente con ID {customer_id}.")
             return False
 
-        cls.save_customers(updated_customers)
         print(f"Cliente con ID {customer_id} eliminado.")
         return True
 
@@ -81,11 +79,6 @@ class Customer:
         if email:
             self.email = email
 
-        customers = self.load_customers()
-        for cust in customers:
-            if cust['customer_id'] == self.customer_id:
-                cust['name'] = self.name
-                cust['email'] = self.email
-                break
-        self.save_customers(customers)
+        self.repository().update(self.customer_id,
+                                 {'name': self.name, 'email': self.email})
         print(f"Información del cliente {self.customer_id} actualizada.")
@@ -1,8 +1,10 @@
 """
  Actividad 6.2. Ejercicio de programación 3: Sistema de Reservaciones
 """
-import json
-import os
+try:
+    from src.storage import open_repository
+except ImportError:
+    from storage import open_repository
 
 
 class Hotel:
@@ -18,26 +20,22 @@ class Hotel:
         # Inicializamos disponibilidad internamente
         self.a_rooms = rooms
 
+    @classmethod
+    def repository(cls):
+        """Repositorio indexado por hotel_id del archivo de hoteles."""
+        return open_repository(cls.FILE_PATH, 'hotel_id',
+                               "Error al cargar datos",
+                               "Error al guardar datos")
+
     @classmethod
     def load_hotels(cls):
         """Carga los hoteles desde el archivo JSON."""
-        if not os.path.exists(cls.FILE_PATH):
-            return []
-        try:
-            with open(cls.FILE_PATH, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error al cargar datos: {e}")
-            return []
+        return cls.repository().all()
 
     @classmethod
     def save_hotels(cls, hotels):
         """Guarda la lista de hoteles en el archivo JSON."""
-        try:
-            with open(cls.FILE_PATH, 'w', encoding='utf-8') as file:
-                json.dump(hotels, file, indent=4)
-        except IOError as e:
-            print(f"Error al guardar datos: {e}")
+        cls.repository().replace_all(hotels)
 
     def reserve_room(self):
         """Método de instancia para reservar. Arregla el AttributeError."""
@@ -56,26 +54,30 @@ class Hotel:
     @classmethod
     def create_hotel(cls, hotel_id, name, location, rooms):
         """Crea un nuevo hotel y lo persiste."""
-        hotels = cls.load_hotels()
+        repository = cls.repository()
         # Verificar si ya existe el ID
-        if any(h['hotel_id'] == hotel_id for h in hotels):
+        if repository.contains(hotel_id):
             print(f"Error: El hotel con ID {hotel_id} ya existe.")
             return
 
-        hotels.append({
+        repository.insert({
             'hotel_id': hotel_id,
             'name': name,
             'location': location,
             'rooms': rooms
         })
-        cls.save_hotels(hotels)
 
     @classmethod
     def delete_hotel(cls, hotel_id):
-        """Elimina un hotel por su ID."""
-        hotels = cls.load_hotels()
-        updated_hotels = [h for h in hotels if h['hotel_id'] != hotel_id]
-        cls.save_hotels(updated_hotels)
+        """Elimina un hotel por su ID junto con sus reservaciones."""
+        # Importación diferida: reservations.py importa este módulo.
+        # pylint: disable=import-outside-toplevel
+        try:
+            from src.reservations import Reservation
+        except ImportError:
+            from reservations import Reservation
+        return Reservation.delete_with_reservations(cls, 'hotel_id',
+                                                    hotel_id)
 
     def display_info(self):
         """Muestra la información detallada del hotel en consola."""
@@ -94,13 +96,9 @@ class Hotel:
             self.rooms = rooms
 
         # Después de modificar el objeto, actualizamos la base de datos
-        hotels = self.load_hotels()
-        for hotel in hotels:
-            if hotel['hotel_id'] == self.hotel_id:
-                hotel.update({
-                    'name': self.name,
-                    'location': self.location,
-                    'rooms': self.rooms
-                })
-        self.save_hotels(hotels)
+        self.repository().update(self.hotel_id, {
+            'name': self.name,
+            'location': self.location,
+            'rooms': self.rooms
+        })
         print(f"Hotel {self.hotel_id} modificado exitosamente.")
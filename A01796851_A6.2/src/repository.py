@@ -0,0 +1,569 @@
+"""Repositorio en memoria e indexado para las colecciones JSON del sistema.
+
+Cada colección se guarda como una instantánea (el archivo JSON de siempre)
+más un log de solo escritura al final (`<archivo>.log`, JSON Lines). Los
+cambios individuales se agregan al log en una línea, sin reescribir la
+colección; al cargar se lee la instantánea y se reaplica el log. Cuando el
+log crece más que la colección se compacta: la instantánea se reescribe en
+un temporal que reemplaza al original con os.replace y el log se vacía.
+
+La primera línea del log guarda una huella (hash BLAKE2) del contenido de
+la instantánea a la que pertenece, así que cambiar solo la fecha del
+archivo (touch, copias, respaldos) no separa el log de su instantánea. Si
+la instantánea se reemplazó por otra (una compactación interrumpida u
+otro programa), el log viejo no se aplica ni se borra: se aparta como
+`<archivo>.log.<n>.stale`. Una última línea incompleta por una caída se
+ignora y se recorta del archivo.
+
+Las escrituras se hacen con un candado exclusivo entre procesos sobre la
+carpeta de datos (`.lock`, con fcntl.flock o msvcrt.locking en Windows).
+Repository.transaction() mantiene el candado durante un bloque que
+modifica varias colecciones y al final confirma todos los cambios juntos:
+primero los escribe en un diario (`.journal`, temporal más os.replace),
+luego los agrega a cada log y al final borra el diario. Si el proceso se
+cae a la mitad, el siguiente que tome el candado reaplica el diario, así
+que se aplican todos los cambios de la transacción o ninguno.
+"""
+
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import time
+
+# Solo uno de los dos existe en cada sistema, pero ambos nombres quedan
+# definidos al importar: el candado usa el que no sea None.
+try:
+    import fcntl
+except ImportError:  # En Windows se usa msvcrt.locking.
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # msvcrt solo existe en Windows.
+    msvcrt = None
+
+SYNC_EVERY = 64
+COMPACT_MIN = 1000
+LOCK_NAME = '.lock'
+JOURNAL_NAME = '.journal'
+RECOVERY_ERROR = "Error al recuperar una transacción"
+
+# Candados tomados por este proceso: ruta -> [archivo, profundidad].
+_LOCKS = {}
+
+
+def file_signature(path):
+    """Firma (mtime, tamaño) del archivo, o None si no existe."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_digest(data):
+    """Huella del contenido (bytes) de una instantánea."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def write_atomic(path, data):
+    """Escribe un JSON en un temporal sincronizado y lo mueve a `path`."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        # dumps usa el codificador en C; dump escribe pedazo por pedazo.
+        file.write(json.dumps(data, separators=(',', ':')))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def holds_lock(directory):
+    """Indica si este proceso tiene el candado de la carpeta."""
+    return os.path.join(directory, LOCK_NAME) in _LOCKS
+
+
+@contextlib.contextmanager
+def directory_lock(directory):
+    """Candado exclusivo entre procesos sobre una carpeta de datos.
+
+    Es reentrante dentro del mismo proceso. Al tomarlo se recupera el
+    diario que haya dejado una transacción interrumpida.
+    """
+    path = os.path.join(directory, LOCK_NAME)
+    entry = _LOCKS.get(path)
+    if entry is None:
+        os.makedirs(directory, exist_ok=True)
+        # El archivo queda abierto mientras se tiene el candado.
+        handle = open(  # pylint: disable=consider-using-with
+            path, 'a+', encoding='utf-8')
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        entry = _LOCKS[path] = [handle, 0]
+    entry[1] += 1
+    try:
+        if entry[1] == 1:
+            recover_journal(directory)
+        yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _LOCKS[path]
+            handle = entry[0]
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            handle.close()
+
+
+def recover_journal(directory):
+    """Reaplica el diario de una transacción interrumpida, si existe.
+
+    Las entradas del log son idempotentes (registro completo o borrado por
+    ID), así que repetir las que sí alcanzaron a escribirse no cambia el
+    resultado.
+    """
+    path = os.path.join(directory, JOURNAL_NAME)
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            operations = json.load(file)
+    except (json.JSONDecodeError, IOError) as error:
+        print(f"{RECOVERY_ERROR}: {error}")
+        operations = []
+    repositories = {}
+    for file_path, key, entry in operations:
+        repository = Repository.for_file(file_path, key, RECOVERY_ERROR,
+                                         RECOVERY_ERROR)
+        repositories.setdefault(id(repository), (repository, []))[1].append(
+            entry)
+    for repository, entries in repositories.values():
+        repository.redo(entries)
+    os.remove(path)
+
+
+class Repository:
+    """Colección de un archivo JSON cargada una vez e indexada por su ID.
+
+    Los registros se guardan en un diccionario {id: registro}, que conserva
+    el orden del archivo, así que buscar, agregar o eliminar por ID es O(1)
+    en lugar de volver a leer el archivo y recorrerlo. Antes de cada
+    operación se comparan la fecha de modificación y el tamaño de la
+    instantánea y del log con los de la última lectura; si otro proceso
+    los cambió, se vuelven a cargar.
+
+    Cada escritura en el log se vacía al sistema operativo de inmediato y
+    se sincroniza a disco (fsync) cada `sync_every` escrituras, al
+    compactar, al llamar a sync() y al terminar el programa.
+    """
+
+    _instances = {}
+
+    def __init__(self, file_path, key, read_error, write_error):
+        """Crea el repositorio; la carga se hace en el primer acceso."""
+        self.file_path = file_path
+        self.log_path = f"{file_path}.log"
+        self.key = key
+        self.read_error = read_error
+        self.write_error = write_error
+        self.sync_every = SYNC_EVERY
+        self.compact_min = COMPACT_MIN
+        self.records = {}
+        self._signature = None
+        self._log = None
+        self._log_entries = 0
+        self._unsynced = 0
+        self._log_offset = 0
+        self._pending = None
+        self._snapshot_digest = None
+
+    @property
+    def directory(self):
+        """Carpeta de datos de la colección (donde viven candado y diario)."""
+        return os.path.dirname(self.file_path)
+
+    @classmethod
+    def for_file(cls, file_path, key, read_error, write_error):
+        """Repositorio compartido del archivo; lo crea si no existe."""
+        path = os.path.abspath(file_path)
+        repository = cls._instances.get(path)
+        if repository is None or repository.key != key:
+            repository = cls(path, key, read_error, write_error)
+            cls._instances[path] = repository
+        return repository
+
+    @classmethod
+    def sync_all(cls):
+        """Sincroniza a disco el log de todos los repositorios abiertos."""
+        for repository in cls._instances.values():
+            repository.sync()
+
+    @classmethod
+    @contextlib.contextmanager
+    def transaction(cls, repositories):
+        """Bloque atómico de lecturas y escrituras sobre varios repositorios.
+
+        Toma el candado de sus carpetas (en orden, para no bloquearse con
+        otro proceso), recarga los repositorios y acumula los cambios del
+        bloque. Si el bloque termina bien se confirman todos juntos; si
+        lanza una excepción se descartan y los repositorios se recargan del
+        disco. Una transacción dentro de otra se une a la exterior.
+        """
+        repositories = list({id(r): r for r in repositories}.values())
+        if any(r.in_transaction for r in repositories):
+            yield
+            return
+        directories = sorted({r.directory for r in repositories})
+        with contextlib.ExitStack() as stack:
+            for directory in directories:
+                stack.enter_context(directory_lock(directory))
+            for repository in repositories:
+                repository.begin()
+            try:
+                yield
+            except BaseException:
+                for repository in repositories:
+                    repository.discard()
+                raise
+            operations = [(repository, entry) for repository in repositories
+                          for entry in repository.take_pending()]
+            cls._commit(operations, directories[0])
+
+    @staticmethod
+    def _commit(operations, directory):
+        """Escribe en los logs los cambios de una transacción.
+
+        Si tocan más de una colección, antes se guardan en el diario para
+        que una caída no deje aplicada solo una parte.
+        """
+        touched = {id(repository): repository
+                   for repository, _ in operations}
+        journal = os.path.join(directory, JOURNAL_NAME)
+        if len(touched) > 1:
+            write_atomic(journal, [[repository.file_path, repository.key,
+                                    entry]
+                                   for repository, entry in operations])
+        entries = {}
+        for repository, entry in operations:
+            entries.setdefault(id(repository), []).append(entry)
+        for repository in touched.values():
+            repository.write_committed(entries[id(repository)])
+        if len(touched) > 1:
+            os.remove(journal)
+
+    @property
+    def in_transaction(self):
+        """Indica si el repositorio acumula cambios de una transacción."""
+        return self._pending is not None
+
+    def begin(self):
+        """Recarga los datos y empieza a acumular los cambios.
+
+        Lo llama transaction() con el candado de la carpeta ya tomado.
+        """
+        self._refresh()
+        self._pending = []
+
+    def take_pending(self):
+        """Termina la transacción y devuelve los cambios acumulados."""
+        pending, self._pending = self._pending, None
+        return pending
+
+    def discard(self):
+        """Descarta los cambios acumulados; se recarga en el siguiente uso."""
+        self._pending = None
+        self._signature = None
+
+    def write_committed(self, entries):
+        """Escribe en el log los cambios confirmados y los sincroniza."""
+        self._append_all(entries)
+        self._unsynced = max(self._unsynced, 1)
+        self.sync()
+
+    def redo(self, entries):
+        """Reaplica las entradas de un diario interrumpido.
+
+        Se aplican también a los registros en memoria, así que una
+        compactación a la mitad no las pierde; al final se fuerza una
+        recarga desde el disco.
+        """
+        self._refresh()
+        for entry in entries:
+            self._apply_entry(entry)
+        self.write_committed(entries)
+        self._signature = None
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Candado de la carpeta con los datos recargados si cambiaron.
+
+        Dentro de una transacción el candado ya está tomado y los datos se
+        recargaron al empezar, así que no hay nada que revisar.
+        """
+        if self.in_transaction:
+            yield
+            return
+        with directory_lock(self.directory):
+            self._refresh()
+            yield
+
+    def _stat(self):
+        """Firmas de la instantánea y del log."""
+        return file_signature(self.file_path), file_signature(self.log_path)
+
+    def _refresh(self):
+        """Vuelve a cargar instantánea y log si cambiaron desde la lectura.
+
+        Si solo creció el log (otro proceso agregó cambios), se aplican
+        únicamente las líneas nuevas a partir de la última posición leída.
+        Si el log tiene algo que solo se puede resolver con el candado (una
+        línea incompleta o un log de otra instantánea), se toma y se vuelve
+        a cargar.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        snapshot, log = signature
+        if (self._signature is not None and self._log_offset
+                and snapshot == self._signature[0]
+                and log is not None and log[1] >= self._log_offset):
+            complete = self._replay(self._log_offset)
+        else:
+            self._close_log()
+            self.records = {}
+            self._snapshot_digest = None
+            self._log_entries = 0
+            self._log_offset = 0
+            if snapshot is not None:
+                try:
+                    self.records = self._load_snapshot()
+                except (ValueError, IOError) as error:
+                    print(f"{self.read_error}: {error}")
+            complete = log is None or self._replay()
+        # Sin el candado, otro proceso pudo escribir después de leer: se
+        # guarda la firma previa a la lectura para volver a revisar.
+        if not complete:
+            self._signature = None
+            with directory_lock(self.directory):
+                self._refresh()
+        elif holds_lock(self.directory):
+            self._mark_written()
+        else:
+            self._signature = signature
+
+    def _load_snapshot(self):
+        """Lee la instantánea, guarda su huella y devuelve sus registros."""
+        with open(self.file_path, 'rb') as file:
+            data = file.read()
+        self._snapshot_digest = snapshot_digest(data)
+        return {record.get(self.key): record for record in json.loads(data)}
+
+    def _replay(self, start=0):
+        """Aplica el log desde `start` y recorta lo que no sirva.
+
+        Solo se toca el archivo si este proceso tiene el candado; sin él,
+        una línea incompleta puede ser una escritura de otro proceso en
+        curso. Una cola incompleta se recorta; un log con cambios cuya
+        cabecera no es la de la instantánea cargada se aparta completo,
+        nunca se recorta.
+        Devuelve False si quedó sin resolver una parte que no se aplicó.
+        """
+        valid_end = start
+        stale = False
+        try:
+            with open(self.log_path, 'rb') as file:
+                file.seek(start)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        stale = valid_end == 0
+                        break
+                    if valid_end == 0:
+                        if (not isinstance(entry, dict) or entry.get(
+                                'snapshot') != self._snapshot_digest):
+                            # Un log con solo la cabecera no tiene datos.
+                            stale = bool(file.read(1))
+                            break
+                    else:
+                        self._apply(entry)
+                    valid_end += len(line)
+            self._log_offset = valid_end
+            if valid_end < file_signature(self.log_path)[1]:
+                if not holds_lock(self.directory):
+                    return False
+                if stale:
+                    self._set_aside_log()
+                else:
+                    os.truncate(self.log_path, valid_end)
+        except (IOError, TypeError, AttributeError) as error:
+            print(f"{self.read_error}: {error}")
+        return True
+
+    def _set_aside_log(self):
+        """Mueve un log que no es de la instantánea actual, sin borrarlo."""
+        stale_path = f"{self.log_path}.{time.time_ns()}.stale"
+        os.replace(self.log_path, stale_path)
+        print(f"{self.read_error}: el log no corresponde a "
+              f"{self.file_path}; se guardó como {stale_path}")
+
+    def _mark_written(self):
+        """Guarda la firma y el tamaño del log tras escribir."""
+        self._signature = self._stat()
+        log = self._signature[1]
+        self._log_offset = log[1] if log else 0
+
+    def _apply(self, entry):
+        """Aplica al diccionario una entrada leída del log."""
+        self._log_entries += 1
+        self._apply_entry(entry)
+
+    def _apply_entry(self, entry):
+        """Aplica al diccionario una entrada, sin contarla en el log."""
+        if 'put' in entry:
+            record = entry['put']
+            self.records[record.get(self.key)] = record
+        else:
+            self.records.pop(entry.get('del'), None)
+
+    def _append(self, entry):
+        """Agrega una entrada al log y compacta si ya es muy largo.
+
+        Dentro de una transacción la entrada solo se acumula hasta el final.
+        """
+        if self.in_transaction:
+            self._pending.append(entry)
+            return
+        self._append_all([entry])
+
+    def _append_all(self, entries):
+        """Agrega varias entradas al log con una sola escritura."""
+        try:
+            if self._log is None:
+                # El log queda abierto entre escrituras (ver _close_log).
+                self._log = open(  # pylint: disable=consider-using-with
+                    self.log_path, 'a', encoding='utf-8')
+                if self._log.tell() == 0:
+                    self._write_line({'snapshot': self._snapshot_digest})
+            self._log.write("".join(
+                json.dumps(entry, separators=(',', ':')) + "\n"
+                for entry in entries))
+            self._log.flush()
+        except IOError as error:
+            print(f"{self.write_error}: {error}")
+            self._close_log()
+            return
+        self._log_entries += len(entries)
+        self._unsynced += len(entries)
+        if self._log_entries > max(self.compact_min, len(self.records)):
+            self.compact()
+            return
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        self._mark_written()
+
+    def _write_line(self, entry):
+        """Escribe una línea JSON compacta en el log y la vacía al SO."""
+        self._log.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self._log.flush()
+
+    def _close_log(self):
+        """Sincroniza y cierra el log abierto para escritura, si lo hay."""
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
+
+    def sync(self):
+        """Fuerza a disco las escrituras pendientes del log."""
+        if self._log is not None and self._unsynced:
+            os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def compact(self):
+        """Reescribe la instantánea con la colección y vacía el log."""
+        temp_path = f"{self.file_path}.tmp"
+        try:
+            data = json.dumps(list(self.records.values()),
+                              indent=4).encode('utf-8')
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.file_path)
+            self._snapshot_digest = snapshot_digest(data)
+            self._close_log()
+            with open(self.log_path, 'w', encoding='utf-8') as log:
+                log.write(json.dumps(
+                    {'snapshot': self._snapshot_digest}) + "\n")
+                log.flush()
+                os.fsync(log.fileno())
+        except IOError as error:
+            print(f"{self.write_error}: {error}")
+        self._log_entries = 0
+        self._mark_written()
+
+    def all(self):
+        """Copia de todos los registros, en el orden del archivo."""
+        self._refresh()
+        return [dict(record) for record in self.records.values()]
+
+    def get(self, record_id):
+        """Copia del registro con ese ID, o None si no existe."""
+        self._refresh()
+        record = self.records.get(record_id)
+        return dict(record) if record is not None else None
+
+    def contains(self, record_id):
+        """Indica si existe un registro con ese ID."""
+        self._refresh()
+        return record_id in self.records
+
+    def find(self, field, value):
+        """Copias de los registros cuyo campo `field` vale `value`."""
+        self._refresh()
+        return [dict(record) for record in self.records.values()
+                if record.get(field) == value]
+
+    def insert(self, record):
+        """Agrega un registro nuevo y lo persiste en el log."""
+        with self._locked():
+            record = dict(record)
+            self.records[record[self.key]] = record
+            self._append({'put': dict(record)})
+
+    def update(self, record_id, changes):
+        """Actualiza los campos de un registro; False si no existe."""
+        with self._locked():
+            record = self.records.get(record_id)
+            if record is None:
+                return False
+            record.update(changes)
+            self._append({'put': dict(record)})
+        return True
+
+    def delete(self, record_id):
+        """Elimina un registro por su ID; False si no existe."""
+        with self._locked():
+            if self.records.pop(record_id, None) is None:
+                return False
+            self._append({'del': record_id})
+        return True
+
+    def replace_all(self, records):
+        """Reemplaza la colección completa y la guarda como instantánea."""
+        with directory_lock(self.directory):
+            self.records = {record.get(self.key): dict(record)
+                            for record in records}
+            self.compact()
+
+
+atexit.register(Repository.sync_all)
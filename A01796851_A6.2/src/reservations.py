@@ -1,13 +1,13 @@
 """Módulo para la gestión de reservaciones vinculando Hoteles y Clientes."""
 
-import json
-import os
 try:
     from src.hotel import Hotel
     from src.customer import Customer
+    from src.storage import open_repository, transaction
 except ImportError:
     from hotel import Hotel
     from customer import Customer
+    from storage import open_repository, transaction
 
 
 class Reservation:
@@ -21,67 +21,121 @@ class Reservation:
         self.customer_id = customer_id
         self.hotel_id = hotel_id
 
+    @classmethod
+    def repository(cls):
+        """Repositorio indexado por reservation_id de las reservaciones."""
+        return open_repository(cls.FILE_PATH, 'reservation_id',
+                               "Error al leer reservaciones",
+                               "Error al guardar reservaciones")
+
     @classmethod
     def load_reservations(cls):
         """Carga las reservaciones desde el archivo JSON."""
-        if not os.path.exists(cls.FILE_PATH):
-            return []
-        try:
-            with open(cls.FILE_PATH, 'r', encoding='utf-8') as file:
-                return json.load(file)
-        except (json.JSONDecodeError, IOError) as error:
-            print(f"Error al leer reservaciones: {error}")
-            return []
+        return cls.repository().all()
 
     @classmethod
     def save_reservations(cls, reservations):
         """Guarda la lista de reservaciones en el archivo JSON."""
-        try:
-            with open(cls.FILE_PATH, 'w', encoding='utf-8') as file:
-                json.dump(reservations, file, indent=4)
-        except IOError as error:
-            print(f"Error al guardar reservaciones: {error}")
+        cls.repository().replace_all(reservations)
+
+    @staticmethod
+    def _hotel_from_data(hotel_data):
+        """Instancia de Hotel con la disponibilidad guardada en el archivo."""
+        hotel = Hotel(
+            hotel_id=hotel_data['hotel_id'],
+            name=hotel_data['name'],
+            location=hotel_data['location'],
+            rooms=hotel_data['rooms']
+        )
+        # La disponibilidad se asigna después, no en el constructor
+        hotel.a_rooms = hotel_data.get('a_rooms', hotel_data['rooms'])
+        return hotel
+
+    @classmethod
+    def _repositories(cls):
+        """Repositorios que toca una reservación, para una transacción."""
+        return cls.repository(), Hotel.repository(), Customer.repository()
 
     @classmethod
     def create_reservation(cls, res_id, cust_id, hot_id):
-        """Crea una reservación validando cliente, hotel y disponibilidad."""
+        """Crea una reservación validando cliente, hotel y disponibilidad.
+
+        Las validaciones, el descuento de la habitación y el registro de la
+        reservación se hacen en una sola transacción entre procesos, así
+        que dos procesos no pueden vender la misma habitación.
+        """
+        with transaction(*cls._repositories()):
+            return cls._book(res_id, cust_id, hot_id)
+
+    @classmethod
+    def create_reservations(cls, batch):
+        """Crea varias reservaciones (res_id, cust_id, hot_id) de una vez.
+
+        Todo el lote se valida y se guarda en una sola transacción: la
+        disponibilidad de cada hotel se descuenta en memoria y se escribe
+        una vez por hotel al final. Devuelve una lista con True o False por
+        reservación, en el orden del lote; las que fallan no impiden las
+        demás.
+        """
+        with transaction(*cls._repositories()):
+            hotels = {}
+            results = [cls._book(res_id, cust_id, hot_id, hotels)
+                       for res_id, cust_id, hot_id in batch]
+            cls._save_availability(hotels)
+        return results
+
+    @classmethod
+    def _save_availability(cls, hotels):
+        """Guarda la disponibilidad de los hoteles modificados en un lote."""
+        for hotel_id, hotel in hotels.items():
+            Hotel.repository().update(hotel_id, {'a_rooms': hotel.a_rooms})
+
+    @classmethod
+    def _hotel(cls, hotel_id, hotels):
+        """Hotel del lote en curso, o uno nuevo leído del repositorio."""
+        if hotels is not None and hotel_id in hotels:
+            return hotels[hotel_id]
+        hotel_data = Hotel.repository().get(hotel_id)
+        if not hotel_data:
+            return None
+        hotel = cls._hotel_from_data(hotel_data)
+        if hotels is not None:
+            hotels[hotel_id] = hotel
+        return hotel
+
+    @classmethod
+    def _book(cls, res_id, cust_id, hot_id, hotels=None):
+        """Cuerpo de create_reservation, dentro de una transacción.
+
+        Con `hotels` (lote en curso) la disponibilidad solo se actualiza en
+        memoria; _save_availability la guarda al final.
+        """
+        reservations = cls.repository()
+        if reservations.contains(res_id):
+            print(f"Error: La reservación {res_id} ya existe.")
+            return False
+
         # 1. Validar que el cliente exista
-        customers = Customer.load_customers()
-        if not any(c['customer_id'] == cust_id for c in customers):
+        if not Customer.repository().contains(cust_id):
             print(f"Error: El Cliente {cust_id} no existe.")
             return False
 
         # 2. Validar que el hotel exista
-        hotels_data = Hotel.load_hotels()
-        hotel_data = next((h for h in hotels_data if h['hotel_id'] == hot_id),
-                          None)
-        if not hotel_data:
+        temp_hotel = cls._hotel(hot_id, hotels)
+        if not temp_hotel:
             print(f"Error: El Hotel {hot_id} no existe.")
             return False
 
         # 3. Validar disponibilidad y actualizar hotel
-        # Creamos una instancia temporal para usar su método reserve_room
-        temp_hotel = Hotel(
-            hotel_id=hotel_data['hotel_id'],
-            name=hotel_data['name'],
-            location=hotel_data['location'],
-            rooms=hotel_data['rooms']
-        )
-
-        # Asignamos manualmente la disponibilidad guardada
-        temp_hotel.a_rooms = hotel_data.get('a_rooms', hotel_data['rooms'])
-
         if temp_hotel.reserve_room():
-            # Actualizar el dato en la lista y guardar
-            hotel_data['a_rooms'] = temp_hotel.a_rooms
-            Hotel.save_hotels(hotels_data)
-            reservations = cls.load_reservations()
-            reservations.append({
+            if hotels is None:
+                Hotel.repository().update(hot_id,
+                                          {'a_rooms': temp_hotel.a_rooms})
+            reservations.insert({
                 'reservation_id': res_id,
                 'customer_id': cust_id,
                 'hotel_id': hot_id
             })
-            cls.save_reservations(reservations)
             print(
                 f"Reservación {res_id} creada exitosamente.")
             return True
@@ -91,35 +145,61 @@ class Reservation:
     @classmethod
     def cancel_reservation(cls, res_id):
         """Cancela una reservación y libera la habitación en el hotel."""
-        reservations = cls.load_reservations()
-        res_to_cancel = next((r for r in reservations
-                              if r['reservation_id'] == res_id),
-                             None)
+        with transaction(*cls._repositories()):
+            return cls._cancel(res_id)
+
+    @classmethod
+    def cancel_reservations(cls, ids):
+        """Cancela varias reservaciones de una vez.
+
+        Igual que create_reservations: una sola transacción, la
+        disponibilidad se libera en memoria y se guarda una vez por hotel.
+        Devuelve True o False por ID, en el mismo orden.
+        """
+        with transaction(*cls._repositories()):
+            hotels = {}
+            results = [cls._cancel(res_id, hotels) for res_id in ids]
+            cls._save_availability(hotels)
+        return results
+
+    @classmethod
+    def delete_with_reservations(cls, owner, key, owner_id):
+        """Elimina un cliente o un hotel junto con sus reservaciones.
+
+        `owner` es Customer o Hotel y `key` el campo de la reservación que
+        lo referencia. Las reservaciones se cancelan primero (devolviendo
+        sus habitaciones) y todo ocurre en una sola transacción, así que
+        ambos backends quedan igual. Devuelve False si no existe.
+        """
+        with transaction(*cls._repositories()):
+            if not owner.repository().contains(owner_id):
+                return False
+            hotels = {}
+            for reservation in cls.repository().find(key, owner_id):
+                cls._cancel(reservation['reservation_id'], hotels)
+            cls._save_availability(hotels)
+            return owner.repository().delete(owner_id)
+
+    @classmethod
+    def _cancel(cls, res_id, hotels=None):
+        """Cuerpo de cancel_reservation, dentro de una transacción."""
+        reservations = cls.repository()
+        res_to_cancel = reservations.get(res_id)
 
         if not res_to_cancel:
             print(f"Error: No se encontró la reservación {res_id}.")
             return False
 
         # 1. Liberar la habitación en el hotel correspondiente
-        hotels_data = Hotel.load_hotels()
-        hotel_data = next((h for h in hotels_data
-                           if h['hotel_id'] == res_to_cancel['hotel_id']),
-                          None)
-
-        if hotel_data:
-            temp_hotel = Hotel(
-                hotel_data['hotel_id'],
-                hotel_data['name'],
-                hotel_data['location'],
-                hotel_data['rooms'],
-            )
-            # La disponibilidad se asigna después, no en el constructor
-            temp_hotel.a_rooms = hotel_data.get('a_rooms', hotel_data['rooms'])
-            temp_hotel.cancel_reservation()
+        hotel_id = res_to_cancel['hotel_id']
+        temp_hotel = cls._hotel(hotel_id, hotels)
+
+        if temp_hotel:
+            if temp_hotel.cancel_reservation() and hotels is None:
+                Hotel.repository().update(hotel_id,
+                                          {'a_rooms': temp_hotel.a_rooms})
 
         # 2. Eliminar del archivo de reservaciones
-        updated_res = [r for r in reservations
-                       if r['reservation_id'] != res_id]
-        cls.save_reservations(updated_res)
+        reservations.delete(res_id)
         print(f"Reservación {res_id} cancelada.")
         return True
@@ -0,0 +1,287 @@
+"""Repositorio respaldado por SQLite para el sistema de reservaciones.
+
+Ofrece la misma interfaz que Repository (all, get, contains, find,
+insert, update, delete, replace_all), pero cada colección es una tabla
+de una base de datos SQLite local con llave primaria por ID, llaves
+foráneas de reservaciones hacia clientes y hoteles, índices por hotel_id
+y customer_id, y el diario en modo WAL. Las llaves foráneas usan ON
+DELETE RESTRICT: SQLite rechaza borrar un cliente o un hotel con
+reservaciones, y Reservation.delete_with_reservations las cancela antes,
+igual que con el backend JSON.
+
+transaction() agrupa varias operaciones en una transacción BEGIN
+IMMEDIATE: SQLite toma el candado de escritura al inicio, así que dos
+procesos no pueden leer la misma disponibilidad y reservar ambos. Dentro
+de ella, replace_all usa un SAVEPOINT en lugar de confirmar por su cuenta.
+"""
+
+import contextlib
+import os
+import sqlite3
+
+BUSY_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id PRIMARY KEY,
+    name TEXT,
+    location TEXT,
+    rooms INTEGER,
+    a_rooms INTEGER
+);
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id PRIMARY KEY,
+    name TEXT,
+    email TEXT
+);
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id PRIMARY KEY,
+    customer_id NOT NULL
+        REFERENCES customers (customer_id) ON DELETE RESTRICT,
+    hotel_id NOT NULL
+        REFERENCES hotels (hotel_id) ON DELETE RESTRICT
+);
+CREATE INDEX IF NOT EXISTS reservations_hotel ON reservations (hotel_id);
+CREATE INDEX IF NOT EXISTS reservations_customer
+    ON reservations (customer_id);
+"""
+
+# Columnas de cada tabla; la primera es la llave primaria.
+COLUMNS = {
+    'hotels': ('hotel_id', 'name', 'location', 'rooms', 'a_rooms'),
+    'customers': ('customer_id', 'name', 'email'),
+    'reservations': ('reservation_id', 'customer_id', 'hotel_id'),
+}
+
+
+def select_statement(table):
+    """SELECT de todas las columnas de `table`."""
+    return f"SELECT {', '.join(COLUMNS[table])} FROM {table}"
+
+
+def upsert_statement(table):
+    """INSERT que agrega un registro de `table` o actualiza el existente."""
+    key, *fields = COLUMNS[table]
+    names = ", ".join(COLUMNS[table])
+    marks = ", ".join("?" for _ in COLUMNS[table])
+    updates = ", ".join(f"{field} = excluded.{field}" for field in fields)
+    return (f"INSERT INTO {table} ({names}) VALUES ({marks}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}")
+
+
+SELECT = {table: select_statement(table) for table in COLUMNS}
+UPSERT = {table: upsert_statement(table) for table in COLUMNS}
+
+
+@contextlib.contextmanager
+def atomic(connection):
+    """Bloque atómico que respeta la transacción abierta, si la hay.
+
+    Sin transacción abierta se abre una propia que se confirma al final.
+    Dentro de una (por ejemplo, la de SQLiteRepository.transaction) se usa
+    un SAVEPOINT: si el bloque falla se deshacen solo sus cambios y la
+    transacción exterior no se confirma ni se deshace.
+    """
+    if not connection.in_transaction:
+        with connection:
+            yield
+        return
+    connection.execute("SAVEPOINT atomic_block")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK TO atomic_block")
+        raise
+    finally:
+        connection.execute("RELEASE atomic_block")
+
+
+class SQLiteRepository:
+    """Colección guardada en una tabla SQLite, con la interfaz de Repository.
+
+    Las columnas de ID no declaran tipo, así que conservan el tipo con el
+    que se guardaron (int o str), igual que en los archivos JSON. Las
+    columnas vacías (NULL) se omiten del registro devuelto, como las
+    llaves ausentes del JSON (por ejemplo, a_rooms antes de la primera
+    reservación). Un registro con campos que no tienen columna se rechaza
+    con ValueError en lugar de perder esos campos.
+    """
+
+    _connections = {}
+    _transactions = set()
+
+    def __init__(self, database, table, read_error, write_error):
+        """Crea el repositorio de `table` en la base de datos `database`."""
+        if table not in COLUMNS:
+            raise ValueError(f"No hay una tabla SQLite para '{table}'.")
+        self.path = os.path.abspath(database)
+        self.table = table
+        self.columns = COLUMNS[table]
+        self.key = self.columns[0]
+        self.read_error = read_error
+        self.write_error = write_error
+
+    @classmethod
+    def connection(cls, database):
+        """Conexión compartida a la base de datos, con el esquema creado."""
+        path = os.path.abspath(database)
+        connection = cls._connections.get(path)
+        if connection is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+            cls._connections[path] = connection
+        return connection
+
+    @classmethod
+    @contextlib.contextmanager
+    def transaction(cls, repositories):
+        """Bloque atómico sobre la base de datos de los repositorios.
+
+        Una transacción dentro de otra se une a la exterior.
+        """
+        path = repositories[0].path
+        if path in cls._transactions:
+            yield
+            return
+        connection = cls.connection(path)
+        connection.execute("BEGIN IMMEDIATE")
+        cls._transactions.add(path)
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        else:
+            connection.commit()
+        finally:
+            cls._transactions.discard(path)
+
+    @classmethod
+    def close_all(cls):
+        """Cierra todas las conexiones abiertas."""
+        for connection in cls._connections.values():
+            connection.close()
+        cls._connections.clear()
+
+    def _check_fields(self, fields):
+        """Lanza ValueError si algún campo no tiene columna en la tabla."""
+        unknown = set(fields).difference(self.columns)
+        if unknown:
+            names = ", ".join(sorted(map(str, unknown)))
+            raise ValueError(
+                f"La tabla '{self.table}' no tiene columnas para: {names}.")
+
+    def _row(self, record):
+        """Valores del registro en el orden de las columnas."""
+        self._check_fields(record)
+        return tuple(record.get(column) for column in self.columns)
+
+    def _record(self, row):
+        """Registro (dict) de una fila, sin las columnas vacías."""
+        return {column: value for column, value in zip(self.columns, row)
+                if value is not None}
+
+    def _write(self, statement, parameters=()):
+        """Ejecuta una escritura en su propia transacción.
+
+        Devuelve el número de filas afectadas, o None si SQLite la rechazó
+        (por ejemplo, una reservación con un hotel que no existe).
+        """
+        connection = self.connection(self.path)
+        try:
+            if self.path in self._transactions:
+                return connection.execute(statement, parameters).rowcount
+            with connection:
+                return connection.execute(statement, parameters).rowcount
+        except sqlite3.Error as error:
+            print(f"{self.write_error}: {error}")
+            return None
+
+    def all(self):
+        """Todos los registros, en el orden en que se insertaron."""
+        rows = self.connection(self.path).execute(
+            f"{SELECT[self.table]} ORDER BY rowid")
+        return [self._record(row) for row in rows]
+
+    def get(self, record_id):
+        """Registro con ese ID, o None si no existe."""
+        row = self.connection(self.path).execute(
+            f"{SELECT[self.table]} WHERE {self.key} = ?",
+            (record_id,)).fetchone()
+        return self._record(row) if row is not None else None
+
+    def contains(self, record_id):
+        """Indica si existe un registro con ese ID."""
+        return self.connection(self.path).execute(
+            f"SELECT 1 FROM {self.table} WHERE {self.key} = ?",
+            (record_id,)).fetchone() is not None
+
+    def find(self, field, value):
+        """Registros cuyo campo `field` vale `value`, en orden de inserción."""
+        if field not in self.columns:
+            return []
+        rows = self.connection(self.path).execute(
+            f"{SELECT[self.table]} WHERE {field} = ? ORDER BY rowid", (value,))
+        return [self._record(row) for row in rows]
+
+    def insert(self, record):
+        """Agrega (o reemplaza) un registro."""
+        self._write(UPSERT[self.table], self._row(record))
+
+    def update(self, record_id, changes):
+        """Actualiza los campos de un registro; False si no existe.
+
+        El ID no cambia: si `changes` lo incluye, se ignora.
+        """
+        self._check_fields(changes)
+        changes = {column: value for column, value in changes.items()
+                   if column != self.key}
+        if not changes:
+            return self.contains(record_id)
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        return bool(self._write(
+            f"UPDATE {self.table} SET {assignments} WHERE {self.key} = ?",
+            (*changes.values(), record_id)))
+
+    def delete(self, record_id):
+        """Elimina un registro por su ID; False si no existe."""
+        return bool(self._write(
+            f"DELETE FROM {self.table} WHERE {self.key} = ?", (record_id,)))
+
+    def replace_all(self, records):
+        """Reemplaza la tabla completa en una sola transacción.
+
+        Los registros que siguen se actualizan en su lugar (upsert) y solo
+        se borran los que ya no están, así que guardar la misma lista no
+        toca las reservaciones que dependen de ellos. Si alguno que se
+        borra todavía tiene reservaciones, SQLite rechaza el cambio. Dentro
+        de transaction() el cambio se une a esa transacción (ver atomic).
+        """
+        connection = self.connection(self.path)
+        records = [self._row(record) for record in records]
+        try:
+            with atomic(connection):
+                connection.executemany(UPSERT[self.table], records)
+                connection.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS kept (id PRIMARY KEY)")
+                connection.execute("DELETE FROM kept")
+                connection.executemany(
+                    "INSERT OR IGNORE INTO kept VALUES (?)",
+                    ((row[0],) for row in records))
+                connection.execute(
+                    f"DELETE FROM {self.table} WHERE {self.key} "
+                    f"NOT IN (SELECT id FROM kept)")
+        except sqlite3.Error as error:
+            print(f"{self.write_error}: {error}")
+
+    def sync(self):
+        """Las escrituras se confirman al momento; no hay nada pendiente."""
+
+    def compact(self):
+        """Vuelca el WAL a la base de datos y lo recorta."""
+        self.connection(self.path).execute(
+            "PRAGMA wal_checkpoint(TRUNCATE)")
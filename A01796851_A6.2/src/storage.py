@@ -0,0 +1,93 @@
+"""Selección del almacenamiento del sistema de reservaciones.
+
+El backend se elige con la variable de entorno RESERVATIONS_BACKEND
+('json', por defecto, o 'sqlite') o llamando a configure(). Con 'json'
+cada colección vive en su archivo FILE_PATH (instantánea más log, ver
+repository.py); con 'sqlite' las tres colecciones son tablas de la base
+de datos RESERVATIONS_DB (por defecto data/reservations.db).
+"""
+
+import contextlib
+import os
+try:
+    from src.repository import Repository
+    from src.sqlite_repository import SQLiteRepository
+except ImportError:
+    from repository import Repository
+    from sqlite_repository import SQLiteRepository
+
+BACKENDS = ('json', 'sqlite')
+BACKEND = os.environ.get('RESERVATIONS_BACKEND', 'json')
+DATABASE = os.environ.get('RESERVATIONS_DB', 'data/reservations.db')
+
+# Repositorios SQLite ya creados, por (base de datos, tabla).
+_SQLITE_REPOSITORIES = {}
+
+
+def configure(backend=None, database=None):
+    """Cambia el backend y, para SQLite, la ruta de la base de datos."""
+    global BACKEND, DATABASE  # pylint: disable=global-statement
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: '{backend}'.")
+        BACKEND = backend
+    if database is not None:
+        DATABASE = database
+
+
+def open_repository(file_path, key, read_error, write_error):
+    """Repositorio de la colección de `file_path` con el backend configurado.
+
+    Con SQLite la tabla se elige por el nombre del archivo (hotels.json ->
+    hotels).
+    """
+    if BACKEND == 'sqlite':
+        table = os.path.splitext(os.path.basename(file_path))[0]
+        path = os.path.abspath(DATABASE)
+        repository = _SQLITE_REPOSITORIES.get((path, table))
+        if repository is None:
+            repository = SQLiteRepository(path, table, read_error,
+                                          write_error)
+            _SQLITE_REPOSITORIES[path, table] = repository
+        return repository
+    return Repository.for_file(file_path, key, read_error, write_error)
+
+
+@contextlib.contextmanager
+def transaction(*repositories):
+    """Bloque atómico y exclusivo entre procesos sobre varios repositorios.
+
+    Todos deben ser del mismo backend (el configurado). Ver
+    Repository.transaction y SQLiteRepository.transaction.
+    """
+    with type(repositories[0]).transaction(repositories):
+        yield
+
+
+def import_json(hotels_path, customers_path, reservations_path,
+                database=None):
+    """Copia las colecciones JSON (instantánea más log) a SQLite.
+
+    Las reservaciones cuyo cliente u hotel no existe se omiten. Devuelve
+    un diccionario con los registros importados y omitidos.
+    """
+    database = database or DATABASE
+    messages = ("Error al leer datos", "Error al guardar datos")
+    hotels = Repository.for_file(hotels_path, 'hotel_id', *messages).all()
+    customers = Repository.for_file(customers_path, 'customer_id',
+                                    *messages).all()
+    reservations = Repository.for_file(reservations_path, 'reservation_id',
+                                       *messages).all()
+    hotel_ids = {hotel.get('hotel_id') for hotel in hotels}
+    customer_ids = {customer.get('customer_id') for customer in customers}
+    valid = [reservation for reservation in reservations
+             if reservation.get('hotel_id') in hotel_ids
+             and reservation.get('customer_id') in customer_ids]
+
+    SQLiteRepository(database, 'reservations', *messages).replace_all([])
+    SQLiteRepository(database, 'hotels', *messages).replace_all(hotels)
+    SQLiteRepository(database, 'customers', *messages).replace_all(customers)
+    SQLiteRepository(database, 'reservations', *messages).replace_all(valid)
+    return {'hotels': len(hotels), 'customers': len(customers),
+            'reservations': len(valid),
+            'omitted': len(reservations) - len(valid)}
@@ -1,10 +1,20 @@
 """Pruebas unitarias para el sistema de reservaciones."""
 
+import contextlib
+import io
+import json
+import multiprocessing
+import shutil
+import tempfile
 import unittest
 import os
+from unittest import mock
 from src.hotel import Hotel
 from src.customer import Customer
 from src.reservations import Reservation
+from src.repository import Repository
+from src.sqlite_repository import SQLiteRepository
+from src import storage
 
 
 class TestReservationSystem(unittest.TestCase):
@@ -17,9 +27,9 @@ class TestReservationSystem(unittest.TestCase):
             os.makedirs('data')
 
         # Limpiar archivos de datos
+        Reservation.save_reservations([])
         Hotel.save_hotels([])
         Customer.save_customers([])
-        Reservation.save_reservations([])
 
     def test_hotel_creation_and_modification(self):
         """Prueba la creación y modificación de un hotel."""
@@ -182,5 +192,439 @@ class TestReservationSystem(unittest.TestCase):
         self.assertEqual(res, [])
 
 
+def book_rooms(folder, backend, database, first_id, count):
+    """Proceso de la prueba de estrés: intenta `count` reservaciones."""
+    storage.configure(backend, database)
+    Hotel.FILE_PATH = os.path.join(folder, 'hotels.json')
+    Customer.FILE_PATH = os.path.join(folder, 'customers.json')
+    Reservation.FILE_PATH = os.path.join(folder, 'reservations.json')
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sum(Reservation.create_reservation(res_id, 1, 1)
+                   for res_id in range(first_id, first_id + count))
+
+
+class TestConcurrentBooking(unittest.TestCase):
+    """Prueba de estrés: varios procesos reservan el mismo hotel a la vez."""
+
+    WORKERS = 4
+    ATTEMPTS = 60
+    ROOMS = 100
+
+    def setUp(self):
+        """Crea los datos en una carpeta temporal."""
+        self.backend, self.database = storage.BACKEND, storage.DATABASE
+        self.paths = (Hotel.FILE_PATH, Customer.FILE_PATH,
+                      Reservation.FILE_PATH)
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Restaura rutas y configuración y borra la carpeta temporal."""
+        (Hotel.FILE_PATH, Customer.FILE_PATH,
+         Reservation.FILE_PATH) = self.paths
+        storage.configure(self.backend, self.database)
+        SQLiteRepository.close_all()
+        shutil.rmtree(self.folder)
+
+    def run_stress(self, backend):
+        """Reserva desde varios procesos y verifica que no se sobrevenda."""
+        database = os.path.join(self.folder, 'stress.db')
+        book_rooms(self.folder, backend, database, 0, 0)
+        Hotel.create_hotel(1, "Plaza", "Cancun", self.ROOMS)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        SQLiteRepository.close_all()
+        jobs = [(self.folder, backend, database, worker * self.ATTEMPTS,
+                 self.ATTEMPTS) for worker in range(self.WORKERS)]
+        with multiprocessing.Pool(self.WORKERS) as pool:
+            booked = sum(pool.starmap(book_rooms, jobs))
+
+        self.assertEqual(booked, self.ROOMS)
+        reservations = Reservation.load_reservations()
+        self.assertEqual(len(reservations), self.ROOMS)
+        self.assertEqual(len({r['reservation_id'] for r in reservations}),
+                         self.ROOMS)
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 0)
+
+    def test_json_backend(self):
+        """Sin sobreventa con el backend JSON (candado de carpeta)."""
+        self.run_stress('json')
+
+    def test_sqlite_backend(self):
+        """Sin sobreventa con el backend SQLite (BEGIN IMMEDIATE)."""
+        self.run_stress('sqlite')
+
+    def test_interrupted_transaction_is_recovered(self):
+        """El diario de una transacción interrumpida se aplica completo."""
+        self.recover_journal()
+
+    def test_recovery_survives_compaction(self):
+        """Compactar al reaplicar el diario no pierde sus entradas."""
+        with mock.patch('src.repository.COMPACT_MIN', 0):
+            self.recover_journal()
+
+    def recover_journal(self):
+        """Deja un diario a medias y reserva: se aplica antes de reservar."""
+        book_rooms(self.folder, 'json', None, 0, 0)
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        hotel = dict(Hotel.load_hotels()[0], a_rooms=4)
+        journal = [
+            [os.path.abspath(Hotel.FILE_PATH), 'hotel_id', {'put': hotel}],
+            [os.path.abspath(Reservation.FILE_PATH), 'reservation_id',
+             {'put': {'reservation_id': 7, 'customer_id': 1,
+                      'hotel_id': 1}}],
+        ]
+        with open(os.path.join(self.folder, '.journal'), 'w',
+                  encoding='utf-8') as file:
+            json.dump(journal, file)
+        self.assertTrue(Reservation.create_reservation(8, 1, 1))
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 3)
+        self.assertEqual(len(Reservation.load_reservations()), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.folder,
+                                                     '.journal')))
+
+
+class TestBackendParity(unittest.TestCase):
+    """El mismo escenario deja los mismos datos con JSON y con SQLite."""
+
+    def setUp(self):
+        """Guarda rutas y configuración y crea una carpeta temporal."""
+        self.backend, self.database = storage.BACKEND, storage.DATABASE
+        self.paths = (Hotel.FILE_PATH, Customer.FILE_PATH,
+                      Reservation.FILE_PATH)
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Restaura rutas y configuración y borra la carpeta temporal."""
+        (Hotel.FILE_PATH, Customer.FILE_PATH,
+         Reservation.FILE_PATH) = self.paths
+        storage.configure(self.backend, self.database)
+        SQLiteRepository.close_all()
+        shutil.rmtree(self.folder)
+
+    def run_scenario(self, backend):
+        """Guarda, borra un cliente y un hotel; devuelve lo que quedó."""
+        folder = os.path.join(self.folder, backend)
+        storage.configure(backend, os.path.join(folder, 'test.db'))
+        Hotel.FILE_PATH = os.path.join(folder, 'hotels.json')
+        Customer.FILE_PATH = os.path.join(folder, 'customers.json')
+        Reservation.FILE_PATH = os.path.join(folder, 'reservations.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+            Hotel.create_hotel(2, "Sol", "Tulum", 3)
+            Customer.create_customer(1, "Kenji", "k@mail.com")
+            Customer.create_customer(2, "Ana", "ana@mail.com")
+            Reservation.create_reservations(
+                [(10, 1, 1), (11, 1, 1), (12, 2, 2), (13, 2, 1)])
+            Hotel.save_hotels(Hotel.load_hotels())
+            Customer.save_customers(Customer.load_customers())
+            saved = Reservation.load_reservations()
+            deleted = (Customer.delete_customer(1), Hotel.delete_hotel(2))
+        return (saved, deleted, Hotel.load_hotels(),
+                Customer.load_customers(), Reservation.load_reservations())
+
+    def test_save_and_delete_match(self):
+        """save_* no pierde reservaciones y borrar libera habitaciones."""
+        json_result = self.run_scenario('json')
+        sqlite_result = self.run_scenario('sqlite')
+        self.assertEqual(json_result, sqlite_result)
+        saved, deleted, hotels, customers, reservations = json_result
+        self.assertEqual(len(saved), 4)
+        self.assertEqual(deleted, (True, True))
+        self.assertEqual([(h['hotel_id'], h['a_rooms']) for h in hotels],
+                         [(1, 4)])
+        self.assertEqual([c['customer_id'] for c in customers], [2])
+        self.assertEqual([r['reservation_id'] for r in reservations], [13])
+
+
+class TestRepository(unittest.TestCase):
+    """Casos de prueba para el repositorio indexado en memoria."""
+
+    def setUp(self):
+        """Configura un estado limpio antes de cada prueba."""
+        self.backend = storage.BACKEND
+        storage.configure(backend='json')
+        if not os.path.exists('data'):
+            os.makedirs('data')
+        Reservation.save_reservations([])
+        Hotel.save_hotels([])
+        Customer.save_customers([])
+
+    def tearDown(self):
+        """Restaura el backend y borra los logs apartados."""
+        storage.configure(backend=self.backend)
+        for name in os.listdir('data'):
+            if name.endswith('.stale'):
+                os.remove(os.path.join('data', name))
+
+    def test_operations_do_not_reparse_file(self):
+        """Las operaciones por ID usan el índice sin volver a leer el JSON."""
+        with mock.patch.object(Repository, '_load_snapshot', autospec=True,
+                               side_effect=Repository._load_snapshot
+                               ) as json_load:
+            Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+            Customer.create_customer(1, "Kenji", "k@mail.com")
+            for res_id in range(3):
+                Reservation.create_reservation(res_id, 1, 1)
+            Reservation.cancel_reservation(0)
+        self.assertEqual(json_load.call_count, 0)
+        self.assertEqual(len(Reservation.load_reservations()), 2)
+
+    def test_reloads_when_file_changes(self):
+        """Un cambio externo al archivo invalida el índice en memoria."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        self.assertIsNotNone(Hotel.repository().get(1))
+        with open(Hotel.FILE_PATH, 'w', encoding='utf-8') as file:
+            json.dump([{'hotel_id': 2, 'name': "Otro", 'location': "Loc",
+                        'rooms': 3}], file)
+        self.assertIsNone(Hotel.repository().get(1))
+        self.assertEqual(Hotel.load_hotels()[0]['hotel_id'], 2)
+
+    def test_loaded_records_are_copies(self):
+        """Modificar lo que devuelve load_* no altera el repositorio."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Hotel.load_hotels()[0]['name'] = "Cambiado"
+        self.assertEqual(Hotel.load_hotels()[0]['name'], "Plaza")
+
+    def test_cancel_restores_availability(self):
+        """Cancelar una reservación devuelve la habitación al hotel."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 1)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservation(10, 1, 1)
+        Reservation.cancel_reservation(10)
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 1)
+        self.assertTrue(Reservation.create_reservation(11, 1, 1))
+
+    def test_duplicate_reservation_id(self):
+        """Un ID de reservación repetido se rechaza sin ocupar habitación."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        self.assertTrue(Reservation.create_reservation(10, 1, 1))
+        self.assertFalse(Reservation.create_reservation(10, 1, 1))
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 4)
+
+    def test_changes_go_to_log(self):
+        """Un cambio se agrega al log sin reescribir la instantánea."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        with open(Hotel.FILE_PATH, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file), [])
+        Repository.sync_all()
+        Repository._instances.clear()  # pylint: disable=protected-access
+        self.assertEqual(Hotel.load_hotels()[0]['name'], "Plaza")
+
+    def test_torn_log_line_is_ignored(self):
+        """Una línea incompleta al final del log se descarta al cargar."""
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        with open(Customer.FILE_PATH + '.log', 'a', encoding='utf-8') as log:
+            log.write('{"put":{"customer_id":2,"na')
+        Repository._instances.clear()  # pylint: disable=protected-access
+        self.assertEqual(len(Customer.load_customers()), 1)
+        Customer.create_customer(3, "Ana", "ana@mail.com")
+        Repository._instances.clear()  # pylint: disable=protected-access
+        ids = [c['customer_id'] for c in Customer.load_customers()]
+        self.assertEqual(ids, [1, 3])
+
+    def test_touched_snapshot_keeps_log(self):
+        """Cambiar solo la fecha de la instantánea no pierde el log."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservation(10, 1, 1)
+        for path in (Hotel.FILE_PATH, Reservation.FILE_PATH):
+            os.utime(path, ns=(1, 1))
+        Repository._instances.clear()  # pylint: disable=protected-access
+        self.assertTrue(Reservation.create_reservation(11, 1, 1))
+        self.assertEqual(len(Reservation.load_reservations()), 2)
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 3)
+
+    def test_stale_log_is_set_aside(self):
+        """Un log de otra instantánea no se aplica ni se borra."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        with open(Hotel.FILE_PATH, 'w', encoding='utf-8') as file:
+            json.dump([{'hotel_id': 2, 'name': "Otro", 'location': "Loc",
+                        'rooms': 3}], file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            Hotel.create_hotel(3, "Sol", "Tulum", 4)
+        self.assertEqual([h['hotel_id'] for h in Hotel.load_hotels()],
+                         [2, 3])
+        folder = os.path.dirname(Hotel.FILE_PATH)
+        stale = [name for name in os.listdir(folder)
+                 if name.startswith('hotels.json.log.')]
+        self.assertEqual(len(stale), 1)
+        with open(os.path.join(folder, stale[0]), 'r',
+                  encoding='utf-8') as log:
+            self.assertIn('"Plaza"', log.read())
+
+    def test_log_is_compacted(self):
+        """Al crecer el log se vuelca a la instantánea y se vacía."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        hotel = Hotel(1, "Plaza", "Cancun", 5)
+        with mock.patch.object(Hotel.repository(), 'compact_min', 5):
+            for number in range(5):
+                hotel.modify_hotel(name=f"Plaza {number}")
+        with open(Hotel.FILE_PATH, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file)[0]['name'], "Plaza 4")
+        with open(Hotel.FILE_PATH + '.log', 'r', encoding='utf-8') as log:
+            self.assertEqual(len(log.readlines()), 1)
+
+    def test_batch_booking(self):
+        """Un lote devuelve un resultado por reservación y escribe una vez."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 2)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Repository.sync_all()
+        batch = [(10, 1, 1), (10, 1, 1), (11, 9, 1), (12, 1, 9),
+                 (13, 1, 1), (14, 1, 1)]
+        with mock.patch('src.repository.os.fsync') as fsync:
+            results = Reservation.create_reservations(batch)
+        self.assertEqual(results, [True, False, False, False, True, False])
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 0)
+        self.assertEqual([r['reservation_id']
+                          for r in Reservation.load_reservations()], [10, 13])
+        # Un solo cambio de disponibilidad en el log del hotel.
+        with open(Hotel.FILE_PATH + '.log', 'r', encoding='utf-8') as log:
+            self.assertEqual(len(log.readlines()), 3)
+        self.assertLessEqual(fsync.call_count, 3)
+
+    def test_batch_cancellation(self):
+        """Cancelar en lote libera las habitaciones de cada hotel."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 3)
+        Hotel.create_hotel(2, "Sol", "Tulum", 3)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservations(
+            [(10, 1, 1), (11, 1, 1), (12, 1, 2)])
+        results = Reservation.cancel_reservations([10, 99, 12, 10])
+        self.assertEqual(results, [True, False, True, False])
+        self.assertEqual([h['a_rooms'] for h in Hotel.load_hotels()], [2, 3])
+        self.assertEqual([r['reservation_id']
+                          for r in Reservation.load_reservations()], [11])
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    """Casos de prueba para el backend de SQLite."""
+
+    def setUp(self):
+        """Usa una base de datos SQLite nueva en una carpeta temporal."""
+        self.backend, self.database = storage.BACKEND, storage.DATABASE
+        self.folder = tempfile.mkdtemp()
+        storage.configure('sqlite', os.path.join(self.folder, 'test.db'))
+
+    def tearDown(self):
+        """Cierra la base de datos y restaura la configuración."""
+        SQLiteRepository.close_all()
+        storage.configure(self.backend, self.database)
+        shutil.rmtree(self.folder)
+
+    def test_reservation_flow(self):
+        """Reservar y cancelar actualizan la disponibilidad en SQLite."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 1)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        self.assertTrue(Reservation.create_reservation(500, 1, 1))
+        self.assertFalse(Reservation.create_reservation(501, 1, 1))
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 0)
+        self.assertTrue(Reservation.cancel_reservation(500))
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 1)
+        self.assertEqual(Reservation.load_reservations(), [])
+
+    def test_batch_booking(self):
+        """Reservar y cancelar en lote con SQLite."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 2)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        results = Reservation.create_reservations(
+            [(500, 1, 1), (500, 1, 1), (501, 1, 1), (502, 1, 1)])
+        self.assertEqual(results, [True, False, True, False])
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 0)
+        self.assertEqual(Reservation.cancel_reservations([501, 503]),
+                         [True, False])
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 1)
+
+    def test_schema(self):
+        """La base usa WAL, llaves foráneas e índices por hotel y cliente."""
+        connection = SQLiteRepository.connection(storage.DATABASE)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+        indexes = {row[1] for row in connection.execute(
+            "PRAGMA index_list(reservations)")}
+        self.assertIn('reservations_hotel', indexes)
+        self.assertIn('reservations_customer', indexes)
+        Reservation.repository().insert(
+            {'reservation_id': 1, 'customer_id': 9, 'hotel_id': 9})
+        self.assertEqual(Reservation.load_reservations(), [])
+
+    def test_delete_customer_releases_rooms(self):
+        """Borrar un cliente cancela sus reservaciones y libera los cuartos."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservation(500, 1, 1)
+        self.assertTrue(Customer.delete_customer(1))
+        self.assertEqual(Reservation.load_reservations(), [])
+        self.assertEqual(Hotel.load_hotels()[0]['a_rooms'], 5)
+
+    def test_foreign_keys_restrict_delete(self):
+        """SQLite no borra en cascada un hotel con reservaciones."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservation(500, 1, 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(Hotel.repository().delete(1))
+        self.assertEqual(len(Reservation.load_reservations()), 1)
+
+    def test_replace_all_joins_transaction(self):
+        """replace_all dentro de transaction() no confirma por su cuenta."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        hotels = Hotel.repository()
+        with self.assertRaises(RuntimeError):
+            with storage.transaction(hotels):
+                hotels.replace_all([])
+                self.assertEqual(hotels.all(), [])
+                raise RuntimeError("falla a la mitad")
+        self.assertEqual([h['hotel_id'] for h in Hotel.load_hotels()], [1])
+
+        Customer.create_customer(1, "Kenji", "k@mail.com")
+        Reservation.create_reservation(500, 1, 1)
+        with storage.transaction(hotels):
+            Hotel.create_hotel(2, "Sol", "Merida", 3)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                hotels.replace_all([])
+            self.assertIn("FOREIGN KEY", output.getvalue())
+        self.assertEqual([h['hotel_id'] for h in Hotel.load_hotels()],
+                         [1, 2])
+
+    def test_unknown_fields_are_rejected(self):
+        """Un campo sin columna lanza ValueError y no se guarda nada."""
+        Hotel.create_hotel(1, "Plaza", "Cancun", 5)
+        hotels = Hotel.repository()
+        extra = {'hotel_id': 2, 'name': "Sol", 'stars': 4}
+        for action in (lambda: hotels.insert(extra),
+                       lambda: hotels.replace_all([extra]),
+                       lambda: hotels.update(1, {'stars': 4})):
+            with self.assertRaises(ValueError):
+                action()
+        self.assertEqual(Hotel.load_hotels(),
+                         [{'hotel_id': 1, 'name': "Plaza",
+                           'location': "Cancun", 'rooms': 5}])
+
+    def test_import_json(self):
+        """El importador copia los JSON y omite reservaciones huérfanas."""
+        paths = {}
+        data = {
+            'hotels': [{'hotel_id': 1, 'name': "Plaza", 'location': "Cancun",
+                        'rooms': 5, 'a_rooms': 4}],
+            'customers': [{'customer_id': 1, 'name': "Kenji",
+                           'email': "k@mail.com"}],
+            'reservations': [
+                {'reservation_id': 1, 'customer_id': 1, 'hotel_id': 1},
+                {'reservation_id': 2, 'customer_id': 7, 'hotel_id': 1}],
+        }
+        for name, records in data.items():
+            paths[name] = os.path.join(self.folder, f"{name}.json")
+            with open(paths[name], 'w', encoding='utf-8') as file:
+                json.dump(records, file)
+        counts = storage.import_json(paths['hotels'], paths['customers'],
+                                     paths['reservations'])
+        self.assertEqual(counts['reservations'], 1)
+        self.assertEqual(counts['omitted'], 1)
+        self.assertEqual(Hotel.load_hotels(), data['hotels'])
+        self.assertEqual(Reservation.load_reservations(),
+                         data['reservations'][:1])
+
+
 if __name__ == '__main__':
     unittest.main()